@@ -70,53 +70,11 @@ test_events = [
 
 print("🌍 Adding test events to EarthPulse AI database...\n")
 
-# We need to add events directly to database since we don't have a POST endpoint yet
-# Let's create one!
+# One request for the whole list: validated together, inserted in one transaction
+response = requests.post(f"{BASE_URL}/api/events/bulk", json=test_events)
 
-print("⚠️ We need to add a POST endpoint first!")
-print("\nCopy this code to your app/main.py to add event creation endpoint:\n")
-
-endpoint_code = '''
-@app.post("/api/events/create")
-def create_event(
-    event_type: str,
-    title: str,
-    description: str,
-    severity: str,
-    location_name: str,
-    latitude: float,
-    longitude: float,
-    source_url: str = None,
-    source_type: str = "manual",
-    db: Session = Depends(get_db)
-):
-    """
-    Manually create an event
-    """
-    from datetime import datetime
-    
-    event = Event(
-        event_type=event_type,
-        title=title,
-        description=description,
-        severity=severity,
-        location_name=location_name,
-        latitude=latitude,
-        longitude=longitude,
-        source_url=source_url,
-        source_type=source_type,
-        published_at=datetime.utcnow(),
-        verification_status='pending'
-    )
-    
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    
-    return {
-        "message": "Event created successfully",
-        "event_id": event.id
-    }
-'''
-
-print(endpoint_code)
\ No newline at end of file
+if response.ok:
+    result = response.json()
+    print(f"✅ Created {result['count']} events: {result['event_ids']}")
+else:
+    print(f"❌ Failed ({response.status_code}): {response.text}")
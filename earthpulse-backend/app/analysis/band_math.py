@@ -0,0 +1,93 @@
+# app/analysis/band_math.py
+"""
+Vectorized band math for locally stored rasters
+
+Arrays are NumPy masked arrays as read from GeoTIFF windows; masked pixels
+(nodata, clouds, outside the area of interest) never contribute to a result.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+# MODIS MOD14A1 FireMask classes 7, 8 and 9 are fire (low, nominal, high confidence)
+FIRE_CLASS_MIN = 7
+
+# Sentinel-2 SCL classes treated as unusable: saturated, cloud shadow,
+# medium/high probability cloud, thin cirrus
+S2_SCL_MASKED = (1, 3, 8, 9, 10)
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def normalized_difference(a: np.ndarray, b: np.ndarray) -> np.ma.MaskedArray:
+    """(a - b) / (a + b), like ee.Image.normalizedDifference([a, b])"""
+    a = np.ma.asarray(a, dtype=np.float32)
+    b = np.ma.asarray(b, dtype=np.float32)
+    total = a + b
+    return np.ma.masked_where(total == 0, (a - b) / np.ma.where(total == 0, 1, total))
+
+
+def ndvi(nir: np.ndarray, red: np.ndarray) -> np.ma.MaskedArray:
+    return normalized_difference(nir, red)
+
+
+def ndwi(green: np.ndarray, nir: np.ndarray) -> np.ma.MaskedArray:
+    return normalized_difference(green, nir)
+
+
+def cloud_mask(scl: np.ndarray) -> np.ndarray:
+    """True where a Sentinel-2 scene classification marks the pixel unusable"""
+    return np.isin(np.ma.filled(scl, 0), S2_SCL_MASKED)
+
+
+def fire_pixels(fire_mask: np.ndarray) -> np.ndarray:
+    """True where MODIS reports a fire"""
+    return np.ma.filled(fire_mask, 0) >= FIRE_CLASS_MIN
+
+
+def circle_mask_geographic(lons: np.ndarray, lats: np.ndarray,
+                           latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+    """True for pixel centres (degrees) within radius_km of the point, great-circle distance"""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(lats)[:, None]
+    dlat = lat2 - lat1
+    dlon = np.radians(lons)[None, :] - np.radians(longitude)
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(h, 1.0))) <= radius_km * 1000
+
+
+def circle_mask_projected(xs: np.ndarray, ys: np.ndarray,
+                          x: float, y: float, radius_km: float) -> np.ndarray:
+    """True for pixel centres (metres, e.g. UTM) within radius_km of (x, y)"""
+    return (xs[None, :] - x) ** 2 + (ys[:, None] - y) ** 2 <= (radius_km * 1000) ** 2
+
+
+def temporal_mean(stack: List[np.ma.MaskedArray]) -> Optional[np.ma.MaskedArray]:
+    """Per-pixel mean over scenes on the same grid, ignoring masked pixels (ImageCollection.mean())"""
+    if not stack:
+        return None
+    return np.ma.stack(stack).mean(axis=0)
+
+
+def temporal_max(stack: List[np.ndarray]) -> Optional[np.ndarray]:
+    """Per-pixel maximum over scenes on the same grid (ImageCollection.max())"""
+    if not stack:
+        return None
+    return np.ma.stack(stack).max(axis=0)
+
+
+def nan_median(stack: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Median along axis ignoring NaN, NaN where every value is NaN
+
+    Sorts once and picks the middle of the valid values per pixel; for a
+    short scene axis this is much faster than np.nanmedian, which falls back
+    to masked arrays.
+    """
+    ordered = np.sort(stack, axis=axis)  # NaN sorts last
+    valid = np.sum(~np.isnan(stack), axis=axis, keepdims=True)
+    # Middle pair of the valid values; the same index twice when their count is odd
+    low = np.take_along_axis(ordered, np.maximum(valid - 1, 0) // 2, axis=axis)
+    high = np.take_along_axis(ordered, np.minimum(valid // 2, stack.shape[axis] - 1), axis=axis)
+    median = np.where(valid == 0, np.nan, (low + high) / 2)
+    return np.squeeze(median, axis=axis)
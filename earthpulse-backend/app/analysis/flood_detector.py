@@ -0,0 +1,21 @@
+# app/analysis/flood_detector.py
+from typing import Optional
+
+# NDWI above this is treated as open water / flooding
+WATER_THRESHOLD = 0.3
+
+
+def interpret_ndwi(ndwi: Optional[float]) -> str:
+    """Interpret NDWI value"""
+    if ndwi is None:
+        return "No data available - check date range or cloud coverage"
+    elif ndwi > 0.5:
+        return "High water content - large water bodies or significant flooding"
+    elif ndwi > 0.3:
+        return "Moderate water content - potential flooding or wetlands"
+    elif ndwi > 0.1:
+        return "Low water content - moist soil or vegetation"
+    elif ndwi > -0.1:
+        return "Minimal water content - dry soil"
+    else:
+        return "Very low water content - barren land, potential drought conditions"
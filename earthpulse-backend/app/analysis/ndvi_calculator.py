@@ -0,0 +1,22 @@
+# app/analysis/ndvi_calculator.py
+from typing import Optional
+
+
+def interpret_ndvi(ndvi: Optional[float]) -> str:
+    """Interpret NDVI value"""
+    if ndvi is None:
+        return "No data available - check date range or cloud coverage"
+    elif ndvi < -0.1:
+        return "Water bodies"
+    elif ndvi < 0:
+        return "Clouds or snow"
+    elif ndvi < 0.2:
+        return "Barren land, rock, sand, or urban areas"
+    elif ndvi < 0.35:
+        return "Sparse vegetation, shrubland, or grassland"
+    elif ndvi < 0.5:
+        return "Moderate vegetation, agricultural land"
+    elif ndvi < 0.7:
+        return "Dense vegetation, healthy forests"
+    else:
+        return "Very dense, healthy vegetation - tropical rainforests"
@@ -0,0 +1,13 @@
+# app/analysis/wildfire_detector.py
+
+
+def assess_fire_risk(fire_count: int) -> str:
+    """Assess fire risk level based on detected fire pixels"""
+    if fire_count == 0:
+        return "low"
+    elif fire_count < 5:
+        return "medium"
+    elif fire_count < 15:
+        return "high"
+    else:
+        return "critical"
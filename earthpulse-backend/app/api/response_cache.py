@@ -0,0 +1,134 @@
+# app/api/response_cache.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.database import engine
+from app.database.versioning import get_version
+
+# Data version of one table, or of several for paths that read more than one
+Version = Union[int, Tuple[int, ...]]
+
+# Response headers replayed from the cache besides the body
+CACHED_HEADERS = ("content-type", "x-next-cursor")
+
+
+def normalize_query(query_string: str) -> str:
+    """Sort parameters and drop empty ones so equivalent URLs share a key"""
+    return urlencode(sorted(parse_qsl(query_string, keep_blank_values=False)))
+
+
+def make_etag(version: Version, key: str) -> str:
+    digest = hashlib.sha1(f"{version}|{key}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCache:
+    """LRU of rendered responses, each tagged with the data version it was built from"""
+
+    def __init__(self, max_entries: int = 1024, max_body_bytes: int = 2 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self._entries: "OrderedDict[str, Tuple[Version, bytes, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key: str, version: Version) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1], entry[2]
+
+    def set(self, key: str, version: Version, body: bytes, headers: Dict[str, str]):
+        if len(body) > self.max_body_bytes:
+            return
+        with self._lock:
+            self._entries[key] = (version, body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """
+    Strong ETags, If-None-Match and response caching for read endpoints
+
+    For GETs on the listed paths the ETag is derived from the data version of
+    the tables the path reads (events unless `paths` maps the pattern to
+    other tables) and the normalized URL, so it changes exactly when a write
+    could change the body. A matching If-None-Match gets a bodyless 304, and
+    otherwise a body rendered at the current version is replayed from the
+    cache. Either way the request costs one primary-key lookup per table.
+    """
+
+    def __init__(self, app, paths: Union[Iterable[str], Mapping[str, Sequence[str]]],
+                 cache: Optional[ResponseCache] = None, bind=engine):
+        super().__init__(app)
+        items = paths.items() if isinstance(paths, Mapping) else ((p, ("events",)) for p in paths)
+        self.patterns = [(re.compile(p), tuple(tables)) for p, tables in items]
+        self.cache = cache if cache is not None else ResponseCache()
+        self.bind = bind
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        tables = None
+        if request.method == "GET":
+            tables = next((t for p, t in self.patterns if p.fullmatch(path)), None)
+        if tables is None:
+            return await call_next(request)
+
+        with self.bind.connect() as conn:
+            versions = tuple(get_version(conn, table) for table in tables)
+        version = versions[0] if len(versions) == 1 else versions
+
+        key = f"{path}?{normalize_query(request.url.query)}"
+        etag = make_etag(version, key)
+        validators = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            self.cache.count("not_modified")
+            return Response(status_code=304, headers=validators)
+
+        cached = self.cache.get(key, version)
+        if cached is not None:
+            body, headers = cached
+            return Response(content=body, status_code=200, headers={**headers, **validators})
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {k: v for k, v in response.headers.items() if k in CACHED_HEADERS}
+        self.cache.set(key, version, body, headers)
+        return Response(content=body, status_code=200, headers={**headers, **validators})
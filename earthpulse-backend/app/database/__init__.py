@@ -1,4 +1,5 @@
 from .connection import Base, engine, get_db, SessionLocal
-from app.models import event  # Import models to register them
+from app.models import event, incident, job, data_version, news  # Import models to register them
+from . import versioning  # Registers the data-version write hook
 
 __all__ = ["Base", "engine", "get_db", "SessionLocal"]
\ No newline at end of file
@@ -0,0 +1,297 @@
+# app/database/crud.py
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.utils import geohash
+from app.utils.helpers import BBox
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Rows per INSERT statement in bulk ingestion (well under SQLite's bound-parameter limit)
+BULK_INSERT_CHUNK_SIZE = 1000
+MAX_BULK_EVENTS = 100000
+
+# Public field name -> columns that have to be loaded to render it
+EVENT_FIELDS = {
+    "id": (Event.id,),
+    "title": (Event.title,),
+    "description": (Event.description,),
+    "event_type": (Event.event_type,),
+    "severity": (Event.severity,),
+    "location": (Event.location_name, Event.latitude, Event.longitude),
+    "is_verified": (Event.is_verified,),
+    "verification_score": (Event.verification_score,),
+    "created_at": (Event.created_at,),
+    "updated_at": (Event.updated_at,),
+    "source_urls": (Event.source_url, Event.source_urls),
+    "incident_id": (Event.incident_id,),
+}
+# source_urls and incident_id only when asked for (fields=...)
+DEFAULT_EVENT_FIELDS = tuple(f for f in EVENT_FIELDS if f not in ("source_urls", "incident_id"))
+
+# Finest geohash cover that stays under this many cells is used for spatial filters
+SPATIAL_MAX_CELLS = 32
+MAX_RADIUS_KM = 2000
+
+# Always present in /api/stats, even at zero
+STATS_EVENT_TYPES = ("wildfire", "flood", "deforestation", "drought")
+STATS_SEVERITIES = ("critical", "high", "medium", "low")
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+_FIELD_RENDERERS = {
+    "id": lambda e: e.id,
+    "title": lambda e: e.title,
+    "description": lambda e: e.description,
+    "event_type": lambda e: e.event_type,
+    "severity": lambda e: e.severity,
+    "location": lambda e: {
+        "name": e.location_name,
+        "latitude": e.latitude,
+        "longitude": e.longitude
+    },
+    "is_verified": lambda e: e.is_verified,
+    "verification_score": lambda e: e.verification_score,
+    "created_at": lambda e: _isoformat(e.created_at),
+    "updated_at": lambda e: _isoformat(e.updated_at),
+    "source_urls": lambda e: e.source_urls or ([e.source_url] if e.source_url else []),
+    "incident_id": lambda e: e.incident_id,
+}
+
+
+def event_to_dict(event, fields: Sequence[str] = DEFAULT_EVENT_FIELDS) -> Dict:
+    """Render an Event (or a projected row with the same attribute names)"""
+    return {field: _FIELD_RENDERERS[field](event) for field in fields}
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma separated `fields=` parameter, keeping the canonical order"""
+    if not fields:
+        return DEFAULT_EVENT_FIELDS
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return tuple(f for f in EVENT_FIELDS if f in requested)
+
+
+def encode_cursor(created_at: datetime, event_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, event_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def filter_events(query, event_type: str = None, severity: str = None,
+                  verified: bool = None):
+    if event_type:
+        query = query.filter(Event.event_type == event_type)
+    if severity:
+        query = query.filter(Event.severity == severity)
+    if verified is not None:
+        query = query.filter(Event.is_verified == verified)
+    return query
+
+
+def filter_bbox(query, bbox: BBox):
+    """
+    Restrict to events inside a bounding box
+
+    The geohash ranges covering the box are B-tree range scans on
+    ix_events_geohash; the exact lat/lon check then trims the cover's edges.
+    A box crossing the antimeridian (min_lon > max_lon) is matched as its
+    two halves.
+    """
+    conditions = []
+    for min_lon, min_lat, max_lon, max_lat in geohash.split_bbox(bbox):
+        ranges = geohash.covering_ranges(min_lon, min_lat, max_lon, max_lat,
+                                         max_cells=SPATIAL_MAX_CELLS)
+        exact = and_(
+            Event.longitude.between(min_lon, max_lon),
+            Event.latitude.between(min_lat, max_lat)
+        )
+        if ranges:
+            exact = and_(or_(*[
+                and_(Event.geohash >= start, Event.geohash < end) if end else Event.geohash >= start
+                for start, end in ranges
+            ]), exact)
+        conditions.append(exact)
+
+    return query.filter(conditions[0] if len(conditions) == 1 else or_(*conditions))
+
+
+def list_events(db: Session, event_type: str = None, severity: str = None,
+                verified: bool = None, fields: Sequence[str] = DEFAULT_EVENT_FIELDS,
+                limit: int = DEFAULT_PAGE_SIZE,
+                after: Optional[Tuple[datetime, int]] = None,
+                bbox: Optional[BBox] = None,
+                near: Optional[Tuple[float, float, float]] = None) -> Tuple[List, Optional[str]]:
+    """
+    One page of events, newest first, using keyset pagination on (created_at, id)
+
+    Only the columns behind `fields` are loaded (plus created_at/id for the
+    cursor), and the ix_events_created_at_id index serves both the ordering
+    and the cursor seek, so the cost of a page does not depend on table size.
+
+    `bbox` and `near` (latitude, longitude, radius_km) go through the geohash
+    index. For `near` the circle's bounding box is queried and the exact
+    great-circle distance is checked in Python, reading more rows until the
+    page is full.
+
+    Returns the rows and the cursor for the next page (None on the last page).
+    """
+    columns = {Event.id: None, Event.created_at: None}
+    for field in fields:
+        for column in EVENT_FIELDS[field]:
+            columns[column] = None
+
+    matches = None
+    if near is not None:
+        lat, lon, radius_km = near
+        columns[Event.latitude] = None
+        columns[Event.longitude] = None
+        bbox = geohash.radius_bbox(lat, lon, radius_km)
+        matches = lambda row: geohash.haversine_km(lat, lon, row.latitude, row.longitude) <= radius_km
+
+    query = filter_events(db.query(*columns), event_type, severity, verified)
+    if bbox is not None:
+        query = filter_bbox(query, bbox)
+    query = query.order_by(Event.created_at.desc(), Event.id.desc())
+
+    if matches is None:
+        if after is not None:
+            query = query.filter(tuple_(Event.created_at, Event.id) < tuple_(*after))
+        rows = query.limit(limit + 1).all()
+    else:
+        # A circle fills ~79% of its bounding box, so 2x overfetch rarely needs a second read
+        rows = []
+        seek = after
+        while len(rows) <= limit:
+            batch_query = query
+            if seek is not None:
+                batch_query = batch_query.filter(tuple_(Event.created_at, Event.id) < tuple_(*seek))
+            batch = batch_query.limit(2 * limit + 1).all()
+            rows.extend(r for r in batch if matches(r))
+            if len(batch) <= 2 * limit:
+                break
+            seek = (batch[-1].created_at, batch[-1].id)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, next_cursor
+
+
+def get_event_stats(db: Session, since: datetime = None, until: datetime = None,
+                    bbox: Optional[BBox] = None) -> Dict:
+    """
+    Event counts by type, severity and verification in a single grouped query
+
+    Types and severities not listed in STATS_EVENT_TYPES / STATS_SEVERITIES
+    show up as extra keys instead of being dropped.
+    """
+    query = db.query(
+        Event.event_type,
+        Event.severity,
+        Event.is_verified,
+        func.count(Event.id)
+    )
+
+    if since:
+        query = query.filter(Event.created_at >= since)
+    if until:
+        query = query.filter(Event.created_at < until)
+    if bbox:
+        query = filter_bbox(query, bbox)
+
+    total = 0
+    verified = 0
+    by_type = dict.fromkeys(STATS_EVENT_TYPES, 0)
+    by_severity = dict.fromkeys(STATS_SEVERITIES, 0)
+
+    for event_type, severity, is_verified, count in query.group_by(
+        Event.event_type, Event.severity, Event.is_verified
+    ):
+        total += count
+        if is_verified:
+            verified += count
+        if event_type is not None:
+            by_type[event_type] = by_type.get(event_type, 0) + count
+        if severity is not None:
+            by_severity[severity] = by_severity.get(severity, 0) + count
+
+    return {
+        "total_events": total,
+        "verified_events": verified,
+        "unverified_events": total - verified,
+        "events_by_type": by_type,
+        "events_by_severity": by_severity
+    }
+
+
+def bulk_insert_events(db: Session, events: Sequence, chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> List[int]:
+    """
+    Insert many events and return their ids, in input order
+
+    Rows are written `chunk_size` at a time with Core executemany inserts, all
+    in the session's transaction: nothing is written unless every chunk
+    succeeds, and the caller commits. Core inserts skip ORM events, so the
+    geohash that _sync_geohash would set is computed here.
+
+    SQLite cannot return ids from a batched INSERT in parameter order, but a
+    rowid table hands out max(id) + 1 to each new row and our transaction
+    holds the write lock from the first chunk on, so each chunk's ids are the
+    contiguous range ending at max(id). Other databases use ordered
+    INSERT ... RETURNING.
+    """
+    now = datetime.utcnow()
+    conn = db.connection()
+    sqlite = conn.dialect.name == "sqlite"
+    statement = insert(Event)
+    if not sqlite:
+        statement = statement.returning(Event.id, sort_by_parameter_order=True)
+
+    ids: List[int] = []
+    for offset in range(0, len(events), chunk_size):
+        rows = []
+        for e in events[offset:offset + chunk_size]:
+            row = e.model_dump()
+            row.update(
+                geohash=geohash.encode(e.latitude, e.longitude),
+                is_verified=False,
+                verification_status="pending",
+                created_at=now,
+                updated_at=now,
+            )
+            rows.append(row)
+
+        if sqlite:
+            conn.execute(statement, rows)
+            last_id = conn.execute(select(func.max(Event.id))).scalar()
+            ids.extend(range(last_id - len(rows) + 1, last_id + 1))
+        else:
+            ids.extend(conn.execute(statement, rows).scalars())
+
+    return ids
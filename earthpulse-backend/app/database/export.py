@@ -0,0 +1,121 @@
+# app/database/export.py
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterator, Optional, Sequence
+
+from app.models.event import Event
+from app.utils.helpers import BBox
+from .connection import SessionLocal
+from .crud import DEFAULT_EVENT_FIELDS, EVENT_FIELDS, event_to_dict, filter_bbox, filter_events
+
+# Rows fetched from the cursor per round, and rendered per yielded chunk
+EXPORT_BATCH_SIZE = 1000
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "geojson": ("application/geo+json", "geojson"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def _csv_columns(fields: Sequence[str]):
+    """CSV is flat: `location` becomes location_name, latitude, longitude"""
+    columns = []
+    for field in fields:
+        if field == "location":
+            columns += ["location_name", "latitude", "longitude"]
+        else:
+            columns.append(field)
+    return columns
+
+
+def _csv_row(item: Dict) -> Dict:
+    location = item.pop("location", None)
+    if location is not None:
+        item["location_name"] = location["name"]
+        item["latitude"] = location["latitude"]
+        item["longitude"] = location["longitude"]
+    # List-valued fields (source_urls) as JSON, not a Python repr
+    for key, value in item.items():
+        if isinstance(value, (list, dict)):
+            item[key] = json.dumps(value)
+    return item
+
+
+def _feature(item: Dict) -> Dict:
+    location = item.pop("location", None) or {}
+    latitude, longitude = location.get("latitude"), location.get("longitude")
+    geometry = None
+    if latitude is not None and longitude is not None:
+        geometry = {"type": "Point", "coordinates": [longitude, latitude]}
+    if location:
+        item["location_name"] = location.get("name")
+    return {"type": "Feature", "id": item.get("id"), "geometry": geometry, "properties": item}
+
+
+def _render_json_lines(batch, fields, render: Callable[[Dict], Dict], separator: str) -> str:
+    return separator.join(json.dumps(render(event_to_dict(row, fields))) for row in batch)
+
+
+def export_events(format: str, event_type: str = None, severity: str = None,
+                  verified: bool = None, bbox: Optional[BBox] = None,
+                  fields: Sequence[str] = DEFAULT_EVENT_FIELDS,
+                  batch_size: int = EXPORT_BATCH_SIZE,
+                  session_factory=SessionLocal) -> Iterator[str]:
+    """
+    Stream every matching event as GeoJSON, NDJSON or CSV text chunks
+
+    Only the columns behind `fields` are selected and rows are pulled from
+    the cursor `batch_size` at a time (yield_per), each batch rendered to one
+    chunk. Memory stays flat however many events are exported. The generator
+    owns its session because it runs after the request handler has returned.
+    """
+    columns = {Event.id: None}
+    for field in fields:
+        for column in EVENT_FIELDS[field]:
+            columns[column] = None
+    if format == "geojson":
+        columns[Event.latitude] = None
+        columns[Event.longitude] = None
+        columns[Event.location_name] = None
+
+    db = session_factory()
+    try:
+        query = filter_events(db.query(*columns), event_type, severity, verified)
+        if bbox is not None:
+            query = filter_bbox(query, bbox)
+        statement = query.order_by(Event.id).statement.execution_options(yield_per=batch_size)
+        rows = db.execute(statement)
+
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=_csv_columns(fields), extrasaction="ignore")
+            writer.writeheader()
+        elif format == "geojson":
+            render_fields = tuple(fields) if "location" in fields else (*fields, "location")
+            yield '{"type": "FeatureCollection", "features": ['
+
+        first = True
+        for batch in rows.partitions():
+            if format == "csv":
+                writer.writerows(_csv_row(event_to_dict(row, fields)) for row in batch)
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            elif format == "geojson":
+                chunk = _render_json_lines(batch, render_fields, _feature, ",\n")
+                if not first:
+                    chunk = ",\n" + chunk
+            else:
+                chunk = _render_json_lines(batch, fields, lambda item: item, "\n") + "\n"
+            first = False
+            yield chunk
+
+        if format == "csv" and first:
+            yield buffer.getvalue()
+        elif format == "geojson":
+            yield "]}\n"
+    finally:
+        db.close()
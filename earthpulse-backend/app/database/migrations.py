@@ -0,0 +1,115 @@
+# app/database/migrations.py
+import logging
+
+from sqlalchemy import bindparam, inspect, select, text, update
+
+from .connection import Base, engine
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _add_missing_columns(bind):
+    """ALTER TABLE ... ADD COLUMN for model columns the live table doesn't have yet"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            with bind.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"➕ Added column {table.name}.{column.name}")
+
+
+def _backfill_event_geohashes(bind):
+    """Fill events.geohash for rows written before the column existed"""
+    from app.models.event import Event
+    from app.utils import geohash
+
+    total = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(
+                select(Event.id, Event.latitude, Event.longitude)
+                .where(Event.geohash.is_(None))
+                .where(Event.latitude.is_not(None))
+                .where(Event.longitude.is_not(None))
+                .limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            conn.execute(
+                update(Event.__table__)
+                .where(Event.__table__.c.id == bindparam("event_id"))
+                .values(geohash=bindparam("event_geohash")),
+                [
+                    {"event_id": r.id, "event_geohash": geohash.encode(r.latitude, r.longitude)}
+                    for r in rows
+                ]
+            )
+            total += len(rows)
+
+    if total:
+        logger.info(f"🧭 Backfilled geohash for {total} events")
+
+
+def _dedupe_satellite_composites(bind):
+    """
+    Drop duplicate composite periods before ux_satellite_data_composite is built
+
+    Concurrent misses used to store the same period twice; the oldest row is
+    kept. Runs once, while the unique index does not exist yet, and replaces
+    the non-unique ix_satellite_data_composite it supersedes.
+    """
+    inspector = inspect(bind)
+    if "satellite_data" not in inspector.get_table_names():
+        return
+    if "ux_satellite_data_composite" in {i["name"] for i in inspector.get_indexes("satellite_data")}:
+        return
+
+    key = "analysis_type, geohash, radius_km, period_days, collection_date"
+    complete = " AND ".join(f"{c} IS NOT NULL" for c in key.split(", "))
+    with bind.begin() as conn:
+        removed = conn.execute(text(
+            f"DELETE FROM satellite_data WHERE {complete} AND id NOT IN "
+            f"(SELECT MIN(id) FROM satellite_data WHERE {complete} GROUP BY {key})"
+        )).rowcount
+        conn.execute(text("DROP INDEX IF EXISTS ix_satellite_data_composite"))
+    if removed:
+        logger.info(f"🧹 Removed {removed} duplicate composite periods")
+
+
+def run_migrations(bind=engine):
+    """
+    Bring the schema up to date with the models
+
+    create_all() only creates missing tables (with their indexes), so columns
+    and indexes added to existing models are created here one by one, and
+    derived columns are backfilled. Safe to run on every start.
+    """
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+    _dedupe_satellite_composites(bind)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+    _backfill_event_geohashes(bind)
+
+    logger.info("✅ Database schema up to date")
+
+
+if __name__ == "__main__":
+    # Deploy step: python -m app.database.migrations
+    logging.basicConfig(level=logging.INFO)
+    run_migrations()
@@ -0,0 +1,47 @@
+# app/database/versioning.py
+"""
+Data-version stamps for cache validation
+
+Every INSERT/UPDATE/DELETE that reaches a versioned table, whether from an
+ORM flush or a Core statement (bulk inserts, bulk verification), bumps that
+table's row in data_versions on the same connection, so the new version
+commits or rolls back together with the write. The stamp lives in the
+database and is therefore shared by the API and standalone workers.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.models.data_version import DataVersion
+
+VERSIONED_TABLES = {"events", "incidents"}
+
+_versions = DataVersion.__table__
+
+
+def _bump(conn, name: str):
+    result = conn.execute(
+        update(_versions)
+        .where(_versions.c.name == name)
+        .values(version=_versions.c.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(_versions).values(name=name, version=1, updated_at=datetime.utcnow()))
+
+
+@event.listens_for(Engine, "after_execute")
+def _bump_on_write(conn, clauseelement, multiparams, params, execution_options, result):
+    if not isinstance(clauseelement, UpdateBase):
+        return
+    table = getattr(clauseelement, "table", None)
+    name = getattr(table, "name", None)
+    if name in VERSIONED_TABLES:
+        _bump(conn, name)
+
+
+def get_version(conn, name: str = "events") -> int:
+    """Current version of a table (0 before its first write)"""
+    version = conn.execute(select(_versions.c.version).where(_versions.c.name == name)).scalar()
+    return version or 0
@@ -1,25 +1,95 @@
-﻿from fastapi import FastAPI, HTTPException, Depends
+﻿from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime
+from pydantic import ValidationError
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+import asyncio
 import logging
+import os
+import threading
 
-from app.database import engine, Base, get_db
+from app.api.response_cache import ConditionalGetMiddleware
+from app.database import engine, get_db, crud
+from app.database.export import EXPORT_FORMATS, export_events
+from app.database.migrations import run_migrations
 from app.models.event import Event
+from app.models.incident import Incident
+from app.nlp.model_registry import registry as nlp_models
+from app.schemas import EventCreate, EventCreateList
+from app.services.async_earth_engine import AsyncEarthEngineService, SatelliteBusyError
+from app.services.composite_store import INDICES as COMPOSITE_INDICES, composite_store
+from app.services.earth_engine import earth_engine_service, earth_engine_status, get_earth_engine_service
+from app.services.event_tiles import event_tile_cache
+from app.services.incidents import (
+    DEFAULT_PAGE_SIZE as INCIDENT_PAGE_SIZE, MAX_PAGE_SIZE as MAX_INCIDENT_PAGE_SIZE,
+    cluster_pending, incident_clusterer, incident_to_dict, list_incidents
+)
+from app.utils import mvt
+from app.utils.helpers import parse_bbox, parse_point
+from app.verification import jobs
+from app.verification.bulk import CHUNK_SIZE, verify_pending
+from app.verification.worker import VERIFICATION_WORKERS, VerificationWorker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-logger.info('✅ Database initialized successfully')
+# Schema setup is a deploy step (`python -m app.database.migrations`); for
+# local development the app runs it at startup unless MIGRATE_ON_STARTUP=0
+MIGRATE_ON_STARTUP = os.getenv('MIGRATE_ON_STARTUP', '1') == '1'
+
+# Authenticate Earth Engine in the background after startup instead of on the
+# first satellite request (EE_WARM_ON_STARTUP=0 leaves it fully lazy)
+EE_WARM_ON_STARTUP = os.getenv('EE_WARM_ON_STARTUP', '1') == '1'
+
+# NLP_PRELOAD=1 loads the NLP models at import, i.e. in the gunicorn master
+# under --preload, so forked workers share them copy-on-write
+if os.getenv('NLP_PRELOAD', '0') == '1':
+    nlp_models.preload()
+
+# Blocking Earth Engine calls run on their own bounded thread pool
+satellite = AsyncEarthEngineService(earth_engine_service)
+
+# Verification jobs are claimed from the database; VERIFICATION_WORKERS=0
+# leaves them to `python -m app.verification.worker`
+verification_worker = VerificationWorker(earth_engine_service, concurrency=VERIFICATION_WORKERS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MIGRATE_ON_STARTUP:
+        # Create database tables and indexes
+        run_migrations(engine)
+        logger.info('✅ Database initialized successfully')
+    if EE_WARM_ON_STARTUP:
+        threading.Thread(target=get_earth_engine_service, name='ee-warmup', daemon=True).start()
+    if VERIFICATION_WORKERS > 0:
+        verification_worker.start()
+    yield
+    verification_worker.stop()
+    satellite.shutdown()
 
 # Initialize FastAPI
 app = FastAPI(
     title='EarthPulse AI API',
     description='Environmental Event Monitoring System',
-    version='1.0.0'
+    version='1.0.0',
+    lifespan=lifespan
+)
+
+# ETag / 304 and response caching for the polled read endpoints (added
+# before CORS so CORS headers also wrap 304s and cached replies)
+app.add_middleware(
+    ConditionalGetMiddleware,
+    paths={
+        r'/api/events': ('events',),
+        r'/api/events/\d+': ('events',),
+        r'/api/stats': ('events',),
+        # Incidents are merged and verified without an events row changing
+        r'/api/incidents': ('events', 'incidents'),
+        r'/api/incidents/\d+': ('events', 'incidents'),
+    },
 )
 
 # CORS Middleware
@@ -29,6 +99,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['X-Next-Cursor', 'ETag'],
 )
 
 @app.get('/')
@@ -44,77 +115,95 @@ async def health_check():
     return {
         'status': 'healthy',
         'database': 'connected',
+        'earth_engine': earth_engine_status(),
         'timestamp': datetime.utcnow().isoformat()
     }
 
 # ==================== STATISTICS ====================
 
 @app.get('/api/stats')
-async def get_statistics(db: Session = Depends(get_db)):
-    total_events = db.query(Event).count()
-    verified_events = db.query(Event).filter(Event.is_verified == True).count()
-    
-    events_by_type = {
-        'wildfire': db.query(Event).filter(Event.event_type == 'wildfire').count(),
-        'flood': db.query(Event).filter(Event.event_type == 'flood').count(),
-        'deforestation': db.query(Event).filter(Event.event_type == 'deforestation').count(),
-        'drought': db.query(Event).filter(Event.event_type == 'drought').count(),
-    }
-    
-    events_by_severity = {
-        'critical': db.query(Event).filter(Event.severity == 'critical').count(),
-        'high': db.query(Event).filter(Event.severity == 'high').count(),
-        'medium': db.query(Event).filter(Event.severity == 'medium').count(),
-        'low': db.query(Event).filter(Event.severity == 'low').count(),
-    }
+async def get_statistics(
+    since: datetime = None,
+    until: datetime = None,
+    bbox: str = None,
+    db: Session = Depends(get_db)
+):
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {
-        'total_events': total_events,
-        'verified_events': verified_events,
-        'unverified_events': total_events - verified_events,
-        'events_by_type': events_by_type,
-        'events_by_severity': events_by_severity
-    }
+    return crud.get_event_stats(db, since=since, until=until, bbox=bounds)
 
 # ==================== EVENTS ====================
 
 @app.get('/api/events')
 async def get_events(
+    response: Response,
     event_type: str = None,
     severity: str = None,
     verified: bool = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE),
+    cursor: str = None,
+    fields: str = None,
+    bbox: str = None,
+    near: str = None,
+    radius_km: float = Query(None, gt=0, le=crud.MAX_RADIUS_KM),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Event)
-    
-    if event_type:
-        query = query.filter(Event.event_type == event_type)
-    if severity:
-        query = query.filter(Event.severity == severity)
-    if verified is not None:
-        query = query.filter(Event.is_verified == verified)
-    
-    events = query.order_by(Event.created_at.desc()).all()
-    
-    return [
-        {
-            'id': e.id,
-            'title': e.title,
-            'description': e.description,
-            'event_type': e.event_type,
-            'severity': e.severity,
-            'location': {
-                'name': e.location_name,
-                'latitude': e.latitude,
-                'longitude': e.longitude
-            },
-            'is_verified': e.is_verified,
-            'verification_score': e.verification_score,
-            'created_at': e.created_at.isoformat() if e.created_at else None,
-            'updated_at': e.updated_at.isoformat() if e.updated_at else None
-        }
-        for e in events
-    ]
+    try:
+        selected = crud.parse_fields(fields)
+        after = crud.decode_cursor(cursor) if cursor else None
+        bounds = parse_bbox(bbox) if bbox else None
+        center = parse_point(near) if near else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if center and radius_km is None:
+        raise HTTPException(status_code=400, detail='near requires radius_km')
+    
+    events, next_cursor = crud.list_events(
+        db,
+        event_type=event_type,
+        severity=severity,
+        verified=verified,
+        fields=selected,
+        limit=limit,
+        after=after,
+        bbox=bounds,
+        near=(*center, radius_km) if center else None
+    )
+    
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    
+    return [crud.event_to_dict(e, selected) for e in events]
+
+@app.get('/api/events/export')
+async def export_events_file(
+    format: str = 'geojson',
+    event_type: str = None,
+    severity: str = None,
+    verified: bool = None,
+    fields: str = None,
+    bbox: str = None
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f'format must be one of {", ".join(EXPORT_FORMATS)}')
+    
+    try:
+        selected = crud.parse_fields(fields)
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_events(format, event_type=event_type, severity=severity, verified=verified,
+                      bbox=bounds, fields=selected),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="events.{extension}"'}
+    )
 
 @app.get('/api/events/{event_id}')
 async def get_event(event_id: int, db: Session = Depends(get_db)):
@@ -123,22 +212,7 @@ async def get_event(event_id: int, db: Session = Depends(get_db)):
     if not event:
         raise HTTPException(status_code=404, detail='Event not found')
     
-    return {
-        'id': event.id,
-        'title': event.title,
-        'description': event.description,
-        'event_type': event.event_type,
-        'severity': event.severity,
-        'location': {
-            'name': event.location_name,
-            'latitude': event.latitude,
-            'longitude': event.longitude
-        },
-        'is_verified': event.is_verified,
-        'verification_score': event.verification_score,
-        'created_at': event.created_at.isoformat() if event.created_at else None,
-        'updated_at': event.updated_at.isoformat() if event.updated_at else None
-    }
+    return crud.event_to_dict(event)
 
 @app.post('/api/events/create')
 async def create_event(
@@ -166,6 +240,246 @@ async def create_event(
     db.commit()
     db.refresh(event)
     
+    assigned = incident_clusterer.cluster(db, [event])
+    
     logger.info(f'✅ Created event: {title}')
     
-    return {'message': 'Event created', 'event_id': event.id}
+    return {'message': 'Event created', 'event_id': event.id, 'incident_id': assigned.get(event.id)}
+
+@app.post('/api/events/bulk')
+async def create_events_bulk(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Create many events at once from a JSON array or NDJSON (one event per line)
+    
+    All events are validated before anything is written, and the insert is a
+    single transaction: either every event is created or none is. The new
+    events are clustered into incidents after the response is sent.
+    """
+    body = await request.body()
+    content_type = request.headers.get('content-type', '')
+    
+    try:
+        if 'ndjson' in content_type or not body.lstrip().startswith(b'['):
+            events = []
+            for line_no, line in enumerate(body.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(EventCreate.model_validate_json(line))
+                except ValidationError as e:
+                    raise HTTPException(status_code=422, detail={'line': line_no, 'errors': e.errors(include_url=False, include_input=False)})
+        else:
+            events = EventCreateList.validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_input=False))
+    
+    if len(events) > crud.MAX_BULK_EVENTS:
+        raise HTTPException(status_code=413, detail=f'At most {crud.MAX_BULK_EVENTS} events per request')
+    
+    ids = crud.bulk_insert_events(db, events)
+    db.commit()
+    
+    background_tasks.add_task(cluster_pending)
+    
+    logger.info(f'✅ Created {len(ids)} events in bulk')
+    
+    return {'message': 'Events created', 'count': len(ids), 'event_ids': ids}
+
+@app.post('/api/events/verify-pending')
+def verify_pending_events(
+    status: str = 'pending',
+    event_type: str = None,
+    limit: int = Query(None, ge=1),
+    chunk_size: int = Query(CHUNK_SIZE, ge=1, le=5000)
+):
+    # Plain def: FastAPI runs it on the threadpool, the batch calls block
+    statuses = [s.strip() for s in status.split(',') if s.strip()]
+    return verify_pending(
+        earth_engine_service,
+        statuses=statuses,
+        event_type=event_type,
+        limit=limit,
+        chunk_size=chunk_size
+    )
+
+@app.post('/api/events/{event_id}/verify')
+async def verify_event_with_satellite(event_id: int, db: Session = Depends(get_db)):
+    event = db.query(Event).filter(Event.id == event_id).first()
+    
+    if not event:
+        raise HTTPException(status_code=404, detail='Event not found')
+    
+    job = jobs.enqueue_verification(db, event_id)
+    
+    return {
+        'message': 'Verification queued',
+        'event_id': event_id,
+        'job_id': job.id,
+        'status': job.status
+    }
+
+# ==================== INCIDENTS ====================
+
+@app.get('/api/incidents')
+async def get_incidents(
+    event_type: str = None,
+    bbox: str = None,
+    since: datetime = None,
+    min_events: int = Query(1, ge=1),
+    verified: bool = None,
+    limit: int = Query(INCIDENT_PAGE_SIZE, ge=1, le=MAX_INCIDENT_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    incidents = list_incidents(db, event_type=event_type, bbox=bounds, since=since,
+                               min_events=min_events, verified=verified, limit=limit)
+    return [incident_to_dict(i) for i in incidents]
+
+@app.get('/api/incidents/{incident_id}')
+async def get_incident(incident_id: int, db: Session = Depends(get_db)):
+    incident = db.get(Incident, incident_id)
+    
+    if not incident:
+        raise HTTPException(status_code=404, detail='Incident not found')
+    
+    events = db.query(Event).filter(Event.incident_id == incident_id) \
+        .order_by(Event.id).limit(MAX_INCIDENT_PAGE_SIZE).all()
+    return {**incident_to_dict(incident), 'events': [crud.event_to_dict(e) for e in events]}
+
+# ==================== JOBS ====================
+
+@app.get('/api/jobs/metrics')
+async def get_job_metrics(db: Session = Depends(get_db)):
+    metrics = jobs.queue_metrics(db)
+    metrics['worker'] = verification_worker.stats()
+    return metrics
+
+@app.get('/api/jobs/{job_id}')
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(jobs.VerificationJob, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found')
+    
+    return jobs.job_to_dict(job)
+
+# ==================== TILES ====================
+
+@app.get('/api/tiles/events/{z}/{x}/{y}.mvt')
+async def get_event_tile(z: int, x: int, y: int, db: Session = Depends(get_db)):
+    if not 0 <= z <= mvt.MAX_ZOOM or not (0 <= x < 1 << z and 0 <= y < 1 << z):
+        raise HTTPException(status_code=404, detail='Tile out of range')
+    
+    tile = event_tile_cache.get(db, z, x, y)
+    if not tile:
+        return Response(status_code=204)
+    
+    return Response(content=tile, media_type='application/vnd.mapbox-vector-tile')
+
+# ==================== SATELLITE ANALYSIS ====================
+
+async def run_satellite(method: str, latitude: float, longitude: float, radius_km: float):
+    try:
+        return await satellite.call(method, latitude, longitude, radius_km=radius_km)
+    except SatelliteBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail='Satellite analysis timed out')
+    except Exception as e:
+        logger.error(f'Error in {method}: {e}')
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def run_composite(index: str, latitude: float, longitude: float, radius_km: float):
+    # Trailing 30-day index mean assembled from stored weekly composites
+    try:
+        return await satellite.run(composite_store.analysis, index, latitude, longitude, radius_km=radius_km)
+    except SatelliteBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail='Satellite analysis timed out')
+    except Exception as e:
+        logger.error(f'Error in {index} analysis: {e}')
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get('/api/satellite/ndvi')
+async def get_ndvi(latitude: float, longitude: float, radius_km: float = 10):
+    return await run_composite('ndvi', latitude, longitude, radius_km)
+
+@app.get('/api/satellite/wildfire')
+async def detect_wildfire(latitude: float, longitude: float, radius_km: float = 50):
+    return await run_satellite('detect_wildfires', latitude, longitude, radius_km)
+
+@app.get('/api/satellite/water')
+async def detect_water(latitude: float, longitude: float, radius_km: float = 20):
+    return await run_composite('ndwi', latitude, longitude, radius_km)
+
+# At most ~5 years of weekly periods per request
+MAX_TIMESERIES_PERIODS = 260
+
+@app.get('/api/satellite/timeseries')
+def get_index_timeseries(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    index: str = 'ndvi',
+    start: str = None,
+    end: str = None,
+    radius_km: float = Query(None, gt=0, le=100),
+    db: Session = Depends(get_db)
+):
+    # Plain def: FastAPI runs it on the threadpool, computing missing periods blocks
+    if index not in COMPOSITE_INDICES:
+        raise HTTPException(status_code=422, detail=f'index must be one of {sorted(COMPOSITE_INDICES)}')
+    try:
+        end_date = date.fromisoformat(end) if end else datetime.utcnow().date()
+        start_date = date.fromisoformat(start) if start else end_date - timedelta(days=90)
+    except ValueError:
+        raise HTTPException(status_code=422, detail='start and end must be YYYY-MM-DD')
+    if start_date >= end_date:
+        raise HTTPException(status_code=422, detail='start must be before end')
+    if (end_date - start_date).days > MAX_TIMESERIES_PERIODS * 7:
+        raise HTTPException(status_code=422, detail=f'At most {MAX_TIMESERIES_PERIODS} weeks per request')
+    
+    radius_km = radius_km or COMPOSITE_INDICES[index][2]
+    try:
+        composites = composite_store.series(index, lat, lon, start_date.isoformat(),
+                                            end_date.isoformat(), radius_km, db=db)
+    except Exception as e:
+        logger.error(f'Error in {index} timeseries: {e}')
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        'index': index,
+        'location': {'latitude': lat, 'longitude': lon, 'radius_km': radius_km},
+        'date_range': {'start': start_date.isoformat(), 'end': end_date.isoformat()},
+        'period_days': composites[0].period.days if composites else None,
+        'stored': sum(c.stored for c in composites),
+        'computed': sum(not c.stored for c in composites),
+        'series': [
+            {
+                'start': c.period.start.isoformat(),
+                'end': c.period.end.isoformat(),
+                'mean': round(c.mean, 3) if c.mean is not None else None,
+                'image_count': c.image_count,
+                'stored': c.stored,
+            }
+            for c in composites
+        ],
+    }
+
+@app.get('/api/satellite/stats')
+async def satellite_stats():
+    stats = {'executor': satellite.stats()}
+    if hasattr(earth_engine_service, 'stats'):
+        stats.update(earth_engine_service.stats())
+    return stats
+
+# ==================== NLP ====================
+
+@app.get('/api/nlp/models')
+async def nlp_model_stats():
+    # Never triggers a load: reports what this worker has loaded so far
+    return nlp_models.stats()
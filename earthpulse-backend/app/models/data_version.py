@@ -0,0 +1,12 @@
+# app/models/data_version.py
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database.connection import Base
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # One row per versioned table, bumped in the same transaction as each write to it
+    name = Column(String, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
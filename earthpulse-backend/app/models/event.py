@@ -1,7 +1,9 @@
 # app/models/event.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, Text, Index, ForeignKey
+from sqlalchemy.event import listens_for
 from datetime import datetime
 from app.database.connection import Base
+from app.utils import geohash as geohash_utils
 
 class Event(Base):
     __tablename__ = "events"
@@ -19,9 +21,11 @@ class Event(Base):
     country = Column(String, index=True)
     latitude = Column(Float)
     longitude = Column(Float)
+    geohash = Column(String(12), index=True)  # spatial index key, kept in sync with lat/lon
     
     # Source Information
     source_url = Column(String)
+    source_urls = Column(JSON, nullable=True)  # every article reporting this event, source_url first
     source_type = Column(String)  # news, satellite, social_media
     published_at = Column(DateTime)
     
@@ -44,9 +48,30 @@ class Event(Base):
     # Raw Data
     raw_data = Column(JSON, nullable=True)
     
+    # Incident this event was clustered into (see app.services.incidents)
+    incident_id = Column(Integer, ForeignKey("incidents.id"), nullable=True, index=True)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # max() stamps cached tiles
+
+    __table_args__ = (
+        # Keyset pagination walks (created_at, id) newest first
+        Index("ix_events_created_at_id", "created_at", "id"),
+        # Covers the grouped count behind /api/stats
+        Index("ix_events_type_severity_verified", "event_type", "severity", "is_verified"),
+        # Neighbour search of the incident clusterer: one type, geohash ranges
+        Index("ix_events_type_geohash", "event_type", "geohash"),
+    )
+
+
+@listens_for(Event, "before_insert")
+@listens_for(Event, "before_update")
+def _sync_geohash(mapper, connection, target):
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = geohash_utils.encode(target.latitude, target.longitude)
+    else:
+        target.geohash = None
 
 
 class SatelliteData(Base):
@@ -58,11 +83,14 @@ class SatelliteData(Base):
     region_name = Column(String, index=True)
     latitude = Column(Float)
     longitude = Column(Float)
+    geohash = Column(String(12))  # cell the metrics were computed for
+    radius_km = Column(Float, nullable=True)
     
     # Satellite Info
     satellite_source = Column(String)  # sentinel-2, landsat-8, modis
     image_id = Column(String)
-    collection_date = Column(DateTime)
+    collection_date = Column(DateTime)  # start of the period the metrics cover
+    period_days = Column(Integer, nullable=True)  # 7 for a weekly composite, 1 for a single day
     
     # Analysis Type
     analysis_type = Column(String)  # ndvi, ndwi, burn_index, thermal
@@ -76,4 +104,11 @@ class SatelliteData(Base):
     cloud_coverage = Column(Float, nullable=True)
     resolution_meters = Column(Float)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Period lookups of the composite store: one cell, index and radius over a
+        # date range. Unique so concurrent writers of a period store one row
+        Index("ux_satellite_data_composite", "analysis_type", "geohash", "radius_km",
+              "period_days", "collection_date", unique=True),
+    )
@@ -0,0 +1,42 @@
+# app/models/incident.py
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, Index
+from datetime import datetime
+from app.database.connection import Base
+
+class Incident(Base):
+    __tablename__ = "incidents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)
+
+    # Centroid (mean of the member events) and their bounding box
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
+    min_latitude = Column(Float)
+    min_longitude = Column(Float)
+    max_latitude = Column(Float)
+    max_longitude = Column(Float)
+
+    # Aggregates over the member events
+    event_count = Column(Integer, default=0, nullable=False)
+    max_severity = Column(String, nullable=True)
+    first_seen = Column(DateTime)
+    last_seen = Column(DateTime)
+
+    # Satellite verification, run once for the whole incident
+    is_verified = Column(Boolean, default=False)
+    verification_status = Column(String, default="pending")  # pending, verified, unverified
+    verification_score = Column(Float, nullable=True)
+    analysis_results = Column(JSON, nullable=True)
+    verified_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # /api/incidents: newest activity first, optionally one type
+        Index("ix_incidents_type_last_seen", "event_type", "last_seen"),
+        # Ids of incidents removed by a merge are never handed out again
+        {"sqlite_autoincrement": True},
+    )
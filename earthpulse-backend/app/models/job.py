@@ -0,0 +1,37 @@
+# app/models/job.py
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, ForeignKey, Index
+from datetime import datetime
+from app.database.connection import Base
+
+class VerificationJob(Base):
+    __tablename__ = "verification_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), index=True, nullable=False)
+
+    # Queue State
+    status = Column(String, default="queued", nullable=False)  # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)  # not claimable before this (backoff)
+
+    # Lease held by the worker running the job; expired leases are reclaimed
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+
+    # Outcome
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)  # verified / score written to the event
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Claim query: next ready job in queue order
+        Index("ix_verification_jobs_status_run_after", "status", "run_after"),
+        # Throughput window over recently finished jobs
+        Index("ix_verification_jobs_finished_at", "finished_at"),
+    )
@@ -0,0 +1,54 @@
+# app/models/news.py
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, ForeignKey
+from datetime import datetime
+from app.database.connection import Base
+
+class NewsFeed(Base):
+    __tablename__ = "news_feeds"
+
+    # Validators from the last 200 response, sent back as a conditional GET
+    url = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+
+    last_status = Column(Integer, nullable=True)  # 200, 304, ...
+    polled_at = Column(DateTime, nullable=True)
+    changed_at = Column(DateTime, nullable=True)  # last 200
+
+
+class SeenUrl(Base):
+    __tablename__ = "seen_urls"
+
+    # sha1 of the normalized article URL; authoritative answer behind the Bloom filter
+    url_hash = Column(String(40), primary_key=True)
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BloomFilterState(Base):
+    __tablename__ = "bloom_filters"
+
+    # Bit array of a named Bloom filter, so a restart does not rebuild it
+    name = Column(String, primary_key=True)
+    num_bits = Column(Integer, nullable=False)
+    num_hashes = Column(Integer, nullable=False)
+    items = Column(Integer, default=0, nullable=False)
+    bits = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class StorySignature(Base):
+    __tablename__ = "story_signatures"
+
+    # MinHash of the story an event was created from (see app.scraping.dedup)
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    signature = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class StoryBand(Base):
+    __tablename__ = "story_bands"
+
+    # One row per LSH band of a signature: stories sharing a band_key are candidates
+    id = Column(Integer, primary_key=True)
+    band_key = Column(String(40), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
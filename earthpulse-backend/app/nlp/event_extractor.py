@@ -1,54 +1,58 @@
-import spacy
-from transformers import pipeline
-from geopy.geocoders import Nominatim
 import logging
+import os
+from typing import Dict, List, Sequence
+
+from app.nlp.model_registry import ModelRegistry, registry
 
 logger = logging.getLogger(__name__)
 
+# Texts per nlp.pipe batch, and worker processes spaCy may fork for it
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "64"))
+NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
+# Premise/hypothesis pairs per zero-shot forward pass (each text makes one
+# pair per event type)
+ZERO_SHOT_BATCH_SIZE = int(os.getenv("ZERO_SHOT_BATCH_SIZE", "16"))
+
+# Components NER does not need; skipped when running the pipeline
+NER_DISABLE = ("parser", "lemmatizer")
+
 class EventExtractor:
-    def __init__(self):
-        # Load spaCy model for NER
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            logger.warning("Downloading spaCy model...")
-            import os
-            os.system("python -m spacy download en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
-        
+    """
+    Extracts locations and an event type from news articles
+
+    Holds no models itself: spaCy, the zero-shot classifier and the geocoder
+    come from the shared ModelRegistry and are loaded the first time they
+    are used, so creating an extractor (or importing this module) is free.
+    """
+    
+    def __init__(self, models: ModelRegistry = registry):
+        self.models = models
+        self.event_types = ["wildfire", "flood", "deforestation", "drought", "earthquake", "hurricane"]
+    
+    @property
+    def nlp(self):
+        # spaCy model for NER
+        return self.models.get("spacy")
+    
+    @property
+    def classifier(self):
         # Transformers for event classification
-        self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-        
+        return self.models.get("zero_shot")
+    
+    @property
+    def geocoder(self):
         # Geocoder for location coordinates
-        self.geocoder = Nominatim(user_agent="earthpulse_ai")
-        
-        self.event_types = ["wildfire", "flood", "deforestation", "drought", "earthquake", "hurricane"]
+        return self.models.get("geocoder")
     
     def extract_locations(self, text):
         """Extract location entities from text"""
-        doc = self.nlp(text)
-        locations = []
-        
-        for ent in doc.ents:
-            if ent.label_ in ["GPE", "LOC", "FAC"]:  # Geopolitical Entity, Location, Facility
-                locations.append({
-                    'name': ent.text,
-                    'type': ent.label_
-                })
-        
-        return locations
+        return self._locations(self.nlp(text, disable=self._ner_disabled()))
     
     def geocode_location(self, location_name):
-        """Convert location name to lat/lon coordinates"""
+        """Convert location name to lat/lon coordinates (gazetteer, cache, then Nominatim)"""
         try:
-            location = self.geocoder.geocode(location_name)
-            if location:
-                return {
-                    'name': location_name,
-                    'latitude': location.latitude,
-                    'longitude': location.longitude,
-                    'full_address': location.address
-                }
+            return self.geocoder.geocode(location_name)
         except Exception as e:
             logger.error(f"Geocoding error for {location_name}: {e}")
         
@@ -66,9 +70,78 @@ class EventExtractor:
             logger.error(f"Classification error: {e}")
             return {'event_type': 'unknown', 'confidence': 0.0}
     
+    @staticmethod
+    def _article_text(article_data) -> str:
+        return f"{article_data['title']} {article_data['description']}"
+    
+    @staticmethod
+    def _locations(doc) -> List[Dict]:
+        return [
+            {'name': ent.text, 'type': ent.label_}
+            for ent in doc.ents
+            if ent.label_ in ["GPE", "LOC", "FAC"]  # Geopolitical Entity, Location, Facility
+        ]
+    
+    def _ner_disabled(self) -> List[str]:
+        return [name for name in NER_DISABLE if name in self.nlp.pipe_names]
+    
+    def classify_event_types(self, texts: Sequence[str],
+                             batch_size: int = ZERO_SHOT_BATCH_SIZE) -> List[Dict]:
+        """classify_event_type for many texts, batched through the classifier, in input order"""
+        if not texts:
+            return []
+        try:
+            results = self.classifier(list(texts), self.event_types, batch_size=batch_size)
+            if isinstance(results, dict):
+                results = [results]
+            return [
+                {'event_type': r['labels'][0], 'confidence': r['scores'][0]}
+                for r in results
+            ]
+        except Exception as e:
+            logger.error(f"Batch classification error: {e}")
+            return [{'event_type': 'unknown', 'confidence': 0.0} for _ in texts]
+    
+    def process_articles(self, articles: Sequence[Dict], batch_size: int = NLP_BATCH_SIZE,
+                         n_process: int = NLP_N_PROCESS,
+                         zero_shot_batch_size: int = ZERO_SHOT_BATCH_SIZE,
+                         geocode: bool = True) -> List[Dict]:
+        """
+        process_article for many articles, in input order
+        
+        NER runs through nlp.pipe (batch_size texts at a time, optionally
+        across n_process processes, parser and lemmatizer off) and the
+        zero-shot classifier gets the texts in batches instead of one call
+        per article. Each distinct primary location is geocoded once.
+        """
+        articles = list(articles)
+        texts = [self._article_text(a) for a in articles]
+        
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process,
+                             disable=self._ner_disabled())
+        locations = [self._locations(doc) for doc in docs]
+        
+        geocoded = {}
+        if geocode:
+            for name in dict.fromkeys(locs[0]['name'] for locs in locations if locs):
+                geocoded[name] = self.geocode_location(name)
+        
+        classifications = self.classify_event_types(texts, zero_shot_batch_size)
+        
+        return [
+            {
+                **article,
+                'locations': locs,
+                'primary_location': geocoded.get(locs[0]['name']) if locs else None,
+                'event_type': classification['event_type'],
+                'event_confidence': classification['confidence']
+            }
+            for article, locs, classification in zip(articles, locations, classifications)
+        ]
+    
     def process_article(self, article_data):
         """Process article to extract structured event information"""
-        text = f"{article_data['title']} {article_data['description']}"
+        text = self._article_text(article_data)
         
         # Extract locations
         locations = self.extract_locations(text)
@@ -89,9 +162,5 @@ class EventExtractor:
             'event_confidence': event_classification['confidence']
         }
 
-# Usage
+# Shared instance; models load on its first use
 extractor = EventExtractor()
-processed_event = extractor.process_article({
-    'title': 'Massive wildfire in California',
-    'description': 'A large wildfire is burning near Los Angeles...'
-})
\ No newline at end of file
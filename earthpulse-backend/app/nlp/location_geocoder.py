@@ -0,0 +1,266 @@
+# app/nlp/location_geocoder.py
+"""
+Place name -> coordinates, offline first
+
+Names are resolved against an in-memory gazetteer (a GeoNames-style dump
+indexed by normalized name), then a persistent cache of earlier remote
+answers, and only then Nominatim, which is throttled to its usage policy of
+one request per second. Remote answers, including "not found", are cached so
+each unknown name costs at most one remote call.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_GAZETTEER = os.path.join(os.path.dirname(__file__), "data", "gazetteer.tsv")
+
+# Comma separated GeoNames-format files (e.g. cities15000.txt, allCountries.txt)
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", BUNDLED_GAZETTEER)
+
+# Remote answers are kept here; set GEOCODE_CACHE_PATH="" to keep them in memory only
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", "./geocode_cache.db")
+
+# How long a "not found" from Nominatim is trusted (found places never expire)
+GEOCODE_MISS_TTL = int(os.getenv("GEOCODE_MISS_TTL", str(7 * 24 * 3600)))
+
+# GEOCODER_REMOTE=0 resolves from the gazetteer and cache only
+GEOCODER_REMOTE = os.getenv("GEOCODER_REMOTE", "1") == "1"
+GEOCODER_USER_AGENT = "earthpulse_ai"
+NOMINATIM_MIN_INTERVAL = 1.0
+
+# Feature class preference when two places share a name and population
+FEATURE_CLASS_RANK = {"A": 3, "P": 2, "L": 1}
+
+
+def normalize_place_name(name: str) -> str:
+    """Case, accents, punctuation and a leading "the" do not matter: "the Amazon  Basin" == "amazon basin" """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).casefold()
+    name = re.sub(r"[^\w]+", " ", name).strip()
+    if name.startswith("the "):
+        name = name[4:]
+    return name
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    latitude: float
+    longitude: float
+    feature_class: str
+    country_code: str
+    population: int
+
+    @property
+    def address(self) -> str:
+        return f"{self.name}, {self.country_code}" if self.country_code else self.name
+
+
+class Gazetteer:
+    """
+    Hash index over a GeoNames-style dump
+
+    Every name, ASCII name and alternate name of a row is a key; when several
+    places share a key the most populous one wins (ties go to countries and
+    regions over towns), which is what a news article usually means.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._index: Dict[str, Place] = {}
+        self._rank: Dict[str, tuple] = {}
+        self.rows = 0
+        for path in paths:
+            self.load(path)
+
+    def load(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) < 15:
+                    continue
+                place = Place(
+                    name=cols[1],
+                    latitude=float(cols[4]),
+                    longitude=float(cols[5]),
+                    feature_class=cols[6],
+                    country_code=cols[8],
+                    population=int(cols[14] or 0),
+                )
+                self.rows += 1
+                names = {cols[1], cols[2], *filter(None, cols[3].split(","))}
+                for name in names:
+                    self._add(normalize_place_name(name), place)
+
+    def _add(self, key: str, place: Place):
+        if not key:
+            return
+        rank = (place.population, FEATURE_CLASS_RANK.get(place.feature_class, 0))
+        if key not in self._index or rank > self._rank[key]:
+            self._index[key] = place
+            self._rank[key] = rank
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Exact normalized match, else the part before the first comma ("Paradise, CA")"""
+        key = normalize_place_name(name)
+        place = self._index.get(key)
+        if place is None and "," in name:
+            place = self._index.get(normalize_place_name(name.split(",", 1)[0]))
+        return place
+
+    def __len__(self):
+        return len(self._index)
+
+
+class GeocodeCache:
+    """
+    Remote geocoding answers by normalized name: a dict in front of a SQLite
+    file shared by every worker on the host (same layout idea as the
+    analysis cache). A stored None means Nominatim did not know the name.
+    """
+
+    def __init__(self, path: Optional[str] = GEOCODE_CACHE_PATH, miss_ttl: int = GEOCODE_MISS_TTL):
+        self.miss_ttl = miss_ttl
+        self._memory: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                    " key TEXT PRIMARY KEY, latitude REAL, longitude REAL, address TEXT, expires_at REAL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Geocode cache disk tier disabled ({path}): {e}")
+                self._db = None
+
+    def get(self, key: str):
+        """(True, (lat, lon, address) or None) if known, else (False, None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT latitude, longitude, address, expires_at FROM geocode_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[3], None if row[0] is None else row[:3])
+                    self._memory[key] = entry
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._memory[key]
+                return False, None
+            return True, value
+
+    def set(self, key: str, value: Optional[tuple]):
+        expires_at = None if value is not None else time.time() + self.miss_ttl
+        lat, lon, address = value if value is not None else (None, None, None)
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (key, latitude, longitude, address, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, lat, lon, address, expires_at)
+                )
+                self._db.commit()
+
+    def __len__(self):
+        return len(self._memory)
+
+
+class LocationGeocoder:
+    """
+    Gazetteer, then cache, then (throttled) Nominatim
+
+    geocode() returns {'name', 'latitude', 'longitude', 'full_address',
+    'source'} or None; source is "gazetteer", "cache" or "nominatim".
+    """
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None, cache: Optional[GeocodeCache] = None,
+                 remote: bool = GEOCODER_REMOTE):
+        if gazetteer is None:
+            gazetteer = Gazetteer(p.strip() for p in GAZETTEER_PATH.split(",") if p.strip())
+        self.gazetteer = gazetteer
+        self.cache = cache if cache is not None else GeocodeCache()
+        self.remote = remote
+        self._nominatim = None
+        self._remote_lock = threading.Lock()
+        self._last_remote = 0.0
+        self._counters = {"gazetteer_hits": 0, "cache_hits": 0, "remote_calls": 0, "misses": 0}
+
+    def _count(self, name: str):
+        self._counters[name] += 1
+
+    @staticmethod
+    def _result(name: str, latitude: float, longitude: float, address: str, source: str) -> Dict:
+        return {
+            'name': name,
+            'latitude': latitude,
+            'longitude': longitude,
+            'full_address': address,
+            'source': source,
+        }
+
+    def _query_nominatim(self, name: str):
+        # One request at a time, at most one per second, across all threads
+        with self._remote_lock:
+            if self._nominatim is None:
+                from geopy.geocoders import Nominatim
+                self._nominatim = Nominatim(user_agent=GEOCODER_USER_AGENT)
+            wait = self._last_remote + NOMINATIM_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self._count("remote_calls")
+                return self._nominatim.geocode(name)
+            finally:
+                self._last_remote = time.monotonic()
+
+    def geocode(self, name: str) -> Optional[Dict]:
+        place = self.gazetteer.lookup(name)
+        if place is not None:
+            self._count("gazetteer_hits")
+            return self._result(name, place.latitude, place.longitude, place.address, "gazetteer")
+
+        key = normalize_place_name(name)
+        known, value = self.cache.get(key)
+        if known:
+            self._count("cache_hits")
+            return self._result(name, *value, "cache") if value is not None else None
+
+        if not self.remote:
+            self._count("misses")
+            return None
+
+        # Errors (timeouts, rate limiting) propagate and are not cached
+        location = self._query_nominatim(name)
+        value = (location.latitude, location.longitude, location.address) if location else None
+        self.cache.set(key, value)
+        if value is None:
+            self._count("misses")
+            return None
+        return self._result(name, *value, "nominatim")
+
+    def stats(self) -> Dict:
+        return {
+            **self._counters,
+            "gazetteer_names": len(self.gazetteer),
+            "gazetteer_rows": self.gazetteer.rows,
+            "cached_names": len(self.cache),
+        }
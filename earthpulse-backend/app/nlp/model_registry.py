@@ -0,0 +1,123 @@
+# app/nlp/model_registry.py
+"""
+Process-wide registry of NLP models, loaded on first use
+
+Models are registered as loader functions and built the first time someone
+asks for them, then shared by every request and thread in the process.
+preload() builds them up front: call it in a parent process before workers
+fork (gunicorn --preload with NLP_PRELOAD=1) and the weights are shared
+copy-on-write instead of loaded once per worker.
+"""
+import gc
+import logging
+import os
+import resource
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+ZERO_SHOT_MODEL = os.getenv("ZERO_SHOT_MODEL", "facebook/bart-large-mnli")
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux /proc), else peak RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], object]] = {}
+        self._models: Dict[str, object] = {}
+        self._stats: Dict[str, Dict] = {}
+        # One load at a time: concurrent first users wait for a single load,
+        # and the RSS delta measured around a load belongs to that model
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], object]):
+        self._loaders[name] = loader
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+
+            logger.info(f"🧠 Loading model {name}...")
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            model = self._loaders[name]()
+            seconds = time.perf_counter() - started
+            rss_mb = (_rss_bytes() - rss_before) / (1024 * 1024)
+
+            self._models[name] = model
+            self._stats[name] = {"load_seconds": round(seconds, 3), "rss_delta_mb": round(rss_mb, 1)}
+            logger.info(f"✅ Loaded {name} in {seconds:.2f}s (+{rss_mb:.0f} MB RSS)")
+            return model
+
+    def loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def preload(self, names: Optional[Iterable[str]] = None, freeze: bool = True):
+        """
+        Load models now (all registered ones by default)
+
+        With freeze, everything allocated so far is moved out of the garbage
+        collector's reach (gc.freeze()), so collections in forked workers do
+        not write to, and thereby copy, the shared model pages.
+        """
+        for name in names or list(self._loaders):
+            self.get(name)
+        if freeze:
+            gc.freeze()
+
+    def unload(self, name: str):
+        with self._lock:
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def stats(self) -> Dict:
+        """Per model: whether it is loaded, and its load time and RSS growth if so"""
+        return {
+            name: {"loaded": name in self._models, **self._stats.get(name, {})}
+            for name in self._loaders
+        }
+
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL)
+    except OSError as e:
+        raise RuntimeError(
+            f"spaCy model {SPACY_MODEL} is not installed; run `python -m spacy download {SPACY_MODEL}`"
+        ) from e
+
+
+def _load_zero_shot():
+    from transformers import pipeline
+    return pipeline("zero-shot-classification", model=ZERO_SHOT_MODEL)
+
+
+def _load_geocoder():
+    # Builds the gazetteer index; Nominatim is only set up if it is ever needed
+    from app.nlp.location_geocoder import LocationGeocoder
+    return LocationGeocoder()
+
+
+registry = ModelRegistry()
+registry.register("spacy", _load_spacy)
+registry.register("zero_shot", _load_zero_shot)
+registry.register("geocoder", _load_geocoder)
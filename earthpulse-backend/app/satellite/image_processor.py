@@ -0,0 +1,313 @@
+# app/satellite/image_processor.py
+"""
+Tiled composite / band-math processing over large areas of interest
+
+An AOI is laid out as an EPSG:4326 output grid and cut into fixed-size
+blocks. Each block is processed independently in a worker process: the
+scenes covering it are warped onto the block grid (only the window needed),
+composited per pixel (median or mean, like ImageCollection.median()), turned
+into an index with band_math and summarised. The parent process writes
+finished blocks into a tiled, compressed GeoTIFF and merges the summaries,
+so memory stays bounded by block size x scenes x workers whatever the AOI.
+
+    python -m app.satellite.image_processor --bbox 76.84,12.56,77.86,13.55 \\
+        --start 2024-01-01 --end 2024-12-31 --max-cloud 10 --out ndvi.tif
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.analysis import band_math
+from app.satellite import raster_store
+from app.satellite.raster_store import SENTINEL2, RasterCatalog
+from app.utils.helpers import BBox, parse_bbox
+
+logger = logging.getLogger(__name__)
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import from_origin
+    from rasterio.vrt import WarpedVRT
+    from rasterio.windows import Window
+except ImportError:
+    rasterio = None
+
+# Output pixels per block side; a multiple of 16 as GeoTIFF tiling requires
+BLOCK_SIZE = int(os.getenv("RASTER_BLOCK_SIZE", "512"))
+
+RASTER_WORKERS = int(os.getenv("RASTER_WORKERS", str(os.cpu_count() or 2)))
+
+# Index -> (a, b) bands of normalized_difference(a, b)
+INDICES = {
+    "ndvi": ("B8", "B4"),
+    "ndwi": ("B3", "B8"),
+}
+
+COMPOSITES = ("median", "mean")
+
+# Histogram over the index's [-1, 1] range, as ee.Reducer.histogram(255)
+HISTOGRAM_BINS = 255
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+class BlockStats:
+    """
+    Mergeable summary of index values: count, sum, min, max and a fixed-bin histogram
+
+    Blocks are summarised where they are computed and merged in any order.
+    The median and percentiles are read off the merged histogram, exact to
+    one bin width (2 / HISTOGRAM_BINS), since exact quantiles would need
+    every pixel of the AOI in memory at once.
+    """
+
+    def __init__(self, bins: int = HISTOGRAM_BINS, value_range: Tuple[float, float] = (-1.0, 1.0)):
+        self.value_range = value_range
+        self.edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ma.MaskedArray):
+        data = values.compressed() if np.ma.isMaskedArray(values) else np.ravel(values)
+        data = data[np.isfinite(data)]
+        if not data.size:
+            return
+        self.count += int(data.size)
+        self.total += float(data.sum(dtype=np.float64))
+        self.min = min(self.min, float(data.min()))
+        self.max = max(self.max, float(data.max()))
+        clipped = np.clip(data, *self.value_range)
+        self.histogram += np.histogram(clipped, bins=self.edges)[0]
+
+    def merge(self, other: "BlockStats"):
+        self.histogram += other.histogram
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        cumulative = np.cumsum(self.histogram)
+        target = q / 100 * self.count
+        i = int(np.searchsorted(cumulative, target))
+        i = min(i, len(self.histogram) - 1)
+        before = cumulative[i - 1] if i else 0
+        inside = self.histogram[i]
+        fraction = (target - before) / inside if inside else 0.5
+        return float(self.edges[i] + fraction * (self.edges[i + 1] - self.edges[i]))
+
+    def to_dict(self) -> Dict:
+        if not self.count:
+            return {"count": 0, "mean": None, "min": None, "max": None, "median": None,
+                    "percentiles": {}, "histogram": None}
+        centres = (self.edges[:-1] + self.edges[1:]) / 2
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+            "median": round(self.percentile(50), 4),
+            "percentiles": {f"p{q}": round(self.percentile(q), 4) for q in PERCENTILES},
+            "histogram": {
+                "bucket_means": [round(float(c), 4) for c in centres],
+                "counts": self.histogram.tolist(),
+            },
+        }
+
+
+def output_grid(bbox: BBox, resolution: float) -> Tuple[object, int, int]:
+    """(transform, width, height) of an EPSG:4326 grid covering bbox at resolution degrees"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    # round() first so 0.2 / 0.0001 = 2000.0000000000002 is 2000 pixels, not 2001
+    width = max(1, math.ceil(round((max_lon - min_lon) / resolution, 6)))
+    height = max(1, math.ceil(round((max_lat - min_lat) / resolution, 6)))
+    return from_origin(min_lon, max_lat, resolution, resolution), width, height
+
+
+def iter_blocks(width: int, height: int, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, int, int, int]]:
+    """(col_off, row_off, width, height) of each block, row by row"""
+    for row in range(0, height, block_size):
+        for col in range(0, width, block_size):
+            yield col, row, min(block_size, width - col), min(block_size, height - row)
+
+
+def _read_block(path: str, band_indexes: Sequence[int], transform, width: int, height: int,
+                block: Tuple[int, int, int, int]) -> np.ma.MaskedArray:
+    """Bands of one scene warped onto the output grid, for one block only"""
+    with rasterio.open(path) as src:
+        nodata = src.nodata if src.nodata is not None else 0
+        with WarpedVRT(src, crs="EPSG:4326", transform=transform, width=width, height=height,
+                       nodata=nodata, resampling=Resampling.nearest) as vrt:
+            return vrt.read(list(band_indexes), window=Window(*block), masked=True)
+
+
+def process_block(job: Dict) -> Tuple[Tuple[int, int, int, int], np.ndarray, BlockStats]:
+    """
+    Composite and band math for one block (runs in a worker process)
+
+    job carries only plain, picklable values: the block, the output grid,
+    the index bands and (path, band indexes, has SCL) per candidate scene.
+    """
+    block = job["block"]
+    stack = []
+    for path, band_indexes, has_scl in job["scenes"]:
+        data = _read_block(path, band_indexes, job["transform"], job["width"], job["height"], block)
+        if np.ma.getmaskarray(data).all():
+            continue
+        if has_scl:
+            cloudy = band_math.cloud_mask(data[-1])
+            data = np.ma.masked_array(data[:2], mask=np.ma.getmaskarray(data[:2]) | cloudy)
+        stack.append(data[:2].astype(np.float32))
+
+    stats = BlockStats()
+    if not stack:
+        return block, np.full((block[3], block[2]), np.nan, dtype=np.float32), stats
+
+    # NaN-aware reductions on plain arrays are several times faster than masked ones
+    stacked = np.stack([s.filled(np.nan) for s in stack])
+    if job["composite"] == "median":
+        composite = band_math.nan_median(stacked, axis=0)
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN pixels stay NaN
+            composite = np.nanmean(stacked, axis=0)
+    composite = np.ma.masked_invalid(composite)
+    index = band_math.normalized_difference(composite[0], composite[1])
+    stats.update(index)
+    return block, index.filled(np.nan).astype(np.float32), stats
+
+
+def process_aoi(bbox: BBox, start_date: str, end_date: str, output_path: Optional[str] = None,
+                index: str = "ndvi", composite: str = "median", resolution: float = 0.0001,
+                max_cloud: Optional[float] = None, block_size: int = BLOCK_SIZE,
+                workers: int = RASTER_WORKERS, catalog: Optional[RasterCatalog] = None) -> Dict:
+    """
+    Composite + index over bbox, block by block across a process pool
+
+    At most 2 x workers blocks are in flight, so finished-but-unwritten
+    blocks cannot pile up. With output_path the index is written as a
+    float32 GeoTIFF tiled at block_size with DEFLATE + floating point
+    predictor, NaN as nodata. Returns the merged statistics and timings.
+    """
+    if rasterio is None:
+        raise RuntimeError("rasterio is not installed")
+    if index not in INDICES:
+        raise ValueError(f"index must be one of {sorted(INDICES)}")
+    if composite not in COMPOSITES:
+        raise ValueError(f"composite must be one of {COMPOSITES}")
+    if block_size % 16:
+        raise ValueError("block_size must be a multiple of 16")
+
+    started = time.perf_counter()
+    catalog = catalog or raster_store.raster_catalog
+    scenes = catalog.scenes(SENTINEL2, bbox, start_date, end_date, max_cloud)
+    index_bands = INDICES[index]
+    transform, width, height = output_grid(bbox, resolution)
+
+    def job(block):
+        # Only scenes whose footprint touches this block are opened by the worker
+        left, top = transform * (block[0], block[1])
+        right, bottom = transform * (block[0] + block[2], block[1] + block[3])
+        block_bbox = (left, bottom, right, top)
+        candidates = []
+        for scene in scenes:
+            if not raster_store.intersects(scene.bounds, block_bbox):
+                continue
+            has_scl = "SCL" in scene.bands
+            bands = [scene.bands[index_bands[0]], scene.bands[index_bands[1]]]
+            if has_scl:
+                bands.append(scene.bands["SCL"])
+            candidates.append((scene.path, bands, has_scl))
+        return {"block": block, "transform": transform, "width": width, "height": height,
+                "index_bands": index_bands, "composite": composite, "scenes": candidates}
+
+    profile = {
+        "driver": "GTiff", "dtype": "float32", "count": 1, "crs": "EPSG:4326",
+        "transform": transform, "width": width, "height": height, "nodata": np.nan,
+        "tiled": True, "blockxsize": block_size, "blockysize": block_size,
+        "compress": "deflate", "predictor": 3, "BIGTIFF": "IF_SAFER",
+    }
+
+    stats = BlockStats()
+    blocks = iter_blocks(width, height, block_size)
+    block_count = 0
+    dst = rasterio.open(output_path, "w", **profile) if output_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for block in blocks:
+                pending.add(pool.submit(process_block, job(block)))
+                if len(pending) < 2 * workers:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                block_count += _collect(done, dst, stats)
+            block_count += _collect(pending, dst, stats)
+        if dst is not None:
+            dst.update_tags(index=index, composite=composite, start_date=start_date,
+                            end_date=end_date, scenes=str(len(scenes)))
+    finally:
+        if dst is not None:
+            dst.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        "index": index,
+        "composite": composite,
+        "bbox": list(bbox),
+        "date_range": {"start": start_date, "end": end_date},
+        "scene_count": len(scenes),
+        "size": {"width": width, "height": height, "resolution_deg": resolution},
+        "blocks": block_count,
+        "output": output_path,
+        "stats": stats.to_dict(),
+        "seconds": round(seconds, 2),
+        "megapixels_per_second": round(width * height / 1e6 / seconds, 2) if seconds else None,
+    }
+
+
+def _collect(futures, dst, stats: BlockStats) -> int:
+    for future in futures:
+        block, values, block_stats = future.result()
+        stats.merge(block_stats)
+        if dst is not None:
+            dst.write(values, 1, window=Window(*block))
+    return len(futures)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bbox", required=True, help="min_lon,min_lat,max_lon,max_lat")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--out", default=None, help="GeoTIFF to write (stats only if omitted)")
+    parser.add_argument("--index", choices=sorted(INDICES), default="ndvi")
+    parser.add_argument("--composite", choices=COMPOSITES, default="median")
+    parser.add_argument("--resolution", type=float, default=0.0001, help="degrees per pixel")
+    parser.add_argument("--max-cloud", type=float, default=None)
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--workers", type=int, default=RASTER_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = process_aoi(parse_bbox(args.bbox), args.start, args.end, args.out,
+                         index=args.index, composite=args.composite, resolution=args.resolution,
+                         max_cloud=args.max_cloud, block_size=args.block_size, workers=args.workers)
+    report["stats"].pop("histogram", None)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
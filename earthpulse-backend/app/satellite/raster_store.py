@@ -0,0 +1,253 @@
+# app/satellite/raster_store.py
+"""
+Catalog of locally cached satellite GeoTIFFs and windowed reads from them
+
+Scenes live under RASTER_DATA_DIR as
+
+    <source>/<YYYY-MM-DD>/<any name>.tif
+
+where source is "sentinel2" (bands B3, B4, B8 and optionally SCL) or
+"modis_fire" (band FireMask). Bands are found by their GDAL band description
+and fall back to SOURCE_BANDS order. Each scene's header is read once, so
+picking the scenes for a query never opens a file that does not intersect it.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.analysis import band_math
+from app.utils.helpers import BBox
+
+logger = logging.getLogger(__name__)
+
+try:
+    import rasterio
+    from rasterio.warp import transform as warp_transform
+    from rasterio.warp import transform_bounds
+    from rasterio.windows import Window, from_bounds
+    RASTERIO_AVAILABLE = True
+except ImportError:
+    RASTERIO_AVAILABLE = False
+
+RASTER_DATA_DIR = os.getenv("RASTER_DATA_DIR", "./data/rasters")
+
+# Seconds before the catalog rescans the directory for new scenes
+RASTER_CATALOG_TTL = float(os.getenv("RASTER_CATALOG_TTL", "300"))
+
+SENTINEL2 = "sentinel2"
+MODIS_FIRE = "modis_fire"
+
+# Band order assumed when a file carries no band descriptions
+SOURCE_BANDS = {
+    SENTINEL2: ("B3", "B4", "B8"),
+    MODIS_FIRE: ("FireMask",),
+}
+
+# Uncompressed, untiled scenes are memory-mapped instead of copied through
+# GDAL's block cache
+GDAL_READ_OPTIONS = {"GTIFF_VIRTUAL_MEM_IO": "IF_ENOUGH_RAM"}
+
+
+@dataclass(frozen=True)
+class Scene:
+    path: str
+    source: str
+    acquired: date
+    bands: Dict[str, int]  # band name -> 1-based band index
+    crs: object
+    transform: object
+    width: int
+    height: int
+    bounds: BBox  # (min_lon, min_lat, max_lon, max_lat)
+    cloud_cover: Optional[float]
+
+    @property
+    def grid(self) -> Tuple:
+        """Scenes with the same grid can be stacked pixel for pixel"""
+        return (str(self.crs), tuple(self.transform)[:6], self.width, self.height)
+
+
+@dataclass
+class SceneWindow:
+    """Bands of one scene clipped to the pixels inside a circular region"""
+    scene: Scene
+    window: object
+    bands: Dict[str, np.ma.MaskedArray]
+
+
+def intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def buffer_bounds(latitude: float, longitude: float, radius_km: float) -> BBox:
+    """Lon/lat box around a circle of radius_km"""
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(np.cos(np.radians(latitude)), 0.01))
+    return (longitude - dlon, max(latitude - dlat, -90.0),
+            longitude + dlon, min(latitude + dlat, 90.0))
+
+
+class RasterCatalog:
+    def __init__(self, root: str = RASTER_DATA_DIR, ttl: float = RASTER_CATALOG_TTL):
+        self.root = root
+        self.ttl = ttl
+        self._scenes: Dict[str, List[Scene]] = {}
+        self._scanned_at: Optional[float] = None  # monotonic time of the last scan
+        self._lock = threading.Lock()
+
+    def _describe(self, path: str, source: str, acquired: date) -> Optional[Scene]:
+        with rasterio.open(path) as src:
+            names = [d for d in src.descriptions]
+            defaults = SOURCE_BANDS[source]
+            bands = {}
+            for i, name in enumerate(names):
+                if not name and i < len(defaults):
+                    name = defaults[i]
+                if name:
+                    bands[name] = i + 1
+            if not all(b in bands for b in defaults):
+                logger.warning(f"⚠️ Skipping {path}: missing bands {set(defaults) - set(bands)}")
+                return None
+
+            bounds = tuple(src.bounds)
+            if not src.crs.is_geographic:
+                bounds = transform_bounds(src.crs, "EPSG:4326", *bounds, densify_pts=21)
+            cloud = src.tags().get("CLOUDY_PIXEL_PERCENTAGE")
+            return Scene(
+                path=path, source=source, acquired=acquired, bands=bands,
+                crs=src.crs, transform=src.transform, width=src.width, height=src.height,
+                bounds=bounds, cloud_cover=float(cloud) if cloud is not None else None,
+            )
+
+    def refresh(self):
+        scenes: Dict[str, List[Scene]] = {source: [] for source in SOURCE_BANDS}
+        for source in SOURCE_BANDS:
+            source_dir = os.path.join(self.root, source)
+            if not os.path.isdir(source_dir):
+                continue
+            for day in sorted(os.listdir(source_dir)):
+                try:
+                    acquired = date.fromisoformat(day)
+                except ValueError:
+                    continue
+                day_dir = os.path.join(source_dir, day)
+                for name in sorted(os.listdir(day_dir)):
+                    if not name.lower().endswith((".tif", ".tiff")):
+                        continue
+                    try:
+                        scene = self._describe(os.path.join(day_dir, name), source, acquired)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not read {name}: {e}")
+                        continue
+                    if scene is not None:
+                        scenes[source].append(scene)
+
+        with self._lock:
+            self._scenes = scenes
+            self._scanned_at = time.monotonic()
+        logger.info("🗂️ Raster catalog: " + ", ".join(f"{s}={len(v)}" for s, v in scenes.items()))
+
+    def scenes(self, source: str, bbox: BBox, start_date: str, end_date: str,
+               max_cloud_cover: Optional[float] = None) -> List[Scene]:
+        """Scenes intersecting bbox acquired in [start_date, end_date), like filterBounds/filterDate"""
+        if self._scanned_at is None or time.monotonic() - self._scanned_at > self.ttl:
+            self.refresh()
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        with self._lock:
+            candidates = self._scenes.get(source, [])
+        return [
+            s for s in candidates
+            if start <= s.acquired < end
+            and intersects(s.bounds, bbox)
+            and (max_cloud_cover is None or s.cloud_cover is None or s.cloud_cover < max_cloud_cover)
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"root": self.root, **{s: len(v) for s, v in self._scenes.items()}}
+
+
+def _pixel_centres(scene: Scene, window) -> Tuple[np.ndarray, np.ndarray]:
+    """Column x and row y coordinates of pixel centres inside window (north-up grids)"""
+    t = scene.transform
+    cols = window.col_off + np.arange(window.width) + 0.5
+    rows = window.row_off + np.arange(window.height) + 0.5
+    return t.c + cols * t.a, t.f + rows * t.e
+
+
+def read_circle(scene: Scene, latitude: float, longitude: float, radius_km: float,
+                bands: Sequence[str]) -> Optional[SceneWindow]:
+    """
+    Read the named bands for the pixels whose centres lie within radius_km
+
+    Only the window bounding the circle is read. Pixels outside the circle,
+    nodata pixels and (for Sentinel-2 with SCL) cloud pixels come back masked.
+    Returns None when the circle misses the scene.
+    """
+    if scene.crs.is_geographic:
+        bbox = buffer_bounds(latitude, longitude, radius_km)
+        cx, cy = longitude, latitude
+    else:
+        xs, ys = warp_transform("EPSG:4326", scene.crs, [longitude], [latitude])
+        cx, cy = xs[0], ys[0]
+        r = radius_km * 1000
+        bbox = (cx - r, cy - r, cx + r, cy + r)
+
+    window = _clip_window(from_bounds(*bbox, transform=scene.transform), scene)
+    if window is None:
+        return None
+
+    px, py = _pixel_centres(scene, window)
+    if scene.crs.is_geographic:
+        inside = band_math.circle_mask_geographic(px, py, latitude, longitude, radius_km)
+    else:
+        inside = band_math.circle_mask_projected(px, py, cx, cy, radius_km)
+    if not inside.any():
+        return None
+
+    wanted = list(bands)
+    if scene.source == SENTINEL2 and "SCL" in scene.bands and "SCL" not in wanted:
+        wanted.append("SCL")
+
+    with rasterio.Env(**GDAL_READ_OPTIONS), rasterio.open(scene.path) as src:
+        data = src.read([scene.bands[b] for b in wanted], window=window, masked=True)
+
+    outside = ~inside
+    if "SCL" in wanted:
+        outside = outside | band_math.cloud_mask(data[wanted.index("SCL")])
+    arrays = {}
+    for i, name in enumerate(wanted):
+        band = data[i]
+        band.mask = np.ma.getmaskarray(band) | outside
+        arrays[name] = band
+    return SceneWindow(scene=scene, window=window, bands=arrays)
+
+
+def _clip_window(window, scene: Scene):
+    """Whole pixels covering window, clipped to the scene; None if they do not overlap"""
+    col0 = max(math.floor(window.col_off), 0)
+    row0 = max(math.floor(window.row_off), 0)
+    col1 = min(math.ceil(window.col_off + window.width), scene.width)
+    row1 = min(math.ceil(window.row_off + window.height), scene.height)
+    if col1 <= col0 or row1 <= row0:
+        return None
+    return Window(col0, row0, col1 - col0, row1 - row0)
+
+
+def group_by_grid(windows: List[SceneWindow]) -> Iterator[List[SceneWindow]]:
+    """Windows that share a scene grid and read window, i.e. stackable pixel for pixel"""
+    groups: Dict[Tuple, List[SceneWindow]] = {}
+    for w in windows:
+        key = (w.scene.grid, w.window.col_off, w.window.row_off, w.window.width, w.window.height)
+        groups.setdefault(key, []).append(w)
+    return iter(groups.values())
+
+
+raster_catalog = RasterCatalog()
@@ -1,7 +1,7 @@
 # app/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 # Forest schemas
 class ForestDataBase(BaseModel):
@@ -51,4 +51,23 @@ class WildfireData(WildfireDataBase):
     timestamp: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Event schemas
+class EventCreate(BaseModel):
+    title: str = Field(min_length=1)
+    description: Optional[str] = None
+    event_type: str
+    severity: Optional[str] = None
+    location_name: Optional[str] = None
+    country: Optional[str] = None
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    source_url: Optional[str] = None
+    source_urls: Optional[List[str]] = None
+    source_type: Optional[str] = None
+    published_at: Optional[datetime] = None
+    raw_data: Optional[Dict[str, Any]] = None
+
+# Validates a whole JSON array straight from the request bytes
+EventCreateList = TypeAdapter(List[EventCreate])
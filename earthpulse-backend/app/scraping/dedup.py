@@ -0,0 +1,223 @@
+# app/scraping/dedup.py
+"""
+Near-duplicate news stories: MinHash signatures and an LSH index
+
+Syndicated copies of one report differ by a headline tweak or a trailing
+sentence, so exact matching misses them. Each story (title + description)
+becomes a set of word shingles, summarized by a MinHash signature whose
+agreement rate estimates the Jaccard similarity of two stories. The
+signature is cut into bands; stories sharing any band are candidates, and
+candidates at or above DEDUP_THRESHOLD are the same story. Finding them
+is a few hash lookups per story instead of a comparison with every other.
+
+merge_near_duplicates() collapses one batch; StoryIndex keeps signatures
+of stories that became events, so copies arriving in later polls are
+attached to the existing event (its source_urls) instead of creating one.
+"""
+import hashlib
+import logging
+import os
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.news import StoryBand, StorySignature
+from app.services.incidents import incident_clusterer
+
+logger = logging.getLogger(__name__)
+
+DEDUP_SHINGLE_WORDS = 3
+DEDUP_NUM_PERM = 128
+# 32 bands of 4 rows: pairs above ~0.42 Jaccard almost always share a band
+DEDUP_BANDS = 32
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+# Stored stories older than this are not matched (a fire next year is a new event)
+DEDUP_WINDOW_DAYS = int(os.getenv("DEDUP_WINDOW_DAYS", "7"))
+
+LOOKUP_CHUNK = 500
+
+_MERSENNE_61 = (1 << 61) - 1
+_rng = random.Random(20240801)  # fixed: stored signatures must stay comparable
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_61), _rng.randrange(0, _MERSENNE_61))
+                 for _ in range(DEDUP_NUM_PERM)]
+
+
+def story_text(item: Dict) -> str:
+    return f"{item.get('title') or ''} {item.get('description') or ''}"
+
+
+def shingles(text: str, k: int = DEDUP_SHINGLE_WORDS) -> List[int]:
+    """Stable 61-bit hashes of the k-word shingles of text (single words if it is shorter)"""
+    words = re.findall(r"\w+", text.casefold())
+    grams = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))} if words else set()
+    return [
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little") % _MERSENNE_61
+        for g in grams
+    ]
+
+
+def minhash(text: str) -> List[int]:
+    hashed = shingles(text)
+    if not hashed:
+        return [_MERSENNE_61] * DEDUP_NUM_PERM
+    return [min((a * x + b) % _MERSENNE_61 for x in hashed) for a, b in _PERMUTATIONS]
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the stories behind two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def band_keys(signature: Sequence[int], bands: int = DEDUP_BANDS) -> List[str]:
+    rows = len(signature) // bands
+    return [
+        f"{band:02d}" + hashlib.sha1(
+            ",".join(map(str, signature[band * rows:(band + 1) * rows])).encode()
+        ).hexdigest()[:24]
+        for band in range(bands)
+    ]
+
+
+@dataclass
+class Story:
+    """One real-world report: the first copy seen, and the URLs of every copy"""
+    item: Dict
+    signature: List[int]
+    source_urls: List[str] = field(default_factory=list)
+
+
+def merge_near_duplicates(items: Sequence[Dict], threshold: float = DEDUP_THRESHOLD) -> List[Story]:
+    """Collapse near-duplicate items (by title + description) into stories, in first-seen order"""
+    stories: List[Story] = []
+    buckets: Dict[str, List[int]] = {}
+    for item in items:
+        signature = minhash(story_text(item))
+        keys = band_keys(signature)
+        candidates = {i for key in keys for i in buckets.get(key, ())}
+        best, best_score = None, threshold
+        for i in candidates:
+            score = similarity(signature, stories[i].signature)
+            if score >= best_score:
+                best, best_score = i, score
+
+        urls = item.get('source_urls') or ([item['url']] if item.get('url') else [])
+        if best is not None:
+            stories[best].source_urls.extend(u for u in urls if u not in stories[best].source_urls)
+            continue
+
+        stories.append(Story(item, signature, list(dict.fromkeys(urls))))
+        for key in keys:
+            buckets.setdefault(key, []).append(len(stories) - 1)
+
+    if len(stories) < len(items):
+        logger.info(f"🧬 {len(items)} articles -> {len(stories)} distinct stories")
+    return stories
+
+
+class StoryIndex:
+    """Band keys and signatures of stored stories, pointing at the event each became"""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, window_days: int = DEDUP_WINDOW_DAYS):
+        self.threshold = threshold
+        self.window_days = window_days
+
+    def find(self, db: Session, signatures: Sequence[Sequence[int]]) -> List[Optional[int]]:
+        """For each signature, the event of the most similar recent stored story, if similar enough"""
+        keys = [band_keys(s) for s in signatures]
+        wanted = list({k for ks in keys for k in ks})
+        since = datetime.utcnow() - timedelta(days=self.window_days)
+
+        events_by_key: Dict[str, List[int]] = {}
+        for i in range(0, len(wanted), LOOKUP_CHUNK):
+            rows = db.query(StoryBand.band_key, StoryBand.event_id) \
+                .join(StorySignature, StorySignature.event_id == StoryBand.event_id) \
+                .filter(StoryBand.band_key.in_(wanted[i:i + LOOKUP_CHUNK]),
+                        StorySignature.created_at >= since) \
+                .all()
+            for key, event_id in rows:
+                events_by_key.setdefault(key, []).append(event_id)
+
+        candidates = list({e for ids in events_by_key.values() for e in ids})
+        stored: Dict[int, List[int]] = {}
+        for i in range(0, len(candidates), LOOKUP_CHUNK):
+            for event_id, signature in db.query(StorySignature.event_id, StorySignature.signature) \
+                    .filter(StorySignature.event_id.in_(candidates[i:i + LOOKUP_CHUNK])):
+                stored[event_id] = signature
+
+        matches = []
+        for signature, ks in zip(signatures, keys):
+            best, best_score = None, self.threshold
+            for event_id in {e for k in ks for e in events_by_key.get(k, ())}:
+                score = similarity(signature, stored[event_id])
+                if score >= best_score:
+                    best, best_score = event_id, score
+            matches.append(best)
+        return matches
+
+    def add(self, db: Session, event_id: int, signature: Sequence[int]):
+        """Index the story behind a new event (caller commits)"""
+        db.add(StorySignature(event_id=event_id, signature=list(signature)))
+        db.add_all(StoryBand(band_key=key, event_id=event_id) for key in band_keys(signature))
+
+
+story_index = StoryIndex()
+
+
+def ingest_stories(db: Session, items: Sequence[Dict],
+                   build_events: Callable[[List[Dict]], List[Optional[Dict]]],
+                   index: StoryIndex = story_index) -> Dict:
+    """
+    Turn news items into events, one per real-world story
+
+    Near-duplicates within the batch are merged first; stories matching a
+    recent stored story only add their URLs to that event's source_urls.
+    build_events (NLP, geocoding, ...) runs on the remaining new stories
+    only and returns Event column values per story, or None to drop one.
+    New events are clustered into incidents. Commits once at the end.
+    """
+    stories = merge_near_duplicates(items, index.threshold)
+    matches = index.find(db, [s.signature for s in stories])
+
+    merged: Dict[int, int] = {}
+    for story, event_id in zip(stories, matches):
+        if event_id is None:
+            continue
+        event = db.get(Event, event_id)
+        urls = list(event.source_urls or ([event.source_url] if event.source_url else []))
+        added = [u for u in story.source_urls if u not in urls]
+        if added:
+            event.source_urls = urls + added
+        merged[event_id] = merged.get(event_id, 0) + len(added)
+
+    new_stories = [s for s, event_id in zip(stories, matches) if event_id is None]
+    created = []
+    values = build_events([s.item for s in new_stories]) if new_stories else []
+    for story, columns in zip(new_stories, values):
+        if columns is None:
+            continue
+        event = Event(**{
+            **columns,
+            'source_url': story.source_urls[0] if story.source_urls else columns.get('source_url'),
+            'source_urls': story.source_urls or None,
+        })
+        db.add(event)
+        db.flush()
+        index.add(db, event.id, story.signature)
+        created.append(event.id)
+
+    if created:
+        incident_clusterer.assign_ids(db, created)
+    db.commit()
+    logger.info(f"📰 {len(items)} articles: {len(created)} new events, "
+                f"{sum(merged.values())} URLs merged into {len(merged)} existing events")
+    return {
+        'articles': len(items),
+        'stories': len(stories),
+        'created': created,
+        'merged': merged,
+    }
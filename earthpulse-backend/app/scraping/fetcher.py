@@ -0,0 +1,114 @@
+# app/scraping/fetcher.py
+"""
+Concurrent HTTP fetching over one pooled session
+
+All requests share a requests.Session whose adapter keeps up to
+NEWS_FETCH_WORKERS keep-alive connections per host, so a batch of article
+downloads reuses TCP/TLS connections instead of opening one per article.
+Retries with exponential backoff (and Retry-After) are left to urllib3; a
+semaphore per host caps how many requests one site sees at once.
+"""
+import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+NEWS_FETCH_WORKERS = int(os.getenv("NEWS_FETCH_WORKERS", "16"))
+NEWS_PER_HOST = int(os.getenv("NEWS_PER_HOST", "4"))
+
+# (connect, read) seconds per attempt
+NEWS_CONNECT_TIMEOUT = float(os.getenv("NEWS_CONNECT_TIMEOUT", "5"))
+NEWS_READ_TIMEOUT = float(os.getenv("NEWS_READ_TIMEOUT", "15"))
+
+NEWS_FETCH_RETRIES = int(os.getenv("NEWS_FETCH_RETRIES", "3"))
+NEWS_BACKOFF_FACTOR = float(os.getenv("NEWS_BACKOFF_FACTOR", "0.5"))  # 0.5s, 1s, 2s, ...
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class PooledFetcher:
+    def __init__(self, workers: int = NEWS_FETCH_WORKERS, per_host: int = NEWS_PER_HOST,
+                 timeout: Tuple[float, float] = (NEWS_CONNECT_TIMEOUT, NEWS_READ_TIMEOUT),
+                 retries: int = NEWS_FETCH_RETRIES, backoff_factor: float = NEWS_BACKOFF_FACTOR,
+                 headers: Optional[Dict[str, str]] = None):
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers,
+                              max_retries=retry, pool_block=True)
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._hosts: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_host)
+        )
+        self._hosts_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        with self._hosts_lock:
+            return self._hosts[urlsplit(url).netloc]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET with retries; raises for connection errors and for error statuses left after retrying"""
+        with self._host_slot(url):
+            response = self.session.get(url, timeout=kwargs.pop("timeout", self.timeout), **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fetch")
+            return self._pool
+
+    def _fetch_text(self, url: str) -> Union[str, Exception]:
+        try:
+            return self.get(url).text
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return e
+
+    def fetch_completed(self, urls: Sequence[str]) -> Iterator[Tuple[int, Union[str, Exception]]]:
+        """(index, body) for many URLs fetched concurrently, as each finishes; failures come back as the exception"""
+        futures = {self._executor().submit(self._fetch_text, url): i for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def fetch_all(self, urls: Sequence[str]) -> List[Union[str, Exception]]:
+        """fetch_completed, in input order"""
+        bodies: List[Union[str, Exception]] = [None] * len(urls)
+        for i, body in self.fetch_completed(urls):
+            bodies[i] = body
+        return bodies
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+        self.session.close()
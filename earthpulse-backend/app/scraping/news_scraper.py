@@ -1,107 +1,346 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
 import requests
 from bs4 import BeautifulSoup
-from newspaper import Article
-from datetime import datetime
-import logging
+from sqlalchemy.orm import Session
+
+from app.database.connection import SessionLocal
+from app.models.news import NewsFeed
+from app.scraping.dedup import ingest_stories, merge_near_duplicates
+from app.scraping.fetcher import PooledFetcher
+from app.scraping.seen_urls import SeenUrlIndex
+
+try:
+    from newspaper import Article
+    NEWSPAPER_AVAILABLE = True
+except ImportError:
+    Article = None
+    NEWSPAPER_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Processes parsing downloaded HTML; 0 parses in the calling thread
+NEWS_PARSE_WORKERS = int(os.getenv("NEWS_PARSE_WORKERS", str(os.cpu_count() or 2)))
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search"
+BBC_SEARCH = "https://www.bbc.com/search"
+
+
+def parse_article(url: str, html: str) -> Dict:
+    """
+    Title, body text and publish date of an already downloaded article
+
+    newspaper3k when installed, else a plain BeautifulSoup read of the
+    og:title / <title>, the <p> text and article:published_time.
+    Module-level so it can run in the parse worker processes.
+    """
+    if NEWSPAPER_AVAILABLE:
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        return {'title': article.title, 'text': article.text, 'publish_date': article.publish_date}
+
+    soup = BeautifulSoup(html, 'html.parser')
+    og_title = soup.find('meta', property='og:title')
+    if og_title and og_title.get('content'):
+        title = og_title['content']
+    else:
+        title = soup.title.get_text(strip=True) if soup.title else ''
+    text = '\n\n'.join(p.get_text(' ', strip=True) for p in soup.find_all('p'))
+    publish_date = None
+    published = soup.find('meta', property='article:published_time')
+    if published and published.get('content'):
+        try:
+            publish_date = datetime.fromisoformat(published['content'].replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return {'title': title, 'text': text, 'publish_date': publish_date}
+
+
+def event_columns(article: Dict) -> Dict:
+    """Event column values for an article run through EventExtractor.process_articles"""
+    location = article.get('primary_location') or {}
+    published_at = article.get('published_at')
+    if isinstance(published_at, datetime) and published_at.tzinfo is not None:
+        published_at = published_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return {
+        'title': article['title'],
+        'description': article.get('description'),
+        'event_type': article.get('event_type'),
+        'severity': 'medium',
+        'location_name': location.get('name'),
+        'latitude': location.get('latitude'),
+        'longitude': location.get('longitude'),
+        'source_url': article.get('url'),
+        'source_type': 'news',
+        'published_at': published_at,
+        'confidence_score': article.get('event_confidence'),
+        'is_verified': False,
+    }
+
+
 class NewsEventScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    """
+    Google News / BBC scraping
+
+    Article pages are downloaded concurrently through one PooledFetcher
+    (keep-alive pool, per-host limit, timeouts, retry with backoff) and each
+    page is handed to the parse pool as soon as it arrives, so parsing
+    overlaps with the downloads still in flight.
+
+    Polling is incremental by default: feeds are requested with the
+    ETag / Last-Modified of the previous response (a 304 ends the cycle),
+    and article URLs already scraped (SeenUrlIndex) are dropped before
+    anything is downloaded, so only new articles reach parsing and NLP.
+    """
+
+    def __init__(self, fetcher: Optional[PooledFetcher] = None, parse_workers: int = NEWS_PARSE_WORKERS,
+                 seen: Optional[SeenUrlIndex] = None, session_factory=SessionLocal):
+        self.fetcher = fetcher or PooledFetcher()
+        self.headers = self.fetcher.session.headers
+        self.parse_workers = parse_workers
+        self.session_factory = session_factory
+        self.seen = seen or SeenUrlIndex(session_factory)
+        self._parse_pool: Optional[Executor] = None
+        self._parse_pool_lock = threading.Lock()
         self.environmental_keywords = [
             'wildfire', 'forest fire', 'bushfire',
             'flood', 'flooding', 'inundation',
             'deforestation', 'illegal logging', 'forest clearance',
             'drought', 'heatwave', 'cyclone', 'hurricane'
         ]
-    
-    def scrape_google_news(self, query="wildfire OR flood OR deforestation", max_results=20):
-        """Scrape Google News for environmental events"""
+
+    def _parser(self) -> Optional[Executor]:
+        if self.parse_workers <= 0:
+            return None
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # spawn: the fetcher's threads make forking this process unsafe
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._parse_pool
+
+    def fetch_articles(self, urls: Sequence[str]) -> List[Optional[Dict]]:
+        """
+        Download and parse many article URLs, in input order
+
+        Each entry is {'url', 'html', 'title', 'text', 'publish_date'}, or
+        None when the download or the parse failed.
+        """
+        urls = list(urls)
+        parser = self._parser()
+        htmls: Dict[int, str] = {}
+        pending = {}
+        parsed: Dict[int, Dict] = {}
+
+        for i, body in self.fetcher.fetch_completed(urls):
+            if isinstance(body, Exception):
+                continue
+            htmls[i] = body
+            if parser is not None:
+                pending[i] = parser.submit(parse_article, urls[i], body)
+            else:
+                try:
+                    parsed[i] = parse_article(urls[i], body)
+                except Exception as e:
+                    logger.error(f"Error parsing {urls[i]}: {e}")
+
+        for i, future in pending.items():
+            try:
+                parsed[i] = future.result()
+            except Exception as e:
+                logger.error(f"Error parsing {urls[i]}: {e}")
+
+        return [
+            {'url': url, 'html': htmls[i], **parsed[i]} if i in parsed else None
+            for i, url in enumerate(urls)
+        ]
+
+    def get_if_changed(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+        """
+        Conditional GET with the validators stored for this URL
+
+        Returns None on 304 Not Modified. New validators are not stored here
+        but by remember_response(), once the caller has handled every item in
+        the body, so items cut off by a limit or whose download failed are
+        fetched on the next poll instead of hiding behind a 304.
+        """
+        url = requests.Request('GET', url, params=params).prepare().url
+        db = self.session_factory()
+        try:
+            feed = db.get(NewsFeed, url)
+            headers = {}
+            if feed is not None and feed.etag:
+                headers['If-None-Match'] = feed.etag
+            if feed is not None and feed.last_modified:
+                headers['If-Modified-Since'] = feed.last_modified
+
+            response = self.fetcher.get(url, headers=headers)
+            if response.status_code == 304:
+                if feed is not None:
+                    feed.last_status, feed.polled_at = 304, datetime.utcnow()
+                    db.commit()
+                logger.info(f"Not modified since last poll: {url}")
+                return None
+            return response
+        finally:
+            db.close()
+
+    def remember_response(self, response: requests.Response):
+        """Store a 200 response's ETag / Last-Modified for the next get_if_changed"""
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.merge(NewsFeed(
+                url=response.url if not response.history else response.history[0].url,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                last_status=response.status_code,
+                polled_at=now,
+                changed_at=now,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _new_only(self, urls: List[str]) -> List[str]:
+        new = self.seen.filter_new(urls)
+        if len(new) < len(urls):
+            logger.info(f"Skipping {len(urls) - len(new)} already scraped articles")
+        return new
+
+    def scrape_google_news(self, query="wildfire OR flood OR deforestation", max_results=20, incremental=True):
+        """Scrape Google News for environmental events (only unseen articles when incremental)"""
         try:
-            url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-            response = requests.get(url, headers=self.headers)
+            params = {'q': query, 'hl': 'en-US', 'gl': 'US', 'ceid': 'US:en'}
+            if incremental:
+                response = self.get_if_changed(GOOGLE_NEWS_RSS, params)
+                if response is None:
+                    return []
+            else:
+                response = self.fetcher.get(GOOGLE_NEWS_RSS, params=params)
             soup = BeautifulSoup(response.content, 'xml')
-            
-            items = soup.find_all('item')[:max_results]
+
+            items = {}
+            for item in soup.find_all('item'):
+                if item.link and item.link.text:
+                    items.setdefault(item.link.text, item)
+            urls = self._new_only(list(items)) if incremental else list(items)
+
+            # Syndicated copies of one story: download the first, keep every URL.
+            # Feed titles end in " - Publisher", which differs between copies
+            stories = merge_near_duplicates([
+                {'title': items[u].title.text.rsplit(' - ', 1)[0] if items[u].title else '', 'url': u}
+                for u in urls
+            ])
+            complete = len(stories) <= max_results
+            stories = stories[:max_results]
+            copies = {s.source_urls[0]: s.source_urls for s in stories}
+            urls = list(copies)
+            articles = self.fetch_articles(urls)
             events = []
-            
-            for item in items:
-                try:
-                    article_url = item.link.text if item.link else None
-                    if not article_url:
-                        continue
-                    
-                    # Use newspaper3k to extract full article
-                    article = Article(article_url)
-                    article.download()
-                    article.parse()
-                    
-                    event = {
-                        'title': article.title,
-                        'description': article.text[:500] if article.text else item.description.text,
-                        'url': article_url,
-                        'published_at': article.publish_date or datetime.utcnow(),
-                        'source': 'google_news',
-                        'raw_html': article.html
-                    }
-                    events.append(event)
-                    logger.info(f"Scraped: {event['title']}")
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping article: {e}")
+
+            for url, article in zip(urls, articles):
+                if article is None:
+                    complete = False
                     continue
-            
+                item = items[url]
+                event = {
+                    'title': article['title'],
+                    'description': article['text'][:500] if article['text'] else item.description.text,
+                    'url': article['url'],
+                    'published_at': article['publish_date'] or datetime.utcnow(),
+                    'source': 'google_news',
+                    'source_urls': copies[url],
+                    'raw_html': article['html']
+                }
+                events.append(event)
+                logger.info(f"Scraped: {event['title']}")
+
+            if incremental:
+                self.seen.add(u for event in events for u in event['source_urls'])
+                if complete:
+                    self.remember_response(response)
             return events
-            
+
         except Exception as e:
             logger.error(f"Error scraping Google News: {e}")
             return []
-    
-    def scrape_bbc_news(self, keyword="climate"):
-        """Scrape BBC News"""
+
+    def scrape_bbc_news(self, keyword="climate", incremental=True):
+        """Scrape BBC News (only unseen articles when incremental)"""
         try:
-            url = f"https://www.bbc.com/search?q={keyword}"
-            response = requests.get(url, headers=self.headers)
+            if incremental:
+                response = self.get_if_changed(BBC_SEARCH, {'q': keyword})
+                if response is None:
+                    return []
+            else:
+                response = self.fetcher.get(BBC_SEARCH, params={'q': keyword})
             soup = BeautifulSoup(response.content, 'html.parser')
-            
-            articles = soup.find_all('div', {'class': 'ssrcss-1f3bvyz-Stack'})
+
+            results = soup.find_all('div', {'class': 'ssrcss-1f3bvyz-Stack'})
+            complete = len(results) <= 10
+            urls = []
+            for article in results[:10]:
+                title_elem = article.find('h2')
+                link_elem = article.find('a')
+                if title_elem and link_elem and link_elem.get('href'):
+                    urls.append('https://www.bbc.com' + link_elem['href'])
+            if incremental:
+                urls = self._new_only(urls)
+
             events = []
-            
-            for article in articles[:10]:
-                try:
-                    title_elem = article.find('h2')
-                    link_elem = article.find('a')
-                    
-                    if title_elem and link_elem:
-                        article_url = 'https://www.bbc.com' + link_elem['href']
-                        
-                        # Download full article
-                        art = Article(article_url)
-                        art.download()
-                        art.parse()
-                        
-                        event = {
-                            'title': art.title,
-                            'description': art.text[:500],
-                            'url': article_url,
-                            'published_at': art.publish_date or datetime.utcnow(),
-                            'source': 'bbc_news'
-                        }
-                        events.append(event)
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing BBC article: {e}")
+            for art in self.fetch_articles(urls):
+                if art is None:
+                    complete = False
                     continue
-            
+                events.append({
+                    'title': art['title'],
+                    'description': art['text'][:500],
+                    'url': art['url'],
+                    'published_at': art['publish_date'] or datetime.utcnow(),
+                    'source': 'bbc_news'
+                })
+
+            if incremental:
+                self.seen.add(event['url'] for event in events)
+                if complete:
+                    self.remember_response(response)
             return events
-            
+
         except Exception as e:
             logger.error(f"Error scraping BBC: {e}")
             return []
 
-# Usage
+    def ingest(self, db: Session, events: Sequence[Dict], extractor=None) -> Dict:
+        """
+        Store scraped articles as events, one per real-world story
+
+        Near-duplicates (in this batch or among recent events) are merged
+        into one event's source_urls by ingest_stories before NLP, so
+        extraction and later verification run once per story.
+        """
+        if extractor is None:
+            from app.nlp.event_extractor import extractor
+
+        def build_events(stories):
+            return [event_columns(a) for a in extractor.process_articles(stories)]
+
+        return ingest_stories(db, events, build_events)
+
+    def close(self):
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False)
+                self._parse_pool = None
+        self.fetcher.close()
+
+# Usage: scraper.scrape_google_news()
 scraper = NewsEventScraper()
-events = scraper.scrape_google_news()
\ No newline at end of file
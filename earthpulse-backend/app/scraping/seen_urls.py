@@ -0,0 +1,176 @@
+# app/scraping/seen_urls.py
+"""
+Which article URLs have already been scraped
+
+A Bloom filter answers "never seen" for almost every new URL without a
+database round trip; its "maybe seen" answers are confirmed against the
+seen_urls table, so a false positive costs one lookup and never drops a
+new article. The filter's bits live in bloom_filters and are OR-merged on
+every save, so processes sharing the database converge on one filter and
+a restart does not rebuild it.
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.database.connection import SessionLocal
+from app.models.news import BloomFilterState, SeenUrl
+
+logger = logging.getLogger(__name__)
+
+# Sized for this many URLs at this false-positive rate (about 1.2 MB of bits);
+# past capacity the rate climbs, which only costs more confirming lookups
+NEWS_SEEN_CAPACITY = int(os.getenv("NEWS_SEEN_CAPACITY", "1000000"))
+NEWS_SEEN_ERROR_RATE = float(os.getenv("NEWS_SEEN_ERROR_RATE", "0.01"))
+
+# Query parameters that say how a link was shared, not which article it is
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ocid", "cmpid")
+
+LOOKUP_CHUNK = 500
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme and host, no fragment, trailing slash or tracking parameters"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Bit array with k positions per key, derived from the key's sha1 by double hashing"""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytes] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, key: str) -> List[int]:
+        # key is a sha1 hex digest: two independent 64-bit halves
+        h1, h2 = int(key[:16], 16), int(key[16:32], 16) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def merge(self, bits: bytes):
+        """OR in the bits of a filter with the same shape"""
+        merged = int.from_bytes(self.bits, "little") | int.from_bytes(bits, "little")
+        self.bits = bytearray(merged.to_bytes(len(self.bits), "little"))
+
+
+class SeenUrlIndex:
+    def __init__(self, session_factory=SessionLocal, name: str = "news_articles",
+                 capacity: int = NEWS_SEEN_CAPACITY, error_rate: float = NEWS_SEEN_ERROR_RATE):
+        self.session_factory = session_factory
+        self.name = name
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        self._counters = {"checked": 0, "bloom_negatives": 0, "confirmed_seen": 0, "false_positives": 0, "added": 0}
+
+    def _load(self, db) -> BloomFilter:
+        """The stored filter, or one rebuilt from seen_urls (first run, or shape changed)"""
+        state = db.get(BloomFilterState, self.name)
+        expected = BloomFilter.for_capacity(self.capacity, self.error_rate)
+        if state is not None and (state.num_bits, state.num_hashes) == (expected.num_bits, expected.num_hashes):
+            return BloomFilter(state.num_bits, state.num_hashes, state.bits)
+
+        rows = 0
+        for (h,) in db.query(SeenUrl.url_hash).yield_per(10000):
+            expected.add(h)
+            rows += 1
+        logger.info(f"🌸 Built Bloom filter {self.name} from {rows} seen URLs")
+        if state is None:
+            db.add(BloomFilterState(name=self.name, num_bits=expected.num_bits, num_hashes=expected.num_hashes,
+                                    items=rows, bits=bytes(expected.bits)))
+        else:
+            state.num_bits, state.num_hashes, state.items = expected.num_bits, expected.num_hashes, rows
+            state.bits = bytes(expected.bits)
+        db.commit()
+        return expected
+
+    def _filter(self, db) -> BloomFilter:
+        if self._bloom is None:
+            self._bloom = self._load(db)
+        return self._bloom
+
+    def filter_new(self, urls: Sequence[str]) -> List[str]:
+        """The URLs not scraped before, in input order, each once"""
+        by_hash: Dict[str, str] = {}
+        for url in urls:
+            by_hash.setdefault(url_hash(url), url)
+
+        db = self.session_factory()
+        try:
+            with self._lock:
+                bloom = self._filter(db)
+                maybe = [h for h in by_hash if h in bloom]
+            seen = set()
+            for i in range(0, len(maybe), LOOKUP_CHUNK):
+                chunk = maybe[i:i + LOOKUP_CHUNK]
+                seen.update(h for (h,) in db.query(SeenUrl.url_hash).filter(SeenUrl.url_hash.in_(chunk)))
+        finally:
+            db.close()
+
+        with self._lock:
+            self._counters["checked"] += len(by_hash)
+            self._counters["bloom_negatives"] += len(by_hash) - len(maybe)
+            self._counters["confirmed_seen"] += len(seen)
+            self._counters["false_positives"] += len(maybe) - len(seen)
+        return [url for h, url in by_hash.items() if h not in seen]
+
+    def add(self, urls: Iterable[str]):
+        """Record URLs as scraped: rows in seen_urls and bits in the stored filter, one transaction"""
+        hashes = list(dict.fromkeys(url_hash(url) for url in urls))
+        if not hashes:
+            return
+
+        db = self.session_factory()
+        try:
+            with self._lock:
+                bloom = self._filter(db)
+                existing = set()
+                for i in range(0, len(hashes), LOOKUP_CHUNK):
+                    chunk = hashes[i:i + LOOKUP_CHUNK]
+                    existing.update(h for (h,) in db.query(SeenUrl.url_hash).filter(SeenUrl.url_hash.in_(chunk)))
+                fresh = [h for h in hashes if h not in existing]
+                db.add_all(SeenUrl(url_hash=h) for h in fresh)
+
+                for h in hashes:
+                    bloom.add(h)
+                state = db.get(BloomFilterState, self.name)
+                if (state.num_bits, state.num_hashes) == (bloom.num_bits, bloom.num_hashes):
+                    bloom.merge(state.bits)  # pick up what other processes added
+                state.bits = bytes(bloom.bits)
+                state.items = (state.items or 0) + len(fresh)
+                db.commit()
+                self._counters["added"] += len(fresh)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "loaded": self._bloom is not None}
@@ -0,0 +1,365 @@
+# app/services/analysis_cache.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.services.singleflight import SingleFlight
+from app.utils import geohash
+
+logger = logging.getLogger(__name__)
+
+# Where the on-disk tier lives; set EE_CACHE_PATH="" to keep the cache in memory only
+EE_CACHE_PATH = os.getenv("EE_CACHE_PATH", "./ee_cache.db")
+
+# Geohash precision used to snap request locations (6 ~= 1.2km x 0.6km cells)
+CELL_PRECISION = 6
+
+# How long a result stays fresh, per analysis type (seconds)
+DEFAULT_TTLS = {
+    "ndvi": 24 * 3600,
+    "water": 6 * 3600,
+    "wildfire": 3600,      # active fires change within hours
+}
+
+# Service method -> (analysis type, default window in days, default radius in km).
+# Must mirror the defaults of EarthEngineService so cached and uncached calls agree.
+ANALYSES = {
+    "get_ndvi": ("ndvi", 30, 10),
+    "detect_wildfires": ("wildfire", 7, 50),
+    "detect_water_changes": ("water", 30, 20),
+}
+
+
+def cache_key(analysis: str, latitude: float, longitude: float, radius_km: float,
+              start_date: str, end_date: str) -> str:
+    """Key shared by every request that falls in the same cell with the same parameters"""
+    cell = geohash.encode(latitude, longitude, CELL_PRECISION)
+    return f"{analysis}|{cell}|{round(float(radius_km), 1)}|{start_date}|{end_date}"
+
+
+class AnalysisCache:
+    """
+    Two-tier TTL cache for satellite analysis results
+
+    An in-process LRU answers repeat lookups without leaving Python; a SQLite
+    file behind it survives restarts and is shared by every worker on the
+    host. Entries are JSON payloads with an absolute expiry time.
+    """
+
+    def __init__(self, path: Optional[str] = EE_CACHE_PATH, max_entries: int = 4096,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                    " key TEXT PRIMARY KEY, analysis TEXT, expires_at REAL, value TEXT)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Analysis cache disk tier disabled ({path}): {e}")
+                self._db = None
+
+    def _count(self, name: str):
+        self._counters[name] += 1
+
+    def get(self, key: str, record: bool = True) -> Optional[Dict]:
+        """Look up a fresh entry; `record=False` leaves the hit/miss counters alone"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    if record:
+                        self._count("memory_hits")
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, value FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    if record:
+                        self._count("disk_hits")
+                    return value
+
+            if record:
+                self._count("misses")
+            return None
+
+    def set(self, key: str, value: Dict):
+        analysis = key.split("|", 1)[0]
+        expires_at = time.time() + self.ttls.get(analysis, 3600)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._count("stores")
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, analysis, expires_at, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, analysis, expires_at, json.dumps(value))
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: Dict):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop expired rows from the disk tier; returns how many were removed"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "disk_enabled": self._db is not None,
+        }
+
+
+class CachedEarthEngineService:
+    """
+    Wraps an Earth Engine service (real, mock, ...) with an AnalysisCache
+
+    Date windows are resolved to concrete days before building the key, so the
+    default "last N days" window is shared by every call made on the same day.
+    Cache misses go through a SingleFlight on the same key, so concurrent
+    requests for one cell (e.g. many reports around one fire) share a single
+    remote computation. Results carrying an "error" are never cached. The
+    batch and series variants cache per point and per window under the same
+    keys. Anything else is passed straight through to the wrapped service.
+    """
+
+    def __init__(self, service, cache: Optional[AnalysisCache] = None,
+                 flight: Optional[SingleFlight] = None):
+        self._service = service
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.flight = flight if flight is not None else SingleFlight()
+
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+
+    @staticmethod
+    def _resolve_window(days: int, start_date: Optional[str], end_date: Optional[str]):
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return start_date, end_date
+
+    @staticmethod
+    def _for_location(result: Dict, latitude: float, longitude: float) -> Dict:
+        """A cached result may come from a nearby point in the same cell: report the caller's point"""
+        location = {**result.get("location", {}), "latitude": latitude, "longitude": longitude}
+        return {**result, "location": location}
+
+    def _call(self, method: str, latitude: float, longitude: float,
+              start_date: Optional[str], end_date: Optional[str],
+              radius_km: Optional[float]) -> Dict:
+        analysis, days, default_radius = ANALYSES[method]
+        if radius_km is None:
+            radius_km = default_radius
+        start_date, end_date = self._resolve_window(days, start_date, end_date)
+        key = cache_key(analysis, latitude, longitude, radius_km, start_date, end_date)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._for_location(cached, latitude, longitude)
+
+        def compute():
+            # A flight for this key may have landed between our miss and now
+            landed = self.cache.get(key, record=False)
+            if landed is not None:
+                return landed
+            result = getattr(self._service, method)(
+                latitude, longitude, start_date=start_date, end_date=end_date, radius_km=radius_km
+            )
+            if result and "error" not in result:
+                self.cache.set(key, result)
+            return result
+
+        result = self.flight.do(key, compute)
+        if result and "error" not in result:
+            return self._for_location(result, latitude, longitude)
+        return result
+
+    def get_ndvi(self, latitude: float, longitude: float,
+                 start_date: str = None, end_date: str = None,
+                 radius_km: float = None) -> Dict:
+        return self._call("get_ndvi", latitude, longitude, start_date, end_date, radius_km)
+
+    def detect_wildfires(self, latitude: float, longitude: float,
+                         start_date: str = None, end_date: str = None,
+                         radius_km: float = None) -> Dict:
+        return self._call("detect_wildfires", latitude, longitude, start_date, end_date, radius_km)
+
+    def detect_water_changes(self, latitude: float, longitude: float,
+                             start_date: str = None, end_date: str = None,
+                             radius_km: float = None) -> Dict:
+        return self._call("detect_water_changes", latitude, longitude, start_date, end_date, radius_km)
+
+    def _call_batch(self, method: str, points: List[Tuple[float, float]],
+                    start_date: Optional[str], end_date: Optional[str],
+                    radius_km: Optional[float]) -> List[Dict]:
+        """
+        Batch variant of _call: only points whose cell is not cached go to the
+        wrapped service, once per distinct cell, through its `<method>_batch`
+        when it has one.
+        """
+        analysis, days, default_radius = ANALYSES[method]
+        if radius_km is None:
+            radius_km = default_radius
+        start_date, end_date = self._resolve_window(days, start_date, end_date)
+        keys = [cache_key(analysis, lat, lon, radius_km, start_date, end_date) for lat, lon in points]
+
+        results: List[Optional[Dict]] = [None] * len(points)
+        missing: Dict[str, Tuple[float, float]] = {}
+        for i, (key, (lat, lon)) in enumerate(zip(keys, points)):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = self._for_location(cached, lat, lon)
+            elif key not in missing:
+                missing[key] = (lat, lon)
+
+        if not missing:
+            return results
+
+        batch = getattr(self._service, f"{method}_batch", None)
+        if batch is not None:
+            fresh = batch(list(missing.values()), start_date=start_date, end_date=end_date,
+                          radius_km=radius_km)
+        else:
+            single = getattr(self._service, method)
+            fresh = [single(lat, lon, start_date=start_date, end_date=end_date, radius_km=radius_km)
+                     for lat, lon in missing.values()]
+
+        computed = dict(zip(missing, fresh))
+        for key, result in computed.items():
+            if result and "error" not in result:
+                self.cache.set(key, result)
+
+        for i, (key, (lat, lon)) in enumerate(zip(keys, points)):
+            if results[i] is None:
+                result = computed[key]
+                ok = result and "error" not in result
+                results[i] = self._for_location(result, lat, lon) if ok else result
+        return results
+
+    def get_ndvi_batch(self, points: List[Tuple[float, float]],
+                       start_date: str = None, end_date: str = None,
+                       radius_km: float = None) -> List[Dict]:
+        return self._call_batch("get_ndvi", points, start_date, end_date, radius_km)
+
+    def detect_wildfires_batch(self, points: List[Tuple[float, float]],
+                               start_date: str = None, end_date: str = None,
+                               radius_km: float = None) -> List[Dict]:
+        return self._call_batch("detect_wildfires", points, start_date, end_date, radius_km)
+
+    def detect_water_changes_batch(self, points: List[Tuple[float, float]],
+                                   start_date: str = None, end_date: str = None,
+                                   radius_km: float = None) -> List[Dict]:
+        return self._call_batch("detect_water_changes", points, start_date, end_date, radius_km)
+
+    def _call_series(self, method: str, latitude: float, longitude: float,
+                     windows: List[Tuple[str, str]], radius_km: Optional[float]) -> List[Dict]:
+        """
+        Series variant of _call: each (start_date, end_date) window is cached
+        under the key a plain call for that window uses, and only the missing
+        windows go to the wrapped service, in one `<method>_series` call when
+        it has one. Identical concurrent requests share it through the flight.
+        """
+        analysis, _, default_radius = ANALYSES[method]
+        if radius_km is None:
+            radius_km = default_radius
+        keys = [cache_key(analysis, latitude, longitude, radius_km, start, end) for start, end in windows]
+
+        results: List[Optional[Dict]] = [None] * len(windows)
+        missing: Dict[str, Tuple[str, str]] = {}
+        for i, (key, window) in enumerate(zip(keys, windows)):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = self._for_location(cached, latitude, longitude)
+            elif key not in missing:
+                missing[key] = window
+
+        if not missing:
+            return results
+
+        def compute():
+            landed = {key: self.cache.get(key, record=False) for key in missing}
+            todo = [key for key, value in landed.items() if value is None]
+            if todo:
+                series = getattr(self._service, f"{method}_series", None)
+                if series is not None:
+                    fresh = series(latitude, longitude, [missing[k] for k in todo], radius_km=radius_km)
+                else:
+                    single = getattr(self._service, method)
+                    fresh = [single(latitude, longitude, start_date=start, end_date=end, radius_km=radius_km)
+                             for start, end in (missing[k] for k in todo)]
+                for key, result in zip(todo, fresh):
+                    if result and "error" not in result:
+                        self.cache.set(key, result)
+                    landed[key] = result
+            return landed
+
+        computed = self.flight.do(f"{method}_series|" + ",".join(missing), compute)
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                result = computed[key]
+                ok = result and "error" not in result
+                results[i] = self._for_location(result, latitude, longitude) if ok else result
+        return results
+
+    def get_ndvi_series(self, latitude: float, longitude: float,
+                        windows: List[Tuple[str, str]], radius_km: float = None) -> List[Dict]:
+        return self._call_series("get_ndvi", latitude, longitude, windows, radius_km)
+
+    def detect_water_changes_series(self, latitude: float, longitude: float,
+                                    windows: List[Tuple[str, str]], radius_km: float = None) -> List[Dict]:
+        return self._call_series("detect_water_changes", latitude, longitude, windows, radius_km)
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
+    def stats(self) -> Dict:
+        """Cache counters plus how many remote calls were saved by coalescing"""
+        return {"cache": self.cache.stats(), "singleflight": self.flight.stats()}
@@ -0,0 +1,151 @@
+# app/services/async_earth_engine.py
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Threads available for blocking Earth Engine calls
+EE_MAX_WORKERS = int(os.getenv("EE_MAX_WORKERS", "8"))
+
+# Calls allowed in flight (running or queued on the executor) at once
+EE_MAX_CONCURRENCY = int(os.getenv("EE_MAX_CONCURRENCY", "16"))
+
+# Seconds a single call may take before the caller gets a timeout
+EE_CALL_TIMEOUT = float(os.getenv("EE_CALL_TIMEOUT", "60"))
+
+
+class SatelliteBusyError(Exception):
+    """Raised when no concurrency slot frees up before the call's deadline"""
+
+
+class AsyncEarthEngineService:
+    """
+    asyncio facade over the blocking Earth Engine service
+
+    Each call runs on a dedicated, bounded thread pool instead of the event
+    loop, so a slow getInfo() never stalls unrelated requests (/health, events,
+    stats). A semaphore caps calls in flight; waiting for a slot counts towards
+    the per-call timeout. On timeout or cancellation the awaiting request gives
+    up immediately. A call still queued on the executor is dropped; one already
+    running cannot be interrupted and finishes in the background (its result
+    still lands in the analysis cache). Its slot is only released when the
+    work itself ends, so timed-out calls keep counting against the cap.
+    """
+
+    def __init__(self, service, max_workers: int = EE_MAX_WORKERS,
+                 max_concurrency: int = EE_MAX_CONCURRENCY,
+                 timeout: float = EE_CALL_TIMEOUT):
+        self._service = service
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "completed": 0, "failed": 0, "timeouts": 0,
+                          "cancelled": 0, "rejected": 0, "in_flight": 0}
+
+    @property
+    def service(self):
+        return self._service
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="earth-engine"
+                )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running loop, not the import-time one
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self._counters[name] += delta
+
+    async def call(self, method: str, *args, timeout: Optional[float] = None, **kwargs):
+        """Run `service.<method>(*args, **kwargs)` off the event loop"""
+        return await self.run(getattr(self._service, method), *args, timeout=timeout, **kwargs)
+
+    async def run(self, func, *args, timeout: Optional[float] = None, **kwargs):
+        """Run any blocking callable that talks to the service under the same pool, cap and timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        method = getattr(func, "__name__", "call")
+        fn = functools.partial(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        semaphore = self._get_semaphore()
+        self._count("calls")
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._count("rejected")
+            raise SatelliteBusyError(f"No satellite worker available within {timeout:.0f}s")
+
+        try:
+            work = self._get_executor().submit(fn)
+        except RuntimeError:
+            # Executor shut down
+            semaphore.release()
+            raise
+        self._count("in_flight")
+
+        def release(_):
+            self._count("in_flight", -1)
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # loop already closed
+
+        work.add_done_callback(release)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(work), max(deadline - loop.time(), 0))
+            self._count("completed")
+            return result
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            logger.warning(f"⏱️ Earth Engine {method} timed out after {timeout:.0f}s")
+            raise
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+
+    async def get_ndvi(self, latitude: float, longitude: float, **kwargs) -> Dict:
+        return await self.call("get_ndvi", latitude, longitude, **kwargs)
+
+    async def detect_wildfires(self, latitude: float, longitude: float, **kwargs) -> Dict:
+        return await self.call("detect_wildfires", latitude, longitude, **kwargs)
+
+    async def detect_water_changes(self, latitude: float, longitude: float, **kwargs) -> Dict:
+        return await self.call("detect_water_changes", latitude, longitude, **kwargs)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._semaphore = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
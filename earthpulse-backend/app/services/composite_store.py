@@ -0,0 +1,323 @@
+# app/services/composite_store.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.analysis.flood_detector import WATER_THRESHOLD, interpret_ndwi
+from app.analysis.ndvi_calculator import interpret_ndvi
+from app.database.connection import SessionLocal
+from app.models.event import SatelliteData
+from app.utils import geohash
+
+logger = logging.getLogger(__name__)
+
+# Sub-period every window is assembled from; periods start on multiples of
+# it counted from PERIOD_EPOCH (a Monday), so weeks run Monday to Sunday
+PERIOD_DAYS = 7
+PERIOD_EPOCH = date(2000, 1, 3)
+
+# A period is only stored once it ended this many days ago; Sentinel-2
+# scenes keep arriving for a few days after acquisition
+COMPOSITE_SETTLE_DAYS = int(os.getenv("COMPOSITE_SETTLE_DAYS", "3"))
+
+# Periods of one location fetched concurrently
+COMPOSITE_FETCH_WORKERS = int(os.getenv("COMPOSITE_FETCH_WORKERS", "4"))
+
+# Same snapping as the analysis cache: one composite per cell
+CELL_PRECISION = 6
+
+# Trailing window of /api/satellite/ndvi and /water (the service default)
+ANALYSIS_WINDOW_DAYS = 30
+
+# index -> (service method, result field, default radius in km)
+INDICES = {
+    "ndvi": ("get_ndvi", "ndvi_mean", 10),
+    "ndwi": ("detect_water_changes", "ndwi_mean", 20),
+}
+
+
+@dataclass(frozen=True)
+class Period:
+    start: date
+    days: int
+
+    @property
+    def end(self) -> date:
+        """Exclusive, like filterDate()"""
+        return self.start + timedelta(days=self.days)
+
+
+@dataclass
+class Composite:
+    """Region mean of one index over one period and the scenes behind it"""
+    period: Period
+    mean: Optional[float]
+    image_count: int
+    stored: bool = False  # read from satellite_data rather than computed now
+
+
+def split_window(start: date, end: date, period_days: int = PERIOD_DAYS) -> List[Period]:
+    """
+    Cover [start, end) with whole aligned periods plus single days at the edges
+
+    A window sliding by one day then shares every whole period and all but
+    one edge day with the day before.
+    """
+    periods = []
+    day = start
+    while day < end:
+        aligned = (day - PERIOD_EPOCH).days % period_days == 0
+        if aligned and day + timedelta(days=period_days) <= end:
+            periods.append(Period(day, period_days))
+            day += timedelta(days=period_days)
+        else:
+            periods.append(Period(day, 1))
+            day += timedelta(days=1)
+    return periods
+
+
+def combine(composites: Iterable[Composite]) -> Tuple[Optional[float], int]:
+    """
+    Mean over a window from its sub-period means, weighted by scene count
+
+    Equals the mean of the per-pixel mean over every scene in the window
+    (what the service computes in one go) when scenes cover the region
+    evenly; partly clouded scenes make it an approximation.
+    """
+    total, images = 0.0, 0
+    for c in composites:
+        if c.mean is None or not c.image_count:
+            continue
+        total += c.mean * c.image_count
+        images += c.image_count
+    return (total / images if images else None), images
+
+
+class CompositeStore:
+    """
+    Per-cell, per-period NDVI/NDWI composites persisted in satellite_data
+
+    Windows are split into periods (split_window); settled periods are read
+    from the table and only the missing ones are computed, through the
+    regular service (so the analysis cache and single-flight still apply).
+    Periods that have not settled yet are not stored here; repeats within
+    the analysis cache TTL are answered by the cache, per period.
+    """
+
+    def __init__(self, service=None, session_factory=SessionLocal,
+                 settle_days: int = COMPOSITE_SETTLE_DAYS,
+                 fetch_workers: int = COMPOSITE_FETCH_WORKERS):
+        if service is None:
+            from app.services.earth_engine import earth_engine_service as service
+        self.service = service
+        self.session_factory = session_factory
+        self.settle_days = settle_days
+        self.fetch_workers = fetch_workers
+
+    def settled(self, period: Period, today: Optional[date] = None) -> bool:
+        today = today or datetime.utcnow().date()
+        return period.end <= today - timedelta(days=self.settle_days)
+
+    @staticmethod
+    def _cell(latitude: float, longitude: float) -> str:
+        return geohash.encode(latitude, longitude, CELL_PRECISION)
+
+    def load(self, db: Session, index: str, cell: str, radius_km: float,
+             periods: Sequence[Period]) -> Dict[Period, Composite]:
+        """Stored composites among `periods` (one range query)"""
+        if not periods:
+            return {}
+        wanted = set(periods)
+        rows = db.query(SatelliteData.collection_date, SatelliteData.period_days, SatelliteData.metrics) \
+            .filter(SatelliteData.analysis_type == index,
+                    SatelliteData.geohash == cell,
+                    SatelliteData.radius_km == float(radius_km),
+                    SatelliteData.period_days.in_({p.days for p in periods}),
+                    SatelliteData.collection_date >= datetime.combine(min(p.start for p in periods), datetime.min.time()),
+                    SatelliteData.collection_date < datetime.combine(max(p.end for p in periods), datetime.min.time())) \
+            .all()
+        found = {}
+        for collection_date, days, metrics in rows:
+            period = Period(collection_date.date(), days)
+            if period in wanted:
+                found[period] = Composite(period, metrics.get("mean"), metrics.get("image_count", 0), True)
+        return found
+
+    def _compute(self, index: str, latitude: float, longitude: float, radius_km: float,
+                 periods: Sequence[Period]) -> List:
+        """
+        Composites for many periods of one location, in order
+
+        Uses the service's <method>_series (one round trip per chunk of
+        periods) when it has one, else one call per period on a small pool.
+        Failed periods come back as the exception.
+        """
+        method, field, _ = INDICES[index]
+        windows = [(p.start.isoformat(), p.end.isoformat()) for p in periods]
+        series = getattr(self.service, f"{method}_series", None)
+        if series is not None:
+            results = series(latitude, longitude, windows, radius_km=radius_km)
+        else:
+            def call(window):
+                return getattr(self.service, method)(
+                    latitude, longitude, start_date=window[0], end_date=window[1], radius_km=radius_km
+                )
+            with ThreadPoolExecutor(max_workers=max(1, min(self.fetch_workers, len(windows)))) as pool:
+                results = list(pool.map(call, windows))
+
+        return [
+            RuntimeError(result["error"]) if "error" in result
+            else Composite(period, result.get(field), result.get("image_count", 0))
+            for period, result in zip(periods, results)
+        ]
+
+    def save(self, db: Session, index: str, latitude: float, longitude: float, radius_km: float,
+             composites: Iterable[Composite], source: str = None):
+        """
+        Store settled composites; unsettled ones are skipped
+
+        Two requests that miss on the same window both compute and save it;
+        ux_satellite_data_composite keeps one row per period and the later
+        insert leaves it alone (ON CONFLICT DO NOTHING, or a lookup of the
+        stored periods on databases without it).
+        """
+        cell = self._cell(latitude, longitude)
+        rows = [
+            dict(
+                region_name=cell,
+                latitude=latitude,
+                longitude=longitude,
+                geohash=cell,
+                radius_km=float(radius_km),
+                satellite_source=source or "sentinel-2",
+                collection_date=datetime.combine(c.period.start, datetime.min.time()),
+                period_days=c.period.days,
+                analysis_type=index,
+                metrics={"mean": c.mean, "image_count": c.image_count},
+                resolution_meters=10,
+            )
+            for c in composites if self.settled(c.period)
+        ]
+        if not rows:
+            return
+
+        dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(db.get_bind().dialect.name)
+        if dialect is not None:
+            statement = dialect.insert(SatelliteData).on_conflict_do_nothing()
+        else:
+            stored = set(db.execute(
+                select(SatelliteData.period_days, SatelliteData.collection_date)
+                .where(SatelliteData.analysis_type == index,
+                       SatelliteData.geohash == cell,
+                       SatelliteData.radius_km == float(radius_km),
+                       tuple_(SatelliteData.period_days, SatelliteData.collection_date)
+                       .in_([(r["period_days"], r["collection_date"]) for r in rows]))
+            ).all())
+            rows = [r for r in rows if (r["period_days"], r["collection_date"]) not in stored]
+            statement = insert(SatelliteData)
+        if rows:
+            db.execute(statement, rows)
+        db.commit()
+
+    def periods(self, index: str, latitude: float, longitude: float, periods: Sequence[Period],
+                radius_km: Optional[float] = None, db: Optional[Session] = None) -> Dict[Period, Composite]:
+        """
+        Composite for each period: stored ones from the table, the rest computed
+
+        Missing periods are computed together (see _compute) and the settled
+        ones among them stored. If any failed, the rest are still stored and
+        the first error is raised.
+        """
+        if index not in INDICES:
+            raise ValueError(f"index must be one of {sorted(INDICES)}")
+        if radius_km is None:
+            radius_km = INDICES[index][2]
+
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            cell = self._cell(latitude, longitude)
+            stored = self.load(db, index, cell, radius_km, [p for p in periods if self.settled(p)])
+            missing = [p for p in periods if p not in stored]
+
+            computed: List[Composite] = []
+            if missing:
+                results = self._compute(index, latitude, longitude, radius_km, missing)
+                computed = [r for r in results if isinstance(r, Composite)]
+                self.save(db, index, latitude, longitude, radius_km, computed)
+                logger.info(f"🧩 {index} composites for {cell}: {len(stored)} stored, {len(missing)} computed")
+                errors = [r for r in results if isinstance(r, Exception)]
+                if errors:
+                    raise errors[0]
+
+            return {**stored, **{c.period: c for c in computed}}
+        finally:
+            if own_session:
+                db.close()
+
+    def window(self, index: str, latitude: float, longitude: float, start_date: str, end_date: str,
+               radius_km: Optional[float] = None, db: Optional[Session] = None) -> Dict:
+        """Index mean over [start_date, end_date), assembled from per-period composites"""
+        periods = split_window(date.fromisoformat(start_date), date.fromisoformat(end_date))
+        composites = self.periods(index, latitude, longitude, periods, radius_km, db)
+        mean, image_count = combine(composites.values())
+        return {
+            "index": index,
+            "mean": round(mean, 3) if mean is not None else None,
+            "image_count": image_count,
+            "date_range": {"start": start_date, "end": end_date},
+            "periods": len(periods),
+        }
+
+    def analysis(self, index: str, latitude: float, longitude: float, radius_km: Optional[float] = None,
+                 days: int = ANALYSIS_WINDOW_DAYS, db: Optional[Session] = None) -> Dict:
+        """
+        get_ndvi / detect_water_changes over the last `days` days, from composites
+
+        Same fields as the service's answer. The settled weeks of the window
+        are read from satellite_data, so only the last few days are computed
+        and a window moving forward a day reuses everything else.
+        """
+        if index not in INDICES:
+            raise ValueError(f"index must be one of {sorted(INDICES)}")
+        if radius_km is None:
+            radius_km = INDICES[index][2]
+        today = datetime.utcnow().date()
+        window = self.window(index, latitude, longitude, (today - timedelta(days=days)).isoformat(),
+                             today.isoformat(), radius_km, db)
+        mean = window["mean"]
+        common = {
+            "location": {"latitude": latitude, "longitude": longitude, "radius_km": radius_km},
+            "date_range": window["date_range"],
+            "image_count": window["image_count"],
+            "periods": window["periods"],
+            "satellite_source": "Sentinel-2 SR",
+            "data_type": "composite",
+        }
+        if index == "ndvi":
+            return {"ndvi_mean": mean, **common, "analysis_type": "vegetation_health",
+                    "interpretation": interpret_ndvi(mean)}
+        return {"ndwi_mean": mean, "water_present": mean > WATER_THRESHOLD if mean is not None else False,
+                **common, "analysis_type": "water_detection", "interpretation": interpret_ndwi(mean)}
+
+    def series(self, index: str, latitude: float, longitude: float, start_date: str, end_date: str,
+               radius_km: Optional[float] = None, db: Optional[Session] = None) -> List[Composite]:
+        """One composite per whole period overlapping [start_date, end_date), oldest first"""
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        first = start - timedelta(days=(start - PERIOD_EPOCH).days % PERIOD_DAYS)
+        periods = []
+        while first < end:
+            periods.append(Period(first, PERIOD_DAYS))
+            first += timedelta(days=PERIOD_DAYS)
+        composites = self.periods(index, latitude, longitude, periods, radius_km, db)
+        return [composites[p] for p in periods]
+
+
+composite_store = CompositeStore()
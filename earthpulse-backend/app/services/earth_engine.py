@@ -1,399 +1,602 @@
 # app/services/earth_engine.py
 import logging
+import os
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from app.analysis.flood_detector import interpret_ndwi
+from app.analysis.ndvi_calculator import interpret_ndvi
+from app.analysis.wildfire_detector import assess_fire_risk
+from app.services.analysis_cache import CachedEarthEngineService
 
 logger = logging.getLogger(__name__)
 
 # Your Earth Engine Project ID
 EE_PROJECT_ID = 'earthpulse-472111'
 
-# Try to import and initialize real Earth Engine
-USE_REAL_EE = False
+# Which service answers analyses:
+#   auto        - real Earth Engine if it initializes, otherwise the mock
+#   earthengine - real Earth Engine only; analyses return errors if it fails to initialize
+#   local       - NumPy over cached GeoTIFFs (earth_engine_local.py), no Earth Engine at all
+#   mock        - always the mock
+EE_BACKEND = os.getenv("EE_BACKEND", "auto").lower()
+
+# The earthengine-api module, bound by _initialize_ee() on first use; importing
+# it and authenticating costs seconds, so nothing happens at import time
+ee = None
+
+
+def _initialize_ee() -> bool:
+    """Import and authenticate earthengine-api; False if either fails"""
+    global ee
+    try:
+        import ee as ee_module
+    except ImportError:
+        logger.warning("⚠️ earthengine-api not installed")
+        return False
 
-try:
-    import ee
-    
     try:
         # Initialize Earth Engine with your project ID
-        ee.Initialize(project=EE_PROJECT_ID)
-        USE_REAL_EE = True
-        logger.info(f"✅ Real Earth Engine initialized with project: {EE_PROJECT_ID}")
+        ee_module.Initialize(project=EE_PROJECT_ID)
     except Exception as e:
         logger.warning(f"⚠️ Earth Engine initialization failed: {e}")
-        logger.info("🔄 Falling back to Mock Earth Engine")
-        USE_REAL_EE = False
-        
-except ImportError:
-    logger.warning("⚠️ earthengine-api not installed")
-    logger.info("🔄 Using Mock Earth Engine")
-    USE_REAL_EE = False
+        return False
+
+    ee = ee_module
+    logger.info(f"✅ Real Earth Engine initialized with project: {EE_PROJECT_ID}")
+    return True
 
 
 # =============================================================================
 # REAL EARTH ENGINE SERVICE
 # =============================================================================
 
-if USE_REAL_EE:
-    logger.info("📡 Using Real Google Earth Engine with LIVE satellite data")
+class EarthEngineService:
+    """Real Google Earth Engine service using live satellite data"""
     
-    class EarthEngineService:
-        """Real Google Earth Engine service using live satellite data"""
+    def __init__(self):
+        self.initialized = True
+        self.project_id = EE_PROJECT_ID
+        logger.info("🛰️ Real Earth Engine Service ready")
+    
+    # Points per reduceRegions/getInfo round trip in the *_batch methods
+    BATCH_SIZE = 100
+    
+    @staticmethod
+    def _window(start_date: Optional[str], end_date: Optional[str], days: int):
+        """Default to the last `days` days"""
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return start_date, end_date
+    
+    @staticmethod
+    def _ndvi_image(region, start_date: str, end_date: str):
+        """Mean NDVI image over Sentinel-2 scenes touching `region`, plus the scene collection"""
+        collection = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
+            .filterBounds(region) \
+            .filterDate(start_date, end_date) \
+            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
         
-        def __init__(self):
-            self.initialized = True
-            self.project_id = EE_PROJECT_ID
-            logger.info("🛰️ Real Earth Engine Service ready")
+        # Calculate NDVI for each image
+        def add_ndvi(image):
+            ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')
+            return image.addBands(ndvi)
         
-        def get_ndvi(self, latitude: float, longitude: float, 
-                     start_date: str = None, end_date: str = None,
-                     radius_km: float = 10) -> Dict:
-            """
-            Calculate NDVI (Normalized Difference Vegetation Index) using real Sentinel-2 data
+        # Get mean NDVI across all images
+        return collection.map(add_ndvi).select('NDVI').mean(), collection
+    
+    @staticmethod
+    def _fire_image(region, start_date: str, end_date: str):
+        """Maximum MODIS fire mask (any fire detected in the period) over `region`"""
+        fires = ee.ImageCollection('MODIS/006/MOD14A1') \
+            .filterBounds(region) \
+            .filterDate(start_date, end_date)
+        return fires.select('FireMask').max(), None
+    
+    @staticmethod
+    def _ndwi_image(region, start_date: str, end_date: str):
+        """Mean NDWI image over Sentinel-2 scenes touching `region`, plus the scene collection"""
+        collection = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
+            .filterBounds(region) \
+            .filterDate(start_date, end_date) \
+            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 30))
+        
+        # Calculate NDWI for each image
+        def add_ndwi(image):
+            ndwi = image.normalizedDifference(['B3', 'B8']).rename('NDWI')
+            return image.addBands(ndwi)
+        
+        return collection.map(add_ndwi).select('NDWI').mean(), collection
+    
+    def _ndvi_result(self, latitude: float, longitude: float, radius_km: float,
+                     start_date: str, end_date: str, ndvi_value, image_count: int) -> Dict:
+        return {
+            "ndvi_mean": round(ndvi_value, 3) if ndvi_value is not None else None,
+            "location": {
+                "latitude": latitude, 
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "image_count": image_count,
+            "analysis_type": "vegetation_health",
+            "interpretation": self._interpret_ndvi(ndvi_value),
+            "satellite_source": "Sentinel-2 SR",
+            "data_type": "real",
+            "project": self.project_id
+        }
+    
+    def _fire_result(self, latitude: float, longitude: float, radius_km: float,
+                     start_date: str, end_date: str, fire_count: int) -> Dict:
+        return {
+            "fire_detected": fire_count > 0,
+            "fire_pixel_count": fire_count,
+            "estimated_area_km2": round(fire_count * 1.0, 2),  # Each pixel ~1km²
+            "location": {
+                "latitude": latitude, 
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "risk_level": self._assess_fire_risk(fire_count),
+            "analysis_type": "wildfire_detection",
+            "satellite_source": "MODIS Active Fire",
+            "resolution": "1km",
+            "data_type": "real",
+            "project": self.project_id
+        }
+    
+    def _water_result(self, latitude: float, longitude: float, radius_km: float,
+                      start_date: str, end_date: str, ndwi_value, image_count: int) -> Dict:
+        return {
+            "ndwi_mean": round(ndwi_value, 3) if ndwi_value is not None else None,
+            "water_present": ndwi_value > 0.3 if ndwi_value is not None else False,
+            "location": {
+                "latitude": latitude, 
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "image_count": image_count,
+            "interpretation": self._interpret_ndwi(ndwi_value),
+            "analysis_type": "water_detection",
+            "satellite_source": "Sentinel-2 SR",
+            "data_type": "real",
+            "project": self.project_id
+        }
+    
+    def get_ndvi(self, latitude: float, longitude: float, 
+                 start_date: str = None, end_date: str = None,
+                 radius_km: float = 10) -> Dict:
+        """
+        Calculate NDVI (Normalized Difference Vegetation Index) using real Sentinel-2 data
+        
+        NDVI values range from -1 to 1:
+        - High values (0.6-0.9): Dense, healthy vegetation
+        - Medium values (0.2-0.5): Sparse vegetation, grasslands
+        - Low values (<0.2): Barren land, urban areas
+        - Negative values: Water bodies
+        """
+        try:
+            # Set default date range if not provided
+            start_date, end_date = self._window(start_date, end_date, 30)
             
-            NDVI values range from -1 to 1:
-            - High values (0.6-0.9): Dense, healthy vegetation
-            - Medium values (0.2-0.5): Sparse vegetation, grasslands
-            - Low values (<0.2): Barren land, urban areas
-            - Negative values: Water bodies
-            """
-            try:
-                # Set default date range if not provided
-                if not end_date:
-                    end_date = datetime.now().strftime('%Y-%m-%d')
-                if not start_date:
-                    start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                
-                logger.info(f"🌿 NDVI analysis for ({latitude}, {longitude}) | {start_date} to {end_date}")
-                
-                # Create point and buffer region
-                point = ee.Geometry.Point([longitude, latitude])
-                region = point.buffer(radius_km * 1000)  # Convert km to meters
-                
-                # Get Sentinel-2 Surface Reflectance imagery
-                collection = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                    .filterBounds(region) \
-                    .filterDate(start_date, end_date) \
-                    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-                
-                # Calculate NDVI for each image
-                def add_ndvi(image):
-                    ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')
-                    return image.addBands(ndvi)
-                
-                collection_with_ndvi = collection.map(add_ndvi)
-                
-                # Get mean NDVI across all images
-                mean_ndvi = collection_with_ndvi.select('NDVI').mean()
-                
-                # Calculate statistics
-                stats = mean_ndvi.reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=region,
-                    scale=10,
-                    maxPixels=1e9
-                ).getInfo()
-                
-                # Get metadata
-                image_count = collection.size().getInfo()
-                ndvi_value = stats.get('NDVI', None)
-                
-                if ndvi_value is not None:
-                    logger.info(f"✅ NDVI: {ndvi_value:.3f} | Images used: {image_count}")
-                else:
-                    logger.warning(f"⚠️ No NDVI data available | Images found: {image_count}")
-                
-                return {
-                    "ndvi_mean": round(ndvi_value, 3) if ndvi_value is not None else None,
-                    "location": {
-                        "latitude": latitude, 
-                        "longitude": longitude,
-                        "radius_km": radius_km
-                    },
-                    "date_range": {"start": start_date, "end": end_date},
-                    "image_count": image_count,
-                    "analysis_type": "vegetation_health",
-                    "interpretation": self._interpret_ndvi(ndvi_value),
-                    "satellite_source": "Sentinel-2 SR",
-                    "data_type": "real",
-                    "project": self.project_id
-                }
-                
-            except Exception as e:
-                logger.error(f"❌ Error calculating NDVI: {e}")
-                return {
-                    "error": str(e), 
-                    "location": {"latitude": latitude, "longitude": longitude},
-                    "analysis_type": "vegetation_health"
-                }
+            logger.info(f"🌿 NDVI analysis for ({latitude}, {longitude}) | {start_date} to {end_date}")
+            
+            # Create point and buffer region
+            point = ee.Geometry.Point([longitude, latitude])
+            region = point.buffer(radius_km * 1000)  # Convert km to meters
+            
+            mean_ndvi, collection = self._ndvi_image(region, start_date, end_date)
+            
+            # Calculate statistics
+            stats = mean_ndvi.reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=region,
+                scale=10,
+                maxPixels=1e9
+            ).getInfo()
+            
+            # Get metadata
+            image_count = collection.size().getInfo()
+            ndvi_value = stats.get('NDVI', None)
+            
+            if ndvi_value is not None:
+                logger.info(f"✅ NDVI: {ndvi_value:.3f} | Images used: {image_count}")
+            else:
+                logger.warning(f"⚠️ No NDVI data available | Images found: {image_count}")
+            
+            return self._ndvi_result(latitude, longitude, radius_km, start_date, end_date,
+                                     ndvi_value, image_count)
+            
+        except Exception as e:
+            logger.error(f"❌ Error calculating NDVI: {e}")
+            return {
+                "error": str(e), 
+                "location": {"latitude": latitude, "longitude": longitude},
+                "analysis_type": "vegetation_health"
+            }
+    
+    def detect_wildfires(self, latitude: float, longitude: float,
+                        start_date: str = None, end_date: str = None,
+                        radius_km: float = 50) -> Dict:
+        """
+        Detect wildfires using real MODIS thermal anomaly data
         
-        def detect_wildfires(self, latitude: float, longitude: float,
+        Uses NASA's MODIS Active Fire product which detects thermal anomalies
+        indicating active fires or recently burned areas.
+        """
+        try:
+            # Set default date range
+            start_date, end_date = self._window(start_date, end_date, 7)
+            
+            logger.info(f"🔥 Fire detection for ({latitude}, {longitude}) | {start_date} to {end_date}")
+            
+            # Create point and buffer region
+            point = ee.Geometry.Point([longitude, latitude])
+            region = point.buffer(radius_km * 1000)
+            
+            fire_mask, _ = self._fire_image(region, start_date, end_date)
+            
+            # Calculate fire statistics
+            fire_stats = fire_mask.reduceRegion(
+                reducer=ee.Reducer.sum(),
+                geometry=region,
+                scale=1000,
+                maxPixels=1e9
+            ).getInfo()
+            
+            fire_count = int(fire_stats.get('FireMask', 0))
+            
+            if fire_count > 0:
+                logger.warning(f"🔥 Fire detected! {fire_count} fire pixels found")
+            else:
+                logger.info(f"✅ No fires detected in the area")
+            
+            return self._fire_result(latitude, longitude, radius_km, start_date, end_date, fire_count)
+            
+        except Exception as e:
+            logger.error(f"❌ Error detecting wildfires: {e}")
+            return {
+                "error": str(e), 
+                "location": {"latitude": latitude, "longitude": longitude},
+                "analysis_type": "wildfire_detection"
+            }
+    
+    def detect_water_changes(self, latitude: float, longitude: float,
                             start_date: str = None, end_date: str = None,
-                            radius_km: float = 50) -> Dict:
-            """
-            Detect wildfires using real MODIS thermal anomaly data
+                            radius_km: float = 20) -> Dict:
+        """
+        Detect water changes using real Sentinel-2 NDWI (Normalized Difference Water Index)
+        
+        NDWI values:
+        - > 0.3: Water bodies, potential flooding
+        - 0 to 0.3: Moderate moisture, wetlands
+        - < 0: Dry land, potential drought
+        """
+        try:
+            # Set default date range
+            start_date, end_date = self._window(start_date, end_date, 30)
             
-            Uses NASA's MODIS Active Fire product which detects thermal anomalies
-            indicating active fires or recently burned areas.
-            """
-            try:
-                # Set default date range
-                if not end_date:
-                    end_date = datetime.now().strftime('%Y-%m-%d')
-                if not start_date:
-                    start_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                
-                logger.info(f"🔥 Fire detection for ({latitude}, {longitude}) | {start_date} to {end_date}")
-                
-                # Create point and buffer region
-                point = ee.Geometry.Point([longitude, latitude])
-                region = point.buffer(radius_km * 1000)
-                
-                # Get MODIS fire data
-                fires = ee.ImageCollection('MODIS/006/MOD14A1') \
-                    .filterBounds(region) \
-                    .filterDate(start_date, end_date)
-                
-                # Get maximum fire mask (any fire detected in the period)
-                fire_mask = fires.select('FireMask').max()
-                
-                # Calculate fire statistics
-                fire_stats = fire_mask.reduceRegion(
-                    reducer=ee.Reducer.sum(),
-                    geometry=region,
-                    scale=1000,
-                    maxPixels=1e9
-                ).getInfo()
-                
-                fire_count = int(fire_stats.get('FireMask', 0))
-                
-                if fire_count > 0:
-                    logger.warning(f"🔥 Fire detected! {fire_count} fire pixels found")
+            logger.info(f"💧 Water detection for ({latitude}, {longitude}) | {start_date} to {end_date}")
+            
+            # Create point and buffer region
+            point = ee.Geometry.Point([longitude, latitude])
+            region = point.buffer(radius_km * 1000)
+            
+            mean_ndwi, collection = self._ndwi_image(region, start_date, end_date)
+            
+            # Calculate statistics
+            stats = mean_ndwi.reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=region,
+                scale=10,
+                maxPixels=1e9
+            ).getInfo()
+            
+            ndwi_value = stats.get('NDWI', None)
+            image_count = collection.size().getInfo()
+            
+            if ndwi_value is not None:
+                if ndwi_value > 0.3:
+                    logger.warning(f"💧 High water content detected: NDWI = {ndwi_value:.3f}")
                 else:
-                    logger.info(f"✅ No fires detected in the area")
-                
-                return {
-                    "fire_detected": fire_count > 0,
-                    "fire_pixel_count": fire_count,
-                    "estimated_area_km2": round(fire_count * 1.0, 2),  # Each pixel ~1km²
-                    "location": {
-                        "latitude": latitude, 
-                        "longitude": longitude,
-                        "radius_km": radius_km
-                    },
-                    "date_range": {"start": start_date, "end": end_date},
-                    "risk_level": self._assess_fire_risk(fire_count),
-                    "analysis_type": "wildfire_detection",
-                    "satellite_source": "MODIS Active Fire",
-                    "resolution": "1km",
-                    "data_type": "real",
-                    "project": self.project_id
-                }
-                
-            except Exception as e:
-                logger.error(f"❌ Error detecting wildfires: {e}")
-                return {
-                    "error": str(e), 
-                    "location": {"latitude": latitude, "longitude": longitude},
-                    "analysis_type": "wildfire_detection"
-                }
-        
-        def detect_water_changes(self, latitude: float, longitude: float,
-                                start_date: str = None, end_date: str = None,
-                                radius_km: float = 20) -> Dict:
-            """
-            Detect water changes using real Sentinel-2 NDWI (Normalized Difference Water Index)
+                    logger.info(f"✅ NDWI: {ndwi_value:.3f} | Images used: {image_count}")
+            else:
+                logger.warning(f"⚠️ No NDWI data available | Images found: {image_count}")
             
-            NDWI values:
-            - > 0.3: Water bodies, potential flooding
-            - 0 to 0.3: Moderate moisture, wetlands
-            - < 0: Dry land, potential drought
-            """
+            return self._water_result(latitude, longitude, radius_km, start_date, end_date,
+                                      ndwi_value, image_count)
+            
+        except Exception as e:
+            logger.error(f"❌ Error detecting water changes: {e}")
+            return {
+                "error": str(e), 
+                "location": {"latitude": latitude, "longitude": longitude},
+                "analysis_type": "water_detection"
+            }
+    
+    def _reduce_points(self, points: List[Tuple[float, float]], radius_km: float,
+                       start_date: str, end_date: str, build_image,
+                       reducer, band: str, scale: int) -> List:
+        """
+        Reduce one image over many buffered points, BATCH_SIZE points per round trip
+        
+        Each chunk becomes one FeatureCollection, one reduceRegions() and one
+        getInfo(). The image is built over the whole chunk; pixels inside a
+        point's buffer only come from scenes that cover it, so the per-point
+        values equal what reduceRegion() gives for that point alone. Returns,
+        per point, the reduced properties or the exception its chunk raised.
+        """
+        results = []
+        for offset in range(0, len(points), self.BATCH_SIZE):
+            chunk = points[offset:offset + self.BATCH_SIZE]
             try:
-                # Set default date range
-                if not end_date:
-                    end_date = datetime.now().strftime('%Y-%m-%d')
-                if not start_date:
-                    start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                
-                logger.info(f"💧 Water detection for ({latitude}, {longitude}) | {start_date} to {end_date}")
-                
-                # Create point and buffer region
-                point = ee.Geometry.Point([longitude, latitude])
-                region = point.buffer(radius_km * 1000)
-                
-                # Get Sentinel-2 imagery
-                collection = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                    .filterBounds(region) \
-                    .filterDate(start_date, end_date) \
-                    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 30))
-                
-                # Calculate NDWI for each image
-                def add_ndwi(image):
-                    ndwi = image.normalizedDifference(['B3', 'B8']).rename('NDWI')
-                    return image.addBands(ndwi)
-                
-                collection_with_ndwi = collection.map(add_ndwi)
-                
-                # Get mean NDWI
-                mean_ndwi = collection_with_ndwi.select('NDWI').mean()
-                
-                # Calculate statistics
-                stats = mean_ndwi.reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=region,
-                    scale=10,
-                    maxPixels=1e9
+                regions = ee.FeatureCollection([
+                    ee.Feature(ee.Geometry.Point([lon, lat]).buffer(radius_km * 1000), {"idx": i})
+                    for i, (lat, lon) in enumerate(chunk)
+                ])
+                image, collection = build_image(regions, start_date, end_date)
+                if collection is not None:
+                    # Same count as collection.filterBounds(region).size() per point
+                    regions = regions.map(
+                        lambda f: f.set("image_count", collection.filterBounds(f.geometry()).size())
+                    )
+                
+                reduced = image.reduceRegions(
+                    collection=regions,
+                    reducer=reducer.setOutputs([band]),
+                    scale=scale
                 ).getInfo()
                 
-                ndwi_value = stats.get('NDWI', None)
-                image_count = collection.size().getInfo()
-                
-                if ndwi_value is not None:
-                    if ndwi_value > 0.3:
-                        logger.warning(f"💧 High water content detected: NDWI = {ndwi_value:.3f}")
-                    else:
-                        logger.info(f"✅ NDWI: {ndwi_value:.3f} | Images used: {image_count}")
-                else:
-                    logger.warning(f"⚠️ No NDWI data available | Images found: {image_count}")
-                
-                return {
-                    "ndwi_mean": round(ndwi_value, 3) if ndwi_value is not None else None,
-                    "water_present": ndwi_value > 0.3 if ndwi_value is not None else False,
-                    "location": {
-                        "latitude": latitude, 
-                        "longitude": longitude,
-                        "radius_km": radius_km
-                    },
-                    "date_range": {"start": start_date, "end": end_date},
-                    "image_count": image_count,
-                    "interpretation": self._interpret_ndwi(ndwi_value),
-                    "analysis_type": "water_detection",
-                    "satellite_source": "Sentinel-2 SR",
-                    "data_type": "real",
-                    "project": self.project_id
-                }
-                
+                by_idx = {f["properties"]["idx"]: f["properties"] for f in reduced["features"]}
+                results.extend(by_idx.get(i, {}) for i in range(len(chunk)))
             except Exception as e:
-                logger.error(f"❌ Error detecting water changes: {e}")
-                return {
-                    "error": str(e), 
-                    "location": {"latitude": latitude, "longitude": longitude},
-                    "analysis_type": "water_detection"
-                }
+                logger.error(f"❌ Batch reduction failed for {len(chunk)} points: {e}")
+                results.extend(e for _ in chunk)
+        return results
+    
+    @staticmethod
+    def _batch_error(error: Exception, latitude: float, longitude: float, analysis_type: str) -> Dict:
+        return {
+            "error": str(error),
+            "location": {"latitude": latitude, "longitude": longitude},
+            "analysis_type": analysis_type
+        }
+    
+    def get_ndvi_batch(self, points: List[Tuple[float, float]],
+                       start_date: str = None, end_date: str = None,
+                       radius_km: float = 10) -> List[Dict]:
+        """get_ndvi for many (latitude, longitude) points, in input order"""
+        start_date, end_date = self._window(start_date, end_date, 30)
+        logger.info(f"🌿 Batch NDVI analysis for {len(points)} points | {start_date} to {end_date}")
+        
+        reduced = self._reduce_points(points, radius_km, start_date, end_date,
+                                      self._ndvi_image, ee.Reducer.mean(), 'NDVI', 10)
+        results = []
+        for (lat, lon), props in zip(points, reduced):
+            if isinstance(props, Exception):
+                results.append(self._batch_error(props, lat, lon, "vegetation_health"))
+                continue
+            results.append(self._ndvi_result(lat, lon, radius_km, start_date, end_date,
+                                             props.get('NDVI'), props.get('image_count', 0)))
+        return results
+    
+    def detect_wildfires_batch(self, points: List[Tuple[float, float]],
+                               start_date: str = None, end_date: str = None,
+                               radius_km: float = 50) -> List[Dict]:
+        """detect_wildfires for many (latitude, longitude) points, in input order"""
+        start_date, end_date = self._window(start_date, end_date, 7)
+        logger.info(f"🔥 Batch fire detection for {len(points)} points | {start_date} to {end_date}")
         
-        def get_satellite_image_url(self, latitude: float, longitude: float,
-                                   date: str = None, zoom: int = 12) -> Optional[str]:
-            """
-            Get a visual RGB satellite image URL
-            """
+        reduced = self._reduce_points(points, radius_km, start_date, end_date,
+                                      self._fire_image, ee.Reducer.sum(), 'FireMask', 1000)
+        results = []
+        for (lat, lon), props in zip(points, reduced):
             try:
-                if not date:
-                    date = datetime.now().strftime('%Y-%m-%d')
-                
-                point = ee.Geometry.Point([longitude, latitude])
-                
-                # Get Sentinel-2 image
-                image = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                    .filterBounds(point) \
-                    .filterDate(date, (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=7)).strftime('%Y-%m-%d')) \
-                    .sort('CLOUDY_PIXEL_PERCENTAGE') \
-                    .first()
-                
-                # Get thumbnail URL (RGB visualization)
-                url = image.getThumbURL({
-                    'min': 0,
-                    'max': 3000,
-                    'bands': ['B4', 'B3', 'B2'],  # RGB
-                    'dimensions': 512,
-                    'region': point.buffer(5000).bounds()
-                })
-                
-                return url
-                
+                if isinstance(props, Exception):
+                    raise props
+                fire_count = int(props.get('FireMask', 0))
+                results.append(self._fire_result(lat, lon, radius_km, start_date, end_date, fire_count))
             except Exception as e:
-                logger.error(f"Error getting satellite image: {e}")
-                return None
-        
-        @staticmethod
-        def _interpret_ndvi(ndvi: float) -> str:
-            """Interpret NDVI value"""
-            if ndvi is None:
-                return "No data available - check date range or cloud coverage"
-            elif ndvi < -0.1:
-                return "Water bodies"
-            elif ndvi < 0:
-                return "Clouds or snow"
-            elif ndvi < 0.2:
-                return "Barren land, rock, sand, or urban areas"
-            elif ndvi < 0.35:
-                return "Sparse vegetation, shrubland, or grassland"
-            elif ndvi < 0.5:
-                return "Moderate vegetation, agricultural land"
-            elif ndvi < 0.7:
-                return "Dense vegetation, healthy forests"
-            else:
-                return "Very dense, healthy vegetation - tropical rainforests"
-        
-        @staticmethod
-        def _assess_fire_risk(fire_count: int) -> str:
-            """Assess fire risk level based on detected fire pixels"""
-            if fire_count == 0:
-                return "low"
-            elif fire_count < 5:
-                return "medium"
-            elif fire_count < 15:
-                return "high"
-            else:
-                return "critical"
+                results.append(self._batch_error(e, lat, lon, "wildfire_detection"))
+        return results
+    
+    def detect_water_changes_batch(self, points: List[Tuple[float, float]],
+                                   start_date: str = None, end_date: str = None,
+                                   radius_km: float = 20) -> List[Dict]:
+        """detect_water_changes for many (latitude, longitude) points, in input order"""
+        start_date, end_date = self._window(start_date, end_date, 30)
+        logger.info(f"💧 Batch water detection for {len(points)} points | {start_date} to {end_date}")
         
-        @staticmethod
-        def _interpret_ndwi(ndwi: float) -> str:
-            """Interpret NDWI value"""
-            if ndwi is None:
-                return "No data available - check date range or cloud coverage"
-            elif ndwi > 0.5:
-                return "High water content - large water bodies or significant flooding"
-            elif ndwi > 0.3:
-                return "Moderate water content - potential flooding or wetlands"
-            elif ndwi > 0.1:
-                return "Low water content - moist soil or vegetation"
-            elif ndwi > -0.1:
-                return "Minimal water content - dry soil"
-            else:
-                return "Very low water content - barren land, potential drought conditions"
+        reduced = self._reduce_points(points, radius_km, start_date, end_date,
+                                      self._ndwi_image, ee.Reducer.mean(), 'NDWI', 10)
+        results = []
+        for (lat, lon), props in zip(points, reduced):
+            if isinstance(props, Exception):
+                results.append(self._batch_error(props, lat, lon, "water_detection"))
+                continue
+            results.append(self._water_result(lat, lon, radius_km, start_date, end_date,
+                                              props.get('NDWI'), props.get('image_count', 0)))
+        return results
+    
+    def _reduce_windows(self, latitude: float, longitude: float, radius_km: float,
+                        windows: List[Tuple[str, str]], build_image, band: str,
+                        scale: int) -> List:
+        """
+        Reduce one buffered point over many date windows, BATCH_SIZE windows per round trip
+
+        Every window's image and scene count become properties of one
+        feature, so a chunk costs a single getInfo(). Returns, per window,
+        (value, image_count) or the exception its chunk raised.
+        """
+        region = ee.Geometry.Point([longitude, latitude]).buffer(radius_km * 1000)
+        results = []
+        for offset in range(0, len(windows), self.BATCH_SIZE):
+            chunk = windows[offset:offset + self.BATCH_SIZE]
+            try:
+                features = []
+                for start_date, end_date in chunk:
+                    image, collection = build_image(region, start_date, end_date)
+                    value = image.reduceRegion(
+                        reducer=ee.Reducer.mean(),
+                        geometry=region,
+                        scale=scale,
+                        maxPixels=1e9
+                    ).get(band)
+                    features.append(ee.Feature(None, {"value": value, "image_count": collection.size()}))
+                
+                reduced = ee.FeatureCollection(features).getInfo()
+                results.extend(
+                    (f["properties"].get("value"), f["properties"].get("image_count", 0))
+                    for f in reduced["features"]
+                )
+            except Exception as e:
+                logger.error(f"❌ Window reduction failed for {len(chunk)} windows: {e}")
+                results.extend(e for _ in chunk)
+        return results
     
-    # Create singleton instance
-    earth_engine_service = EarthEngineService()
+    def get_ndvi_series(self, latitude: float, longitude: float,
+                        windows: List[Tuple[str, str]], radius_km: float = 10) -> List[Dict]:
+        """get_ndvi for many (start_date, end_date) windows at one point, in input order"""
+        logger.info(f"🌿 NDVI series for ({latitude}, {longitude}) | {len(windows)} windows")
+        reduced = self._reduce_windows(latitude, longitude, radius_km, windows,
+                                       self._ndvi_image, 'NDVI', 10)
+        results = []
+        for (start_date, end_date), item in zip(windows, reduced):
+            if isinstance(item, Exception):
+                results.append(self._batch_error(item, latitude, longitude, "vegetation_health"))
+                continue
+            results.append(self._ndvi_result(latitude, longitude, radius_km, start_date, end_date, *item))
+        return results
+    
+    def detect_water_changes_series(self, latitude: float, longitude: float,
+                                    windows: List[Tuple[str, str]], radius_km: float = 20) -> List[Dict]:
+        """detect_water_changes for many (start_date, end_date) windows at one point, in input order"""
+        logger.info(f"💧 NDWI series for ({latitude}, {longitude}) | {len(windows)} windows")
+        reduced = self._reduce_windows(latitude, longitude, radius_km, windows,
+                                       self._ndwi_image, 'NDWI', 10)
+        results = []
+        for (start_date, end_date), item in zip(windows, reduced):
+            if isinstance(item, Exception):
+                results.append(self._batch_error(item, latitude, longitude, "water_detection"))
+                continue
+            results.append(self._water_result(latitude, longitude, radius_km, start_date, end_date, *item))
+        return results
+    
+    def get_satellite_image_url(self, latitude: float, longitude: float,
+                               date: str = None, zoom: int = 12) -> Optional[str]:
+        """
+        Get a visual RGB satellite image URL
+        """
+        try:
+            if not date:
+                date = datetime.now().strftime('%Y-%m-%d')
+            
+            point = ee.Geometry.Point([longitude, latitude])
+            
+            # Get Sentinel-2 image
+            image = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
+                .filterBounds(point) \
+                .filterDate(date, (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=7)).strftime('%Y-%m-%d')) \
+                .sort('CLOUDY_PIXEL_PERCENTAGE') \
+                .first()
+            
+            # Get thumbnail URL (RGB visualization)
+            url = image.getThumbURL({
+                'min': 0,
+                'max': 3000,
+                'bands': ['B4', 'B3', 'B2'],  # RGB
+                'dimensions': 512,
+                'region': point.buffer(5000).bounds()
+            })
+            
+            return url
+            
+        except Exception as e:
+            logger.error(f"Error getting satellite image: {e}")
+            return None
+    
+    _interpret_ndvi = staticmethod(interpret_ndvi)
+    _assess_fire_risk = staticmethod(assess_fire_risk)
+    _interpret_ndwi = staticmethod(interpret_ndwi)
 
 
-# =============================================================================
-# FALLBACK TO MOCK EARTH ENGINE IF REAL EE FAILED
-# =============================================================================
+class MinimalMockService:
+    """Answers every analysis with an error when no usable service exists"""
+    
+    def __init__(self, reason: str = "Earth Engine not available"):
+        self.initialized = False
+        self.reason = reason
+    
+    def get_ndvi(self, *args, **kwargs):
+        return {"error": self.reason}
+    
+    def detect_wildfires(self, *args, **kwargs):
+        return {"error": self.reason}
+    
+    def detect_water_changes(self, *args, **kwargs):
+        return {"error": self.reason}
 
-else:
-    logger.info("🎭 Using Mock Earth Engine (for testing)")
+
+def _create_service():
+    if EE_BACKEND == "local":
+        logger.info("🗂️ Using local raster engine over cached GeoTIFFs")
+        from .earth_engine_local import LocalEarthEngineService
+        return LocalEarthEngineService()
+    
+    if EE_BACKEND in ("auto", "earthengine"):
+        if _initialize_ee():
+            logger.info("📡 Using Real Google Earth Engine with LIVE satellite data")
+            return EarthEngineService()
+        if EE_BACKEND == "earthengine":
+            return MinimalMockService("Earth Engine failed to initialize")
+        logger.info("🔄 Falling back to Mock Earth Engine")
     
-    # Import mock service
+    logger.info("🎭 Using Mock Earth Engine (for testing)")
     try:
-        from .earth_engine_mock import earth_engine_service
-        logger.info("✅ Mock Earth Engine Service loaded")
+        from .earth_engine_mock import MockEarthEngineService
+        return MockEarthEngineService()
     except ImportError:
         logger.error("❌ Could not load Mock Earth Engine Service")
-        logger.error("Please ensure earth_engine_mock.py exists in app/services/")
-        
-        # Create a minimal fallback
-        class MinimalMockService:
-            def __init__(self):
-                self.initialized = False
-            
-            def get_ndvi(self, *args, **kwargs):
-                return {"error": "Earth Engine not available"}
-            
-            def detect_wildfires(self, *args, **kwargs):
-                return {"error": "Earth Engine not available"}
-            
-            def detect_water_changes(self, *args, **kwargs):
-                return {"error": "Earth Engine not available"}
-        
-        earth_engine_service = MinimalMockService()
\ No newline at end of file
+        return MinimalMockService()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_earth_engine_service():
+    """
+    The service selected by EE_BACKEND, created on first call
+
+    Thread-safe: concurrent first callers wait for a single initialization
+    instead of each authenticating against Earth Engine.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = _create_service()
+    return _service
+
+
+def earth_engine_status() -> str:
+    """active / inactive once the service exists, without creating it"""
+    if _service is None:
+        return "not_initialized"
+    return "active" if getattr(_service, "initialized", False) else "inactive"
+
+
+class LazyEarthEngineService:
+    """Forwards every attribute to get_earth_engine_service(), creating it on first use"""
+    
+    def __getattr__(self, name):
+        return getattr(get_earth_engine_service(), name)
+
+
+# Repeat lookups for the same cell, radius and window are answered from cache
+earth_engine_service = CachedEarthEngineService(LazyEarthEngineService())
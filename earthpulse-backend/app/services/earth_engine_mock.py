@@ -0,0 +1,181 @@
+# app/services/earth_engine_mock.py
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.analysis.flood_detector import WATER_THRESHOLD, interpret_ndwi
+from app.analysis.ndvi_calculator import interpret_ndvi
+from app.analysis.wildfire_detector import assess_fire_risk
+
+logger = logging.getLogger(__name__)
+
+# Simulated round-trip time of a remote Earth Engine call, in seconds
+MOCK_LATENCY_SECONDS = float(os.getenv("EE_MOCK_LATENCY_SECONDS", "0"))
+
+
+class MockEarthEngineService:
+    """
+    Offline stand-in for EarthEngineService
+
+    Returns the same payloads as the real service with plausible values that
+    are deterministic for a given location and date window, so repeated calls
+    (and caches in front of this service) behave like they would against
+    real Earth Engine.
+    """
+
+    def __init__(self, latency_seconds: float = MOCK_LATENCY_SECONDS):
+        self.initialized = True
+        self.project_id = "mock"
+        self.latency_seconds = latency_seconds
+        self.call_count = 0
+        self._count_lock = threading.Lock()
+
+    def _round_trip(self):
+        """Account for (and simulate the latency of) one remote call"""
+        with self._count_lock:
+            self.call_count += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    @staticmethod
+    def _rng(analysis: str, latitude: float, longitude: float, radius_km: float,
+             start_date: str, end_date: str) -> random.Random:
+        parts = (analysis, round(float(latitude), 4), round(float(longitude), 4),
+                 float(radius_km), start_date, end_date)
+        seed = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+        return random.Random(int(seed[:16], 16))
+
+    @staticmethod
+    def _window(start_date: Optional[str], end_date: Optional[str], days: int):
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return start_date, end_date
+
+    def get_ndvi(self, latitude: float, longitude: float,
+                 start_date: str = None, end_date: str = None,
+                 radius_km: float = 10) -> Dict:
+        self._round_trip()
+        return self._ndvi(latitude, longitude, start_date, end_date, radius_km)
+
+    def detect_wildfires(self, latitude: float, longitude: float,
+                         start_date: str = None, end_date: str = None,
+                         radius_km: float = 50) -> Dict:
+        self._round_trip()
+        return self._wildfires(latitude, longitude, start_date, end_date, radius_km)
+
+    def detect_water_changes(self, latitude: float, longitude: float,
+                             start_date: str = None, end_date: str = None,
+                             radius_km: float = 20) -> Dict:
+        self._round_trip()
+        return self._water(latitude, longitude, start_date, end_date, radius_km)
+
+    def get_ndvi_batch(self, points: List[Tuple[float, float]],
+                       start_date: str = None, end_date: str = None,
+                       radius_km: float = 10) -> List[Dict]:
+        self._round_trip()
+        return [self._ndvi(lat, lon, start_date, end_date, radius_km) for lat, lon in points]
+
+    def detect_wildfires_batch(self, points: List[Tuple[float, float]],
+                               start_date: str = None, end_date: str = None,
+                               radius_km: float = 50) -> List[Dict]:
+        self._round_trip()
+        return [self._wildfires(lat, lon, start_date, end_date, radius_km) for lat, lon in points]
+
+    def detect_water_changes_batch(self, points: List[Tuple[float, float]],
+                                   start_date: str = None, end_date: str = None,
+                                   radius_km: float = 20) -> List[Dict]:
+        self._round_trip()
+        return [self._water(lat, lon, start_date, end_date, radius_km) for lat, lon in points]
+
+    def get_ndvi_series(self, latitude: float, longitude: float,
+                        windows: List[Tuple[str, str]], radius_km: float = 10) -> List[Dict]:
+        self._round_trip()
+        return [self._ndvi(latitude, longitude, start, end, radius_km) for start, end in windows]
+
+    def detect_water_changes_series(self, latitude: float, longitude: float,
+                                    windows: List[Tuple[str, str]], radius_km: float = 20) -> List[Dict]:
+        self._round_trip()
+        return [self._water(latitude, longitude, start, end, radius_km) for start, end in windows]
+
+    def _ndvi(self, latitude: float, longitude: float,
+              start_date: str, end_date: str, radius_km: float) -> Dict:
+        start_date, end_date = self._window(start_date, end_date, 30)
+        rng = self._rng("ndvi", latitude, longitude, radius_km, start_date, end_date)
+        ndvi_value = round(rng.uniform(-0.1, 0.85), 3)
+
+        return {
+            "ndvi_mean": ndvi_value,
+            "location": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "image_count": rng.randint(1, 12),
+            "analysis_type": "vegetation_health",
+            "interpretation": interpret_ndvi(ndvi_value),
+            "satellite_source": "Sentinel-2 SR",
+            "data_type": "mock",
+            "project": self.project_id
+        }
+
+    def _wildfires(self, latitude: float, longitude: float,
+                   start_date: str, end_date: str, radius_km: float) -> Dict:
+        start_date, end_date = self._window(start_date, end_date, 7)
+        rng = self._rng("wildfire", latitude, longitude, radius_km, start_date, end_date)
+        fire_count = rng.choice([0, 0, 0, rng.randint(1, 30)])
+
+        return {
+            "fire_detected": fire_count > 0,
+            "fire_pixel_count": fire_count,
+            "estimated_area_km2": round(fire_count * 1.0, 2),
+            "location": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "risk_level": assess_fire_risk(fire_count),
+            "analysis_type": "wildfire_detection",
+            "satellite_source": "MODIS Active Fire",
+            "resolution": "1km",
+            "data_type": "mock",
+            "project": self.project_id
+        }
+
+    def _water(self, latitude: float, longitude: float,
+               start_date: str, end_date: str, radius_km: float) -> Dict:
+        start_date, end_date = self._window(start_date, end_date, 30)
+        rng = self._rng("water", latitude, longitude, radius_km, start_date, end_date)
+        ndwi_value = round(rng.uniform(-0.4, 0.6), 3)
+
+        return {
+            "ndwi_mean": ndwi_value,
+            "water_present": ndwi_value > WATER_THRESHOLD,
+            "location": {
+                "latitude": latitude,
+                "longitude": longitude,
+                "radius_km": radius_km
+            },
+            "date_range": {"start": start_date, "end": end_date},
+            "image_count": rng.randint(1, 12),
+            "interpretation": interpret_ndwi(ndwi_value),
+            "analysis_type": "water_detection",
+            "satellite_source": "Sentinel-2 SR",
+            "data_type": "mock",
+            "project": self.project_id
+        }
+
+    def get_satellite_image_url(self, latitude: float, longitude: float,
+                                date: str = None, zoom: int = 12) -> Optional[str]:
+        return None
+
+
+earth_engine_service = MockEarthEngineService()
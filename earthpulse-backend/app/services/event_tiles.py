@@ -0,0 +1,195 @@
+# app/services/event_tiles.py
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.database.crud import filter_bbox
+from app.models.event import Event
+from app.utils import geohash, mvt
+
+LAYER_NAME = "events"
+
+# Clusters snap to a CLUSTER_GRID x CLUSTER_GRID grid per tile (~32 screen px
+# per cell on 512px tiles); from CLUSTER_MAX_ZOOM on every event is its own point
+CLUSTER_GRID = 16
+CLUSTER_MAX_ZOOM = 14
+
+
+def _aggregate_precision(z: int) -> int:
+    """Coarsest geohash precision whose cells are no bigger than one cluster cell"""
+    cluster_width = 360.0 / (1 << z) / CLUSTER_GRID
+    precision = 1
+    while precision < geohash.MAX_PRECISION and max(geohash.cell_size(precision)) > cluster_width:
+        precision += 1
+    return precision
+
+
+def _abbreviate(count: int) -> str:
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M"
+    if count >= 10_000:
+        return f"{count // 1000}k"
+    if count >= 1000:
+        return f"{count / 1000:.1f}k"
+    return str(count)
+
+
+def _point_properties(row) -> Dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "event_type": row.event_type,
+        "severity": row.severity,
+        "is_verified": bool(row.is_verified),
+        "cluster": False,
+    }
+
+
+def build_event_tile(db: Session, z: int, x: int, y: int) -> bytes:
+    """
+    Encode the events inside one tile, clustered below CLUSTER_MAX_ZOOM
+
+    Below that zoom the database pre-aggregates by geohash prefix (count,
+    verified count and centroid per cell and event type), so a world tile
+    reads a few thousand groups rather than every event. The groups are then
+    merged into the tile's cluster grid. A cluster of one is emitted as a
+    plain point with its event's properties.
+    """
+    bounds = mvt.tile_bounds(z, x, y)
+    features = []
+
+    if z >= CLUSTER_MAX_ZOOM:
+        rows = filter_bbox(
+            db.query(Event.id, Event.title, Event.event_type, Event.severity,
+                     Event.is_verified, Event.latitude, Event.longitude),
+            bounds
+        ).all()
+        for row in rows:
+            px, py = mvt.project(row.latitude, row.longitude, z, x, y)
+            features.append({"id": row.id, "x": px, "y": py, "properties": _point_properties(row)})
+        return mvt.encode_tile({LAYER_NAME: features})
+
+    prefix = func.substr(Event.geohash, 1, _aggregate_precision(z))
+    groups = filter_bbox(
+        db.query(
+            prefix,
+            Event.event_type,
+            func.count(Event.id),
+            func.sum(case((Event.is_verified.is_(True), 1), else_=0)),
+            func.avg(Event.latitude),
+            func.avg(Event.longitude),
+            func.sum(case((Event.severity == "critical", 1), else_=0)),
+            func.min(Event.id),
+        ),
+        bounds
+    ).group_by(prefix, Event.event_type).all()
+
+    cell_size = mvt.EXTENT // CLUSTER_GRID
+    clusters: Dict[Tuple[int, int], Dict] = {}
+    for _, event_type, count, verified, lat, lon, critical, first_id in groups:
+        px, py = mvt.project(lat, lon, z, x, y)
+        cell = (min(max(px // cell_size, 0), CLUSTER_GRID - 1),
+                min(max(py // cell_size, 0), CLUSTER_GRID - 1))
+        cluster = clusters.setdefault(cell, {
+            "count": 0, "verified": 0, "x": 0.0, "y": 0.0,
+            "types": defaultdict(int), "critical": 0, "first_id": first_id,
+        })
+        cluster["count"] += count
+        cluster["verified"] += verified or 0
+        cluster["x"] += px * count
+        cluster["y"] += py * count
+        cluster["types"][event_type or "unknown"] += count
+        cluster["critical"] += critical or 0
+
+    singles = [c["first_id"] for c in clusters.values() if c["count"] == 1]
+    single_rows = {}
+    if singles:
+        single_rows = {
+            row.id: row for row in db.query(
+                Event.id, Event.title, Event.event_type, Event.severity, Event.is_verified,
+                Event.latitude, Event.longitude
+            ).filter(Event.id.in_(singles))
+        }
+
+    for cluster in clusters.values():
+        count = cluster["count"]
+        if count == 1 and cluster["first_id"] in single_rows:
+            row = single_rows[cluster["first_id"]]
+            px, py = mvt.project(row.latitude, row.longitude, z, x, y)
+            features.append({"id": row.id, "x": px, "y": py, "properties": _point_properties(row)})
+            continue
+
+        types = cluster["types"]
+        properties = {
+            "cluster": True,
+            "point_count": count,
+            "point_count_abbreviated": _abbreviate(count),
+            "verified_count": cluster["verified"],
+            "event_type": max(types, key=types.get),
+            "critical_count": cluster["critical"],
+        }
+        properties.update({f"count_{t}": n for t, n in types.items()})
+        features.append({
+            "id": None,
+            "x": int(cluster["x"] / count),
+            "y": int(cluster["y"] / count),
+            "properties": properties,
+        })
+
+    return mvt.encode_tile({LAYER_NAME: features})
+
+
+class EventTileCache:
+    """
+    LRU of encoded tiles keyed by (z, x, y), each stamped with the events
+    version it was built from
+
+    The stamp is max(events.updated_at) (one index lookup), which moves on
+    every insert or update, so a tile built before a change is rebuilt on
+    its next request.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._tiles: "OrderedDict[Tuple[int, int, int], Tuple[object, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def version(db: Session):
+        return db.query(func.max(Event.updated_at)).scalar()
+
+    def get(self, db: Session, z: int, x: int, y: int) -> bytes:
+        key = (z, x, y)
+        stamp = self.version(db)
+
+        with self._lock:
+            entry = self._tiles.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._tiles.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            self._counters["misses"] += 1
+
+        tile = build_event_tile(db, z, x, y)
+
+        with self._lock:
+            self._tiles[key] = (stamp, tile)
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_entries:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._tiles)}
+
+
+event_tile_cache = EventTileCache()
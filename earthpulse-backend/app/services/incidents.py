@@ -0,0 +1,338 @@
+# app/services/incidents.py
+"""
+Incremental clustering of events into incidents
+
+Two events are neighbours when they have the same event_type, lie within
+INCIDENT_RADIUS_KM of each other and happened within INCIDENT_WINDOW_DAYS
+of each other. An incident is a connected group of neighbours: DBSCAN with
+min_samples=1, so the result does not depend on arrival order. Each new
+event looks up its neighbours with one (event_type, geohash range) scan of
+ix_events_type_geohash per range covering its radius - the rows read
+depend on how busy the area is, not on the size of the table - and joins
+their incident, merges their incidents if it bridges several, or starts a
+new one. Centroid, bounding box, count, time span and highest severity are
+kept up to date on the incident as events arrive.
+
+    python -m app.services.incidents            # cluster unassigned events
+    python -m app.services.incidents --rebuild  # recluster everything
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, bindparam, or_, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, crud
+from app.models.event import Event
+from app.models.incident import Incident
+from app.utils import geohash
+from app.utils.helpers import BBox
+
+logger = logging.getLogger(__name__)
+
+INCIDENT_RADIUS_KM = float(os.getenv("INCIDENT_RADIUS_KM", "10"))
+INCIDENT_WINDOW_DAYS = float(os.getenv("INCIDENT_WINDOW_DAYS", "3"))
+
+# Events assigned per transaction by assign_pending
+ASSIGN_CHUNK_SIZE = 500
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+
+def event_time(event) -> datetime:
+    """When the event happened, as far as we know: publication, else ingestion"""
+    return event.published_at or event.created_at or datetime.utcnow()
+
+
+def _higher_severity(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    return a if SEVERITY_RANK.get(a, 0) >= SEVERITY_RANK.get(b, 0) else b
+
+
+_NEIGHBOUR_COLUMNS = (Event.id, Event.incident_id, Event.latitude, Event.longitude,
+                      Event.published_at, Event.created_at)
+
+
+@functools.lru_cache(maxsize=None)
+def _neighbour_statement(bounded: Tuple[bool, ...]):
+    """
+    UNION ALL of one (event_type, geohash range) SELECT per range
+
+    `bounded` tells which ranges have an end; no ranges means the whole type.
+    Built once per shape so each lookup only binds parameters. Time and
+    incident are checked on the returned rows so they cannot steer the
+    planner away from ix_events_type_geohash.
+    """
+    selects = [
+        select(*_NEIGHBOUR_COLUMNS).where(
+            Event.event_type == bindparam("event_type"),
+            Event.geohash >= bindparam(f"start_{i}"),
+            *([Event.geohash < bindparam(f"end_{i}")] if has_end else [])
+        )
+        for i, has_end in enumerate(bounded)
+    ] or [select(*_NEIGHBOUR_COLUMNS).where(Event.event_type == bindparam("event_type"))]
+    return selects[0] if len(selects) == 1 else union_all(*selects)
+
+
+class IncidentClusterer:
+    def __init__(self, radius_km: float = INCIDENT_RADIUS_KM, window_days: float = INCIDENT_WINDOW_DAYS):
+        self.radius_km = radius_km
+        self.window = timedelta(days=window_days)
+        # One clustering transaction at a time in this process
+        self._lock = threading.Lock()
+
+    def neighbours(self, db: Session, event) -> List:
+        """Clustered events of the same type within radius_km and the time window"""
+        ranges = []
+        for min_lon, min_lat, max_lon, max_lat in geohash.split_bbox(
+                geohash.radius_bbox(event.latitude, event.longitude, self.radius_km)):
+            half = geohash.covering_ranges(min_lon, min_lat, max_lon, max_lat,
+                                           max_cells=crud.SPATIAL_MAX_CELLS)
+            if not half:
+                ranges = []
+                break
+            ranges.extend(half)
+        params = {"event_type": event.event_type}
+        for i, (start, end) in enumerate(ranges):
+            params[f"start_{i}"] = start
+            if end:
+                params[f"end_{i}"] = end
+        rows = db.execute(_neighbour_statement(tuple(bool(end) for _, end in ranges)), params).all()
+        return [r for r in rows if r.incident_id is not None and self._near(event, r)]
+
+    def _near(self, event, other) -> bool:
+        if abs(event.latitude - other.latitude) * geohash.KM_PER_DEGREE > self.radius_km:
+            return False
+        return abs(event_time(event) - event_time(other)) <= self.window \
+            and geohash.haversine_km(event.latitude, event.longitude,
+                                     other.latitude, other.longitude) <= self.radius_km
+
+    @staticmethod
+    def _add_event(incident: Incident, event):
+        n = incident.event_count or 0
+        when = event_time(event)
+        if n == 0:
+            incident.latitude, incident.longitude = event.latitude, event.longitude
+            incident.min_latitude = incident.max_latitude = event.latitude
+            incident.min_longitude = incident.max_longitude = event.longitude
+            incident.first_seen = incident.last_seen = when
+        else:
+            incident.latitude = (incident.latitude * n + event.latitude) / (n + 1)
+            # Averaged on the side of the antimeridian the centroid is on
+            incident.longitude = geohash.wrap_lon(
+                incident.longitude + geohash.lon_offset(event.longitude, incident.longitude) / (n + 1))
+            incident.min_latitude = min(incident.min_latitude, event.latitude)
+            incident.max_latitude = max(incident.max_latitude, event.latitude)
+            incident.min_longitude, incident.max_longitude = geohash.extend_lon_range(
+                incident.min_longitude, incident.max_longitude, event.longitude)
+            incident.first_seen = min(incident.first_seen, when)
+            incident.last_seen = max(incident.last_seen, when)
+        incident.event_count = n + 1
+        incident.max_severity = _higher_severity(incident.max_severity, event.severity)
+        incident.geohash = geohash.encode(incident.latitude, incident.longitude)
+
+    @staticmethod
+    def _merge(db: Session, keep: Incident, other: Incident):
+        """Fold `other` into `keep`: members, aggregates and the newer verification"""
+        if other.id is not None:
+            db.execute(update(Event).where(Event.incident_id == other.id).values(incident_id=keep.id))
+        n, m = keep.event_count, other.event_count
+        keep.latitude = (keep.latitude * n + other.latitude * m) / (n + m)
+        keep.longitude = geohash.wrap_lon(
+            keep.longitude + geohash.lon_offset(other.longitude, keep.longitude) * m / (n + m))
+        keep.min_latitude = min(keep.min_latitude, other.min_latitude)
+        keep.max_latitude = max(keep.max_latitude, other.max_latitude)
+        for longitude in (other.min_longitude, other.max_longitude):
+            keep.min_longitude, keep.max_longitude = geohash.extend_lon_range(
+                keep.min_longitude, keep.max_longitude, longitude)
+        keep.first_seen = min(keep.first_seen, other.first_seen)
+        keep.last_seen = max(keep.last_seen, other.last_seen)
+        keep.event_count = n + m
+        keep.max_severity = _higher_severity(keep.max_severity, other.max_severity)
+        keep.geohash = geohash.encode(keep.latitude, keep.longitude)
+        if other.verified_at and (keep.verified_at is None or other.verified_at > keep.verified_at):
+            keep.is_verified = other.is_verified
+            keep.verification_status = other.verification_status
+            keep.verification_score = other.verification_score
+            keep.analysis_results = other.analysis_results
+            keep.verified_at = other.verified_at
+        if other.id is not None:
+            db.delete(other)
+        else:
+            db.expunge(other)  # created earlier in this batch, never written
+
+    def assign(self, db: Session, events: Iterable[Event]) -> Dict[int, int]:
+        """
+        Put each unassigned, located event into an incident; returns event id -> incident id
+
+        Events of the batch find each other in memory (`placed`) rather than
+        through the database, so nothing is flushed until the whole batch is
+        placed; the caller commits.
+        """
+        placed: Dict[Event, Incident] = {}
+        with db.no_autoflush:
+            for event in sorted(events, key=event_time):
+                if event.incident_id is not None or event.latitude is None or event.longitude is None \
+                        or not event.event_type:
+                    continue
+
+                found = {db.get(Incident, r.incident_id) for r in self.neighbours(db, event)}
+                found.update(i for other, i in placed.items()
+                             if other.event_type == event.event_type and self._near(event, other))
+                found.discard(None)
+                if found:
+                    # Lowest stored id survives; incidents new in this batch have none yet
+                    incident, *others = sorted(found, key=lambda i: (i.id is None, i.id or 0))
+                    for other in others:
+                        self._merge(db, incident, other)
+                        placed = {e: incident if i is other else i for e, i in placed.items()}
+                else:
+                    incident = Incident(event_type=event.event_type, event_count=0)
+                    db.add(incident)
+
+                self._add_event(incident, event)
+                placed[event] = incident
+
+        if not placed:
+            return {}
+        db.flush()
+        for event, incident in placed.items():
+            event.incident_id = incident.id
+        db.flush()
+        return {event.id: incident.id for event, incident in placed.items()}
+
+    def cluster(self, db: Session, events: Sequence[Event]) -> Dict[int, int]:
+        """
+        assign() and commit while holding the clusterer's lock
+
+        For events committed before clustering (the API's create endpoint):
+        a background assign_pending() may have placed them meanwhile, so
+        their incident_id is re-read first.
+        """
+        with self._lock:
+            for event in events:
+                db.refresh(event, ["incident_id"])
+            assigned = self.assign(db, events)
+            db.commit()
+        return assigned
+
+    def assign_ids(self, db: Session, event_ids: Sequence[int]) -> Dict[int, int]:
+        assigned = {}
+        for offset in range(0, len(event_ids), ASSIGN_CHUNK_SIZE):
+            chunk = db.query(Event).filter(Event.id.in_(event_ids[offset:offset + ASSIGN_CHUNK_SIZE])).all()
+            assigned.update(self.assign(db, chunk))
+        return assigned
+
+    def assign_pending(self, db: Session, limit: Optional[int] = None) -> int:
+        """Cluster every located event that has no incident yet, oldest first, committing per chunk"""
+        total = 0
+        while limit is None or total < limit:
+            size = ASSIGN_CHUNK_SIZE if limit is None else min(ASSIGN_CHUNK_SIZE, limit - total)
+            with self._lock:
+                chunk = db.query(Event) \
+                    .filter(Event.incident_id.is_(None),
+                            Event.latitude.isnot(None), Event.longitude.isnot(None),
+                            Event.event_type.isnot(None)) \
+                    .order_by(Event.id) \
+                    .limit(size).all()
+                if not chunk:
+                    break
+                self.assign(db, chunk)
+                db.commit()
+            total += len(chunk)
+        if total:
+            logger.info(f"🧩 Clustered {total} events into incidents")
+        return total
+
+    def rebuild(self, db: Session) -> int:
+        """Drop every incident and cluster all events again"""
+        db.execute(update(Event).where(Event.incident_id.isnot(None)).values(incident_id=None))
+        db.query(Incident).delete()
+        db.commit()
+        return self.assign_pending(db)
+
+
+incident_clusterer = IncidentClusterer()
+
+
+def cluster_pending(session_factory=SessionLocal) -> int:
+    """incident_clusterer.assign_pending() in its own session (background tasks)"""
+    db = session_factory()
+    try:
+        return incident_clusterer.assign_pending(db)
+    finally:
+        db.close()
+
+
+def incident_to_dict(incident: Incident) -> Dict:
+    """API shape; bbox has min_lon > max_lon when the incident straddles the antimeridian"""
+    return {
+        "id": incident.id,
+        "event_type": incident.event_type,
+        "centroid": {"latitude": incident.latitude, "longitude": incident.longitude},
+        "bbox": [incident.min_longitude, incident.min_latitude, incident.max_longitude, incident.max_latitude],
+        "event_count": incident.event_count,
+        "max_severity": incident.max_severity,
+        "first_seen": incident.first_seen.isoformat() if incident.first_seen else None,
+        "last_seen": incident.last_seen.isoformat() if incident.last_seen else None,
+        "is_verified": incident.is_verified,
+        "verification_status": incident.verification_status,
+        "verification_score": incident.verification_score,
+    }
+
+
+def list_incidents(db: Session, event_type: str = None, bbox: Optional[BBox] = None,
+                   since: datetime = None, min_events: int = 1, verified: bool = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> List[Incident]:
+    """Incidents by most recent activity; bbox matches on the centroid"""
+    query = db.query(Incident)
+    if event_type:
+        query = query.filter(Incident.event_type == event_type)
+    if since:
+        query = query.filter(Incident.last_seen >= since)
+    if min_events > 1:
+        query = query.filter(Incident.event_count >= min_events)
+    if verified is not None:
+        query = query.filter(Incident.is_verified == verified)
+    if bbox:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        ranges = geohash.covering_ranges(min_lon, min_lat, max_lon, max_lat, max_cells=crud.SPATIAL_MAX_CELLS)
+        if ranges:
+            query = query.filter(or_(*[
+                and_(Incident.geohash >= start, Incident.geohash < end) if end else Incident.geohash >= start
+                for start, end in ranges
+            ]))
+        query = query.filter(Incident.longitude.between(min_lon, max_lon),
+                             Incident.latitude.between(min_lat, max_lat))
+    return query.order_by(Incident.last_seen.desc(), Incident.id.desc()).limit(limit).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster events into incidents")
+    parser.add_argument("--rebuild", action="store_true", help="drop all incidents and recluster every event")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from app.database.migrations import run_migrations
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        count = incident_clusterer.rebuild(db) if args.rebuild else incident_clusterer.assign_pending(db, args.limit)
+        print(json.dumps({"clustered": count, "incidents": db.query(Incident).count()}))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
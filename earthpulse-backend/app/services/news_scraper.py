@@ -5,6 +5,10 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import random
 
+from sqlalchemy.orm import Session
+
+from app.scraping.dedup import ingest_stories
+
 logger = logging.getLogger(__name__)
 
 def scrape_environmental_news(query: str = "wildfire OR flood OR deforestation", max_results: int = 20) -> List[Dict]:
@@ -127,5 +131,31 @@ def create_event_from_news(news_item: Dict) -> Dict:
         'severity': 'medium',
         'location': news_item['location'],
         'source_url': news_item['url'],
+        'source_urls': news_item.get('source_urls') or [news_item['url']],
         'source_type': 'news_scraper'
-    }
\ No newline at end of file
+    }
+
+
+def import_news(db: Session, news_items: List[Dict]) -> Dict:
+    """
+    Store news items as events, merging near-duplicate stories
+
+    Syndicated copies (in this batch or of a recent event) become extra
+    source_urls of one event instead of events of their own.
+    """
+    def build_events(stories):
+        columns = []
+        for story in stories:
+            event = create_event_from_news(story)
+            location = event.pop('location', None) or {}
+            event.pop('source_urls')
+            columns.append({
+                **event,
+                'location_name': location.get('name'),
+                'latitude': location.get('latitude'),
+                'longitude': location.get('longitude'),
+                'is_verified': False,
+            })
+        return columns
+
+    return ingest_stories(db, news_items, build_events)
\ No newline at end of file
@@ -0,0 +1,64 @@
+# app/services/singleflight.py
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one execution
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and get the same result (or the same
+    exception). Once the call completes the key is forgotten, so later calls
+    run again - caching is the caller's business.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._counters = {"calls": 0, "executions": 0, "deduplicated": 0, "max_waiters": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters["deduplicated"] += 1
+                self._counters["max_waiters"] = max(self._counters["max_waiters"], call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._calls)}
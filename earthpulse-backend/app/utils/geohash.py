@@ -0,0 +1,187 @@
+# app/utils/geohash.py
+"""
+Geohash encoding and bounding-box covers
+
+Events store a geohash next to latitude/longitude so spatial lookups become
+prefix range scans on a plain B-tree index, which works on any SQLite build.
+"""
+import math
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def _bits(precision: int) -> Tuple[int, int]:
+    """Bits spent on (longitude, latitude) at a given precision"""
+    total = 5 * precision
+    return (total + 1) // 2, total // 2
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(width in degrees of longitude, height in degrees of latitude) of one cell"""
+    lon_bits, lat_bits = _bits(precision)
+    return 360.0 / (1 << lon_bits), 180.0 / (1 << lat_bits)
+
+
+def _index(value: float, low: float, span: float, bits: int) -> int:
+    idx = int((value - low) / span * (1 << bits))
+    return min(max(idx, 0), (1 << bits) - 1)
+
+
+def _spread(value: int) -> int:
+    """Move bit i of a 32-bit value to bit 2i"""
+    value &= 0xFFFFFFFF
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    value = (value | (value << 1)) & 0x5555555555555555
+    return value
+
+
+def _interleave(lon_idx: int, lat_idx: int, precision: int) -> int:
+    # Bits alternate lon, lat from the top, so the lowest bit is lon when the total is odd
+    if (5 * precision) % 2:
+        return _spread(lon_idx) | (_spread(lat_idx) << 1)
+    return (_spread(lon_idx) << 1) | _spread(lat_idx)
+
+
+def _code_to_str(code: int, precision: int) -> str:
+    chars = []
+    for _ in range(precision):
+        chars.append(BASE32[code & 31])
+        code >>= 5
+    return "".join(reversed(chars))
+
+
+def encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    """Geohash of a point (precision 9 is roughly a 5m cell)"""
+    lon_bits, lat_bits = _bits(precision)
+    lon_idx = _index(longitude, -180.0, 360.0, lon_bits)
+    lat_idx = _index(latitude, -90.0, 180.0, lat_bits)
+    return _code_to_str(_interleave(lon_idx, lat_idx, precision), precision)
+
+
+def covering_ranges(min_lon: float, min_lat: float, max_lon: float, max_lat: float,
+                    max_cells: int = 32) -> List[Tuple[str, Optional[str]]]:
+    """
+    Geohash ranges `[start, end)` whose union covers the bounding box
+
+    Picks the finest precision that needs at most `max_cells` cells, then merges
+    cells that are consecutive in Z-order into a single range. `end` is None when
+    the range runs to the end of the keyspace. Returns an empty list when even
+    precision 1 needs more than `max_cells` cells (i.e. don't bother).
+    """
+    best = None
+    for precision in range(1, MAX_PRECISION + 1):
+        lon_bits, lat_bits = _bits(precision)
+        lon_lo = _index(min_lon, -180.0, 360.0, lon_bits)
+        lon_hi = _index(max_lon, -180.0, 360.0, lon_bits)
+        lat_lo = _index(min_lat, -90.0, 180.0, lat_bits)
+        lat_hi = _index(max_lat, -90.0, 180.0, lat_bits)
+        if (lon_hi - lon_lo + 1) * (lat_hi - lat_lo + 1) > max_cells:
+            break
+        best = (precision, lon_lo, lon_hi, lat_lo, lat_hi)
+
+    if best is None:
+        return []
+
+    precision, lon_lo, lon_hi, lat_lo, lat_hi = best
+    codes = sorted(
+        _interleave(x, y, precision)
+        for x in range(lon_lo, lon_hi + 1)
+        for y in range(lat_lo, lat_hi + 1)
+    )
+
+    ranges = []
+    start = prev = codes[0]
+    for code in codes[1:] + [None]:
+        if code is not None and code == prev + 1:
+            prev = code
+            continue
+        end = prev + 1
+        ranges.append((
+            _code_to_str(start, precision),
+            _code_to_str(end, precision) if end < (1 << 5 * precision) else None
+        ))
+        if code is not None:
+            start = prev = code
+    return ranges
+
+
+def radius_bbox(latitude: float, longitude: float,
+                radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Bounding box (min_lon, min_lat, max_lon, max_lat) around a circle
+
+    Latitude is clamped to the poles; longitude wraps, so min_lon > max_lon
+    when the box crosses the antimeridian (see split_bbox).
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    if abs(latitude) + dlat >= 90.0 or angular >= math.pi / 2:
+        # The circle reaches a pole: every longitude is in range
+        dlon = 180.0
+    else:
+        dlon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(latitude))))
+
+    if dlon >= 180.0:
+        min_lon, max_lon = -180.0, 180.0
+    else:
+        min_lon, max_lon = longitude - dlon, longitude + dlon
+        if min_lon < -180.0:
+            min_lon += 360.0
+        if max_lon > 180.0:
+            max_lon -= 360.0
+    return (
+        min_lon,
+        max(latitude - dlat, -90.0),
+        max_lon,
+        min(latitude + dlat, 90.0),
+    )
+
+
+def split_bbox(bbox: Tuple[float, float, float, float]) -> List[Tuple[float, float, float, float]]:
+    """A box crossing the antimeridian (min_lon > max_lon) as its two halves, else the box itself"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if min_lon <= max_lon:
+        return [bbox]
+    return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+
+
+def wrap_lon(longitude: float) -> float:
+    """Longitude folded into [-180, 180)"""
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def lon_offset(longitude: float, reference: float) -> float:
+    """Shortest signed distance in degrees from `reference` east to `longitude`"""
+    return wrap_lon(longitude - reference)
+
+
+def extend_lon_range(min_lon: float, max_lon: float, longitude: float) -> Tuple[float, float]:
+    """
+    Smallest longitude range covering [min_lon, max_lon] and `longitude`
+
+    As in radius_bbox, min_lon > max_lon means the range crosses the
+    antimeridian. The range grows on whichever side keeps it narrower, which
+    is right for anything spanning less than half the globe.
+    """
+    width = (max_lon - min_lon) % 360.0
+    east = (longitude - min_lon) % 360.0
+    if east <= width:
+        return min_lon, max_lon
+    west = (max_lon - longitude) % 360.0
+    return (min_lon, longitude) if east <= west else (longitude, max_lon)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -0,0 +1,32 @@
+# app/utils/helpers.py
+from typing import Tuple
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Parse a `min_lon,min_lat,max_lon,max_lat` string (the GeoJSON / Mapbox order)
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox is out of range or its min/max are swapped")
+
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """Parse a `lat,lon` string"""
+    try:
+        latitude, longitude = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError("point must be lat,lon")
+
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("point is out of range")
+
+    return latitude, longitude
@@ -0,0 +1,133 @@
+# app/utils/mvt.py
+"""
+Web Mercator tile math and a minimal Mapbox Vector Tile (v2) encoder
+
+Only point features are needed for events, which keeps the protobuf
+encoding small enough to write by hand instead of pulling in protobuf and
+mapbox-vector-tile.
+"""
+import math
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+EXTENT = 4096
+MAX_ZOOM = 22
+MAX_LATITUDE = 85.0511287798066  # Web Mercator cuts off here
+
+# Protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_BYTES = 2
+
+_MOVE_TO = 1
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile"""
+    n = 1 << z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def project(latitude: float, longitude: float, z: int, x: int, y: int,
+            extent: int = EXTENT) -> Tuple[int, int]:
+    """Point -> integer coordinates inside tile (z, x, y), y pointing down"""
+    latitude = max(min(latitude, MAX_LATITUDE), -MAX_LATITUDE)
+    n = (1 << z) * extent
+    world_x = (longitude + 180.0) / 360.0 * n
+    sin_lat = math.sin(math.radians(latitude))
+    world_y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * n
+    return int(world_x - x * extent), int(world_y - y * extent)
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, _BYTES) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(v) for v in values))
+
+
+def _value(value) -> bytes:
+    """Encode a tag value as a Tile.Value message"""
+    if isinstance(value, bool):
+        return _field(7, _VARINT) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _field(5, _VARINT) + _varint(value)
+        return _field(6, _VARINT) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _field(3, _FIXED64) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode())
+
+
+def encode_layer(name: str, features: List[Dict], extent: int = EXTENT) -> bytes:
+    """
+    Encode one layer of point features
+
+    Each feature is {"id": int | None, "x": int, "y": int, "properties": {...}}
+    with tile coordinates from project(). None-valued properties are dropped;
+    keys and values are shared across features as the spec intends.
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[tuple, int] = {}
+    encoded = []
+
+    for feature in features:
+        tags = []
+        for key, value in feature["properties"].items():
+            if value is None:
+                continue
+            key_index = keys.setdefault(key, len(keys))
+            value_key = (type(value).__name__, value)
+            value_index = values.setdefault(value_key, len(values))
+            tags += [key_index, value_index]
+
+        geometry = [(_MOVE_TO & 0x7) | (1 << 3), _zigzag(feature["x"]), _zigzag(feature["y"])]
+        body = b""
+        if feature.get("id") is not None:
+            body += _field(1, _VARINT) + _varint(feature["id"])
+        if tags:
+            body += _packed(2, tags)
+        body += _field(3, _VARINT) + _varint(1)  # GeomType.POINT
+        body += _packed(4, geometry)
+        encoded.append(_bytes_field(2, body))
+
+    layer = _field(15, _VARINT) + _varint(2)
+    layer += _bytes_field(1, name.encode())
+    layer += b"".join(encoded)
+    layer += b"".join(_bytes_field(3, key.encode()) for key in keys)
+    layer += b"".join(_bytes_field(4, _value(value)) for _, value in values)
+    layer += _field(5, _VARINT) + _varint(extent)
+    return layer
+
+
+def encode_tile(layers: Dict[str, List[Dict]], extent: int = EXTENT) -> bytes:
+    """Encode {layer name: features} as a vector tile; layers without features are skipped"""
+    return b"".join(
+        _bytes_field(3, encode_layer(name, features, extent))
+        for name, features in layers.items() if features
+    )
@@ -0,0 +1,281 @@
+# app/verification/bulk.py
+"""
+Bulk verification of every pending event
+
+    python -m app.verification.bulk --status pending --event-type wildfire
+
+Also exposed as POST /api/events/verify-pending.
+
+Events that belong to an incident (app.services.incidents) are checked
+once per incident, at its centroid, and the outcome is written to every
+pending member; an incident verified within INCIDENT_VERIFICATION_TTL_HOURS
+is not checked again.
+"""
+import argparse
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.database import engine as default_engine
+from app.models.event import Event
+from app.models.incident import Incident
+from app.services.incidents import incident_clusterer
+from app.verification.verifier import (
+    DEFAULT_SCORE,
+    VERIFICATION_CHECKS,
+    VerificationError,
+    incident_outcome,
+    judge,
+)
+
+logger = logging.getLogger(__name__)
+
+# Points per satellite batch call and per UPDATE transaction
+CHUNK_SIZE = 500
+
+# Incidents loaded per SELECT when grouping events
+INCIDENT_LOOKUP_CHUNK = 500
+
+_columns = Event.__table__.c
+_incident_columns = Incident.__table__.c
+
+_UPDATE_EVENT = (
+    update(Event.__table__)
+    .where(_columns.id == bindparam("event_id"))
+    .values(
+        is_verified=bindparam("b_verified", type_=_columns.is_verified.type),
+        verification_score=bindparam("b_score", type_=_columns.verification_score.type),
+        verification_status=bindparam("b_status", type_=_columns.verification_status.type),
+        verification_method="satellite",
+        analysis_results=bindparam("b_results", type_=_columns.analysis_results.type),
+        updated_at=bindparam("b_updated_at", type_=_columns.updated_at.type),
+    )
+)
+
+_UPDATE_INCIDENT = (
+    update(Incident.__table__)
+    .where(_incident_columns.id == bindparam("incident_id"))
+    .values(
+        is_verified=bindparam("b_verified", type_=_incident_columns.is_verified.type),
+        verification_score=bindparam("b_score", type_=_incident_columns.verification_score.type),
+        verification_status=bindparam("b_status", type_=_incident_columns.verification_status.type),
+        analysis_results=bindparam("b_results", type_=_incident_columns.analysis_results.type),
+        verified_at=bindparam("b_verified_at", type_=_incident_columns.verified_at.type),
+    )
+)
+
+
+@dataclass
+class _Check:
+    """One satellite check: a lone event, or an incident's centroid standing for its members"""
+    latitude: float
+    longitude: float
+    events: List
+    incident_id: Optional[int] = None
+    outcome: Optional[Dict] = None
+
+    def __post_init__(self):
+        # A fresh incident outcome is reused without a satellite check
+        self.reused = self.outcome is not None
+
+
+def _select_events(conn, statuses: Sequence[str], event_type: Optional[str],
+                   limit: Optional[int]) -> List:
+    """
+    Id, type and location of the events to verify, grouped by type and then
+    by geohash so every batch covers a compact area
+    """
+    query = (
+        Event.__table__.select()
+        .with_only_columns(_columns.id, _columns.event_type, _columns.latitude,
+                           _columns.longitude, _columns.geohash, _columns.incident_id)
+        .where(_columns.verification_status.in_(statuses))
+        .order_by(_columns.event_type, _columns.geohash, _columns.id)
+    )
+    if event_type:
+        query = query.where(_columns.event_type == event_type)
+    if limit:
+        query = query.limit(limit)
+    return conn.execute(query).all()
+
+
+def _group_checks(conn, rows: List, now: datetime) -> List[_Check]:
+    """Collapse events of one incident into a single check, keeping the geohash order"""
+    incident_ids = list({r.incident_id for r in rows if r.incident_id is not None})
+    incidents = {}
+    for offset in range(0, len(incident_ids), INCIDENT_LOOKUP_CHUNK):
+        for incident in conn.execute(
+            Incident.__table__.select()
+            .where(_incident_columns.id.in_(incident_ids[offset:offset + INCIDENT_LOOKUP_CHUNK]))
+        ):
+            incidents[incident.id] = incident
+
+    checks: Dict[tuple, _Check] = {}
+    for row in rows:
+        incident = incidents.get(row.incident_id)
+        if incident is None:
+            checks[("event", row.id)] = _Check(row.latitude, row.longitude, [row])
+            continue
+        check = checks.get(("incident", incident.id))
+        if check is None:
+            check = checks[("incident", incident.id)] = _Check(
+                incident.latitude, incident.longitude, [], incident.id, incident_outcome(incident, now)
+            )
+        check.events.append(row)
+    return list(checks.values())
+
+
+def _check_batch(service, event_type: str, rows: List) -> List[Optional[Dict]]:
+    """Run one batched satellite check; None marks a point whose analysis failed"""
+    check = VERIFICATION_CHECKS.get(event_type)
+    if check is None:
+        return [{"verified": False, "score": DEFAULT_SCORE, "analysis_results": None}] * len(rows)
+
+    method, radius_km, _ = check
+    points = [(r.latitude, r.longitude) for r in rows]
+    batch = getattr(service, f"{method}_batch", None)
+    if batch is not None:
+        results = batch(points, radius_km=radius_km)
+    else:
+        single = getattr(service, method)
+        results = [single(lat, lon, radius_km=radius_km) for lat, lon in points]
+
+    outcomes = []
+    for result in results:
+        try:
+            outcomes.append(judge(event_type, result))
+        except VerificationError:
+            outcomes.append(None)
+    return outcomes
+
+
+def verify_pending(service, statuses: Sequence[str] = ("pending",),
+                   event_type: Optional[str] = None, limit: Optional[int] = None,
+                   chunk_size: int = CHUNK_SIZE, bind=None) -> Dict:
+    """
+    Verify every event in `statuses` with batched satellite checks
+
+    Unclustered events are first assigned to incidents. Events are grouped
+    by type (one Earth Engine analysis per type) and sorted by geohash;
+    members of an incident collapse into one check at its centroid, or
+    none if the incident has a fresh outcome. Checks are handled
+    `chunk_size` at a time: one batch call, then executemany UPDATEs of the
+    events and incidents in one transaction, so progress is kept if a later
+    chunk fails. Events whose analysis errors keep their status and are
+    picked up by the next run.
+    """
+    bind = bind if bind is not None else default_engine
+    started = time.perf_counter()
+    report = {"selected": 0, "verified": 0, "unverified": 0, "errors": 0,
+              "skipped": 0, "batches": 0, "checks": 0, "incidents": 0, "reused": 0, "by_type": {}}
+
+    with Session(bind=bind) as db:
+        incident_clusterer.assign_pending(db)
+
+    with bind.connect() as conn:
+        rows = _select_events(conn, statuses, event_type, limit)
+    report["selected"] = len(rows)
+
+    for etype, group in groupby(rows, key=lambda r: r.event_type):
+        group = list(group)
+        located = [r for r in group if r.latitude is not None and r.longitude is not None]
+        report["skipped"] += len(group) - len(located)
+        counts = report["by_type"].setdefault(etype or "unknown", {"events": len(group), "verified": 0})
+
+        now = datetime.utcnow()
+        with bind.connect() as conn:
+            checks = _group_checks(conn, located, now)
+        report["incidents"] += sum(c.incident_id is not None for c in checks)
+
+        for offset in range(0, len(checks), chunk_size):
+            chunk = checks[offset:offset + chunk_size]
+            to_check = [c for c in chunk if not c.reused]
+            if to_check:
+                for check, outcome in zip(to_check, _check_batch(service, etype, to_check)):
+                    check.outcome = outcome
+                report["batches"] += 1
+                report["checks"] += len(to_check)
+
+            now = datetime.utcnow()
+            params, incident_params = [], []
+            for check in chunk:
+                outcome = check.outcome
+                if outcome is None:
+                    report["errors"] += len(check.events)
+                    continue
+                verified = bool(outcome["verified"])
+                status = "verified" if verified else "unverified"
+                if check.reused:
+                    report["reused"] += len(check.events)
+                elif check.incident_id is not None:
+                    incident_params.append({
+                        "incident_id": check.incident_id,
+                        "b_verified": verified,
+                        "b_score": outcome["score"],
+                        "b_status": status,
+                        "b_results": outcome["analysis_results"],
+                        "b_verified_at": now,
+                    })
+                report["verified" if verified else "unverified"] += len(check.events)
+                counts["verified"] += verified * len(check.events)
+                params.extend({
+                    "event_id": row.id,
+                    "b_verified": verified,
+                    "b_score": outcome["score"],
+                    "b_status": status,
+                    "b_results": outcome["analysis_results"],
+                    "b_updated_at": now,
+                } for row in check.events)
+
+            if params:
+                with bind.begin() as conn:
+                    conn.execute(_UPDATE_EVENT, params)
+                    if incident_params:
+                        conn.execute(_UPDATE_INCIDENT, incident_params)
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 3)
+    processed = report["selected"] - report["skipped"]
+    report["events_per_second"] = round(processed / elapsed, 1) if elapsed else 0.0
+
+    logger.info(
+        f"🛰️ Bulk verification: {processed} events with {report['checks']} satellite checks "
+        f"in {elapsed:.1f}s ({report['events_per_second']}/s, {report['errors']} errors)"
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify all pending events with batched satellite checks")
+    parser.add_argument("--status", default="pending",
+                        help="comma separated verification statuses to (re-)verify")
+    parser.add_argument("--event-type", default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from app.database.migrations import run_migrations
+    from app.services.earth_engine import earth_engine_service
+
+    run_migrations()
+    report = verify_pending(
+        earth_engine_service,
+        statuses=[s.strip() for s in args.status.split(",") if s.strip()],
+        event_type=args.event_type,
+        limit=args.limit,
+        chunk_size=args.chunk_size,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
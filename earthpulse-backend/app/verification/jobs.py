@@ -0,0 +1,200 @@
+# app/verification/jobs.py
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.job import VerificationJob
+
+logger = logging.getLogger(__name__)
+
+# Attempts before a job is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+
+# Retry delay doubles per attempt from the base, up to the cap (seconds)
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "900"))
+
+# A running job whose worker has not finished within the lease is presumed
+# dead (crash, restart, deploy) and becomes claimable again
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+
+# Window used for the throughput metric (seconds)
+THROUGHPUT_WINDOW_SECONDS = 300
+
+# Candidates looked at per claim attempt when other workers race us
+CLAIM_CANDIDATES = 8
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def enqueue_verification(db: Session, event_id: int,
+                         max_attempts: int = JOB_MAX_ATTEMPTS) -> VerificationJob:
+    """
+    Queue a satellite verification for an event
+
+    An event that already has a queued or running job gets that job back
+    instead of a duplicate.
+    """
+    job = (
+        db.query(VerificationJob)
+        .filter(VerificationJob.event_id == event_id)
+        .filter(VerificationJob.status.in_(ACTIVE_STATUSES))
+        .order_by(VerificationJob.id.desc())
+        .first()
+    )
+    if job is not None:
+        return job
+
+    job = VerificationJob(event_id=event_id, max_attempts=max_attempts)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _claimable(now: datetime):
+    stale = now - timedelta(seconds=JOB_LEASE_SECONDS)
+    return or_(
+        and_(VerificationJob.status == "queued", VerificationJob.run_after <= now),
+        and_(VerificationJob.status == "running", VerificationJob.locked_at < stale),
+    )
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[VerificationJob]:
+    """
+    Atomically take the next ready job, or None when the queue is idle
+
+    Claiming is a conditional UPDATE on the job row (compare-and-set on its
+    status/lease), so any number of workers, threads or processes, can poll
+    the same table without running a job twice and without needing
+    SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    now = datetime.utcnow()
+    candidates = (
+        db.query(VerificationJob.id)
+        .filter(_claimable(now))
+        .order_by(VerificationJob.run_after, VerificationJob.id)
+        .limit(CLAIM_CANDIDATES)
+        .all()
+    )
+
+    for (job_id,) in candidates:
+        claimed = (
+            db.query(VerificationJob)
+            .filter(VerificationJob.id == job_id, _claimable(now))
+            .update({
+                VerificationJob.status: "running",
+                VerificationJob.locked_by: worker_id,
+                VerificationJob.locked_at: now,
+                VerificationJob.started_at: now,
+                VerificationJob.attempts: VerificationJob.attempts + 1,
+            }, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            return db.get(VerificationJob, job_id)
+
+    return None
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with +-10% jitter so failed jobs don't retry in lockstep"""
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.9, 1.1)
+
+
+def complete_job(db: Session, job: VerificationJob, result: Dict):
+    job.status = "succeeded"
+    job.result = result
+    job.last_error = None
+    job.locked_by = None
+    job.locked_at = None
+    job.finished_at = datetime.utcnow()
+    db.commit()
+
+
+def fail_job(db: Session, job: VerificationJob, error: str, retry: bool = True):
+    """Record a failed attempt: requeue with backoff, or give up once attempts run out"""
+    job.last_error = error
+    job.locked_by = None
+    job.locked_at = None
+
+    if retry and job.attempts < job.max_attempts:
+        delay = retry_delay(job.attempts)
+        job.status = "queued"
+        job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+        logger.warning(f"🔁 Job {job.id} attempt {job.attempts} failed, retrying in {delay:.0f}s: {error}")
+    else:
+        job.status = "failed"
+        job.finished_at = datetime.utcnow()
+        logger.error(f"❌ Job {job.id} failed after {job.attempts} attempts: {error}")
+
+    db.commit()
+
+
+def job_to_dict(job: VerificationJob) -> Dict:
+    return {
+        "id": job.id,
+        "event_id": job.event_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after.isoformat() if job.run_after else None,
+        "last_error": job.last_error,
+        "result": job.result,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def queue_metrics(db: Session) -> Dict:
+    """Queue depth by status, age of the oldest waiting job and recent throughput"""
+    now = datetime.utcnow()
+    by_status = dict(
+        db.query(VerificationJob.status, func.count(VerificationJob.id))
+        .group_by(VerificationJob.status)
+        .all()
+    )
+    ready = (
+        db.query(func.count(VerificationJob.id))
+        .filter(VerificationJob.status == "queued", VerificationJob.run_after <= now)
+        .scalar()
+    )
+    oldest = (
+        db.query(func.min(VerificationJob.created_at))
+        .filter(VerificationJob.status == "queued")
+        .scalar()
+    )
+
+    since = now - timedelta(seconds=THROUGHPUT_WINDOW_SECONDS)
+    finished = (
+        db.query(VerificationJob.status, VerificationJob.started_at, VerificationJob.finished_at)
+        .filter(VerificationJob.finished_at >= since)
+        .all()
+    )
+    durations = [
+        (f.finished_at - f.started_at).total_seconds()
+        for f in finished if f.started_at and f.finished_at
+    ]
+
+    return {
+        "queue_depth": by_status.get("queued", 0),
+        "ready": ready,
+        "running": by_status.get("running", 0),
+        "succeeded": by_status.get("succeeded", 0),
+        "failed": by_status.get("failed", 0),
+        "oldest_queued_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        "throughput": {
+            "window_seconds": THROUGHPUT_WINDOW_SECONDS,
+            "finished": len(finished),
+            "failed": sum(1 for f in finished if f.status == "failed"),
+            "jobs_per_minute": round(len(finished) * 60 / THROUGHPUT_WINDOW_SECONDS, 2),
+            "avg_duration_seconds": round(sum(durations) / len(durations), 3) if durations else None,
+        },
+    }
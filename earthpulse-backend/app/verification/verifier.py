@@ -0,0 +1,113 @@
+# app/verification/verifier.py
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Score given when no satellite check applies to an event type
+DEFAULT_SCORE = 0.5
+
+# An incident's outcome is reused for events joining it for this long
+INCIDENT_VERIFICATION_TTL_HOURS = float(os.getenv('INCIDENT_VERIFICATION_TTL_HOURS', '24'))
+
+
+class VerificationError(Exception):
+    """The satellite analysis failed (quota, network, no imagery...); worth retrying"""
+
+
+def _judge_wildfire(result: Dict) -> Optional[Tuple[bool, float]]:
+    verified = result.get('fire_detected', False)
+    return verified, 0.9 if verified else 0.2
+
+
+def _judge_flood(result: Dict) -> Optional[Tuple[bool, float]]:
+    verified = result.get('water_present', False)
+    return verified, 0.8 if verified else 0.3
+
+
+def _judge_deforestation(result: Dict) -> Optional[Tuple[bool, float]]:
+    ndvi = result.get('ndvi_mean')
+    if ndvi is None:
+        return None
+    verified = ndvi < 0.3
+    return verified, 0.85 if verified else 0.25
+
+
+def _judge_drought(result: Dict) -> Optional[Tuple[bool, float]]:
+    ndwi = result.get('ndwi_mean')
+    if ndwi is None:
+        return None
+    verified = ndwi < 0.0
+    return verified, 0.8 if verified else 0.3
+
+
+# event_type -> (EarthEngineService method, radius_km, judge)
+VERIFICATION_CHECKS: Dict[str, Tuple[str, float, Callable[[Dict], Optional[Tuple[bool, float]]]]] = {
+    'wildfire': ('detect_wildfires', 50, _judge_wildfire),
+    'flood': ('detect_water_changes', 20, _judge_flood),
+    'deforestation': ('get_ndvi', 10, _judge_deforestation),
+    'drought': ('detect_water_changes', 20, _judge_drought),
+}
+
+
+def judge(event_type: str, result: Optional[Dict]) -> Dict:
+    """
+    Turn a satellite analysis result into a verification outcome
+
+    Raises VerificationError when the analysis itself failed, so callers can
+    retry instead of recording a false "unverified".
+    """
+    if result is None or 'error' in result:
+        raise VerificationError((result or {}).get('error', 'no analysis result'))
+
+    _, _, judge_fn = VERIFICATION_CHECKS[event_type]
+    verdict = judge_fn(result)
+    verified, score = verdict if verdict is not None else (False, DEFAULT_SCORE)
+    return {'verified': verified, 'score': score, 'analysis_results': result}
+
+
+def verify_event(service, event) -> Dict:
+    """Run the per-event-type Earth Engine check for one event (or incident, at its centroid)"""
+    check = VERIFICATION_CHECKS.get(event.event_type)
+    if check is None:
+        return {'verified': False, 'score': DEFAULT_SCORE, 'analysis_results': None}
+
+    method, radius_km, _ = check
+    result = getattr(service, method)(event.latitude, event.longitude, radius_km=radius_km)
+    return judge(event.event_type, result)
+
+
+def apply_verification(event, outcome: Dict):
+    """Write a verification outcome onto the event (caller commits)"""
+    event.is_verified = outcome['verified']
+    event.verification_score = outcome['score']
+    event.verification_status = 'verified' if outcome['verified'] else 'unverified'
+    event.verification_method = 'satellite'
+    event.analysis_results = outcome['analysis_results']
+    event.updated_at = datetime.utcnow()
+
+
+def incident_outcome(incident, now: Optional[datetime] = None) -> Optional[Dict]:
+    """The incident's verification outcome if it is recent enough to reuse, else None"""
+    if incident is None or incident.verified_at is None \
+            or incident.verification_status not in ('verified', 'unverified'):
+        return None
+    now = now or datetime.utcnow()
+    if now - incident.verified_at > timedelta(hours=INCIDENT_VERIFICATION_TTL_HOURS):
+        return None
+    return {
+        'verified': bool(incident.is_verified),
+        'score': incident.verification_score,
+        'analysis_results': incident.analysis_results,
+    }
+
+
+def apply_incident_verification(incident, outcome: Dict):
+    """Write a verification outcome onto the incident (caller commits)"""
+    incident.is_verified = outcome['verified']
+    incident.verification_score = outcome['score']
+    incident.verification_status = 'verified' if outcome['verified'] else 'unverified'
+    incident.analysis_results = outcome['analysis_results']
+    incident.verified_at = datetime.utcnow()
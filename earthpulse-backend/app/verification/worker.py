@@ -0,0 +1,179 @@
+# app/verification/worker.py
+"""
+Verification worker pool
+
+Runs in-process next to the API (see app.main, VERIFICATION_WORKERS) or on
+its own:
+
+    python -m app.verification.worker --concurrency 4
+"""
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from app.database import SessionLocal
+from app.models.event import Event
+from app.models.incident import Incident
+from app.verification import jobs
+from app.verification.verifier import (
+    apply_incident_verification,
+    apply_verification,
+    incident_outcome,
+    verify_event,
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker threads started by the API process; 0 leaves jobs to a separate worker
+VERIFICATION_WORKERS = int(os.getenv("VERIFICATION_WORKERS", "2"))
+
+# Seconds an idle worker waits before polling the queue again
+POLL_INTERVAL_SECONDS = float(os.getenv("VERIFICATION_POLL_INTERVAL", "1.0"))
+
+
+class VerificationWorker:
+    """
+    Pool of threads that claim and run verification jobs
+
+    Each thread loops claim -> verify -> record with its own session. The
+    Earth Engine calls are blocking, so threads (not asyncio) give the
+    concurrency, and the pool size is the limit on concurrent verifications.
+    """
+
+    def __init__(self, service, concurrency: int = VERIFICATION_WORKERS,
+                 session_factory=SessionLocal, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.service = service
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._counters = {"processed": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        self._started_at: Optional[float] = None
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def run_job(self, db, job) -> str:
+        """Run one claimed job to a terminal or requeued state; returns the job status"""
+        self._count("processed")
+
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its lease expired on the last allowed attempt
+            jobs.fail_job(db, job, job.last_error or "lease expired", retry=False)
+            self._count("failed")
+            return job.status
+
+        event = db.get(Event, job.event_id)
+        if event is None:
+            jobs.fail_job(db, job, "event not found", retry=False)
+            self._count("failed")
+            return job.status
+
+        # Events of one incident share a single check at its centroid
+        incident = db.get(Incident, event.incident_id) if event.incident_id is not None else None
+        outcome = incident_outcome(incident)
+        if outcome is None:
+            try:
+                outcome = verify_event(self.service, incident or event)
+            except Exception as e:
+                db.rollback()
+                jobs.fail_job(db, job, str(e) or e.__class__.__name__)
+                self._count("retried" if job.status == "queued" else "failed")
+                return job.status
+            if incident is not None:
+                apply_incident_verification(incident, outcome)
+
+        apply_verification(event, outcome)
+        jobs.complete_job(db, job, {"verified": outcome["verified"], "score": outcome["score"]})
+        self._count("succeeded")
+        logger.info(f"✅ Event {event.id} verified: {outcome['verified']} (score: {outcome['score']})")
+        return job.status
+
+    def run_once(self) -> bool:
+        """Claim and run a single job; False when nothing was ready"""
+        db = self.session_factory()
+        try:
+            job = jobs.claim_job(db, self.worker_id)
+            if job is None:
+                return False
+            self.run_job(db, job)
+            return True
+        finally:
+            db.close()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Verification worker error: {e}")
+                busy = False
+            if not busy:
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self._started_at = time.time()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, name=f"verification-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🛰️ Verification worker {self.worker_id} started ({self.concurrency} threads)")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        uptime = time.time() - self._started_at if self._started_at else 0.0
+        return {
+            **counters,
+            "worker_id": self.worker_id,
+            "threads": len(self._threads),
+            "uptime_seconds": round(uptime, 1),
+            "jobs_per_second": round(counters["processed"] / uptime, 3) if uptime else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run EarthPulse verification workers")
+    parser.add_argument("--concurrency", type=int, default=max(VERIFICATION_WORKERS, 1))
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from app.database.migrations import run_migrations
+    from app.services.earth_engine import earth_engine_service
+
+    run_migrations()
+    worker = VerificationWorker(earth_engine_service, concurrency=args.concurrency,
+                                poll_interval=args.poll_interval)
+    worker.start()
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"📊 {worker.stats()}")
+    except KeyboardInterrupt:
+        logger.info("🛑 Stopping verification worker")
+    finally:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark location resolution: gazetteer and cache lookups vs. Nominatim
+
+    python -m benchmarks.bench_geocode --lookups 100000 --remote 3
+
+Times LocationGeocoder.geocode() for names in the gazetteer and for names
+answered from the geocode cache (memory and SQLite tiers). With --remote N
+it also sends N unknown names to Nominatim (needs geopy and network access)
+to show what every lookup used to cost.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.nlp.location_geocoder import GeocodeCache, LocationGeocoder, normalize_place_name
+
+NAMES = [
+    "California", "Queensland", "Bangalore", "Jakarta", "Manaus", "the Amazon basin",
+    "British Columbia", "Kerala", "Mozambique", "Sicily", "Texas", "Punjab",
+    "Lake Chad", "Borneo", "Attica", "Alberta", "Paradise, CA", "São Paulo",
+]
+CACHED = [f"Remote place {i}" for i in range(len(NAMES))]
+
+
+def per_lookup_us(geocoder: LocationGeocoder, names, lookups: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(lookups):
+        assert geocoder.geocode(names[i % len(names)]) is not None
+    return (time.perf_counter() - t0) / lookups * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--remote", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "geocode.db")
+        t0 = time.perf_counter()
+        geocoder = LocationGeocoder(cache=GeocodeCache(path), remote=args.remote > 0)
+        print(f"gazetteer load      {(time.perf_counter() - t0) * 1000:9.1f} ms  "
+              f"({geocoder.gazetteer.rows} rows, {len(geocoder.gazetteer)} names)")
+
+        for i, name in enumerate(CACHED):
+            geocoder.cache.set(normalize_place_name(name), (float(i), float(i), name))
+
+        print(f"gazetteer hit       {per_lookup_us(geocoder, NAMES, args.lookups):9.2f} us/lookup")
+        print(f"cache hit (memory)  {per_lookup_us(geocoder, CACHED, args.lookups):9.2f} us/lookup")
+        disk = LocationGeocoder(gazetteer=geocoder.gazetteer, cache=GeocodeCache(path), remote=False)
+        print(f"cache hit (SQLite)  {per_lookup_us(disk, CACHED, len(CACHED)):9.2f} us/lookup  (first lookup per name)")
+
+        if args.remote:
+            names = [f"Wadi {i} Nowhere" for i in range(args.remote - 1)] + ["Ouagadougou"]
+            t0 = time.perf_counter()
+            for name in names:
+                geocoder.geocode(name)
+            print(f"Nominatim           {(time.perf_counter() - t0) / len(names) * 1e6:9.0f} us/lookup  "
+                  f"({len(names)} names, throttled to 1/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark cold start: importing app.main and serving the first /health
+
+    python -m benchmarks.bench_import --runs 5
+
+Each run is a fresh interpreter against a throwaway SQLite database, so
+nothing is warm from a previous run. Reports the median wall time of
+`import app.main` and of import + startup + first GET /health, then the
+slowest modules by cumulative import time (python -X importtime).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEALTH_SCRIPT = """
+import time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.get('/health').status_code == 200
+print(time.perf_counter() - t0)
+"""
+
+
+def _env(db_path: str, extra: dict) -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "EE_CACHE_PATH": "",
+           "VERIFICATION_WORKERS": "0", **extra}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    return env
+
+
+def run_once(code: str, env: dict) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=BACKEND_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def import_profile(env: dict, top: int):
+    """(module, cumulative seconds) for app.main and the slowest of its direct imports"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                            env=env, cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 2:  # app.main is depth 1, what it imports depth 2
+            rows.append((name.strip(), int(cumulative_us) / 1e6))
+    return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("import app.main          ", "import app.main", {"MIGRATE_ON_STARTUP": "0"}),
+            ("first /health (migrated) ", HEALTH_SCRIPT, {"MIGRATE_ON_STARTUP": "0"}),
+            ("first /health (migrating)", HEALTH_SCRIPT, {"MIGRATE_ON_STARTUP": "1"}),
+        ]
+        db_path = os.path.join(tmp, "bench.db")
+        env = _env(db_path, {})
+        subprocess.run([sys.executable, "-m", "app.database.migrations"], env=env, cwd=BACKEND_DIR,
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        for name, code, extra in cases:
+            times = [run_once(code, _env(db_path, extra)) for _ in range(args.runs)]
+            print(f"{name}  median {statistics.median(times) * 1000:8.1f} ms  "
+                  f"min {min(times) * 1000:8.1f} ms  ({args.runs} runs)")
+
+        print("\nSlowest imports (cumulative):")
+        for module, seconds in import_profile(_env(db_path, {"MIGRATE_ON_STARTUP": "0"}), args.top):
+            print(f"  {seconds * 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
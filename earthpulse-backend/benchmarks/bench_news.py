@@ -0,0 +1,127 @@
+"""
+Benchmark article fetching: one requests.get per article vs. the pooled fetcher
+
+    python -m benchmarks.bench_news --articles 200 --latency-ms 80 --error-rate 0.05
+
+Serves generated article pages from a local HTTP/1.1 server that sleeps
+--latency-ms per response (a stand-in for a remote news site) and answers
+--error-rate of first attempts with 503. Times the old way (requests.get
+without a session, then parse, one article after another, no retries)
+against NewsEventScraper.fetch_articles, and reports articles/sec.
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.scraping.fetcher import NEWS_FETCH_WORKERS, NEWS_PER_HOST, PooledFetcher
+from app.scraping.news_scraper import NEWS_PARSE_WORKERS, NewsEventScraper, parse_article
+
+PARAGRAPH = ("Firefighters worked through the night as strong winds pushed the fire towards "
+             "the edge of town. Officials said more than two thousand homes were evacuated. ")
+
+
+def article_html(i: int) -> bytes:
+    paragraphs = "".join(f"<p>{PARAGRAPH * 3}</p>" for _ in range(30))
+    return (
+        f"<html><head><title>Wildfire update {i}</title>"
+        f'<meta property="og:title" content="Wildfire update {i}">'
+        f'<meta property="article:published_time" content="2024-08-0{i % 9 + 1}T10:00:00Z">'
+        f"</head><body><h1>Wildfire update {i}</h1>{paragraphs}</body></html>"
+    ).encode()
+
+
+def make_handler(latency: float, error_rate: float, seed: int = 3):
+    rng = random.Random(seed)
+    failed = set()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            time.sleep(latency)
+            with lock:
+                fail = self.path not in failed and rng.random() < error_rate
+                if fail:
+                    failed.add(self.path)
+            if fail:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = article_html(int(self.path.rsplit("/", 1)[-1]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def sequential(urls):
+    articles = []
+    for url in urls:
+        try:
+            response = requests.get(url, timeout=15)
+            response.raise_for_status()
+            articles.append(parse_article(url, response.text))
+        except Exception:
+            articles.append(None)
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=NEWS_FETCH_WORKERS)
+    parser.add_argument("--per-host", type=int, default=NEWS_PER_HOST)
+    parser.add_argument("--parse-workers", type=int, default=NEWS_PARSE_WORKERS)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency_ms / 1000, args.error_rate))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # The per-host limit applies per host name, so serve the pages under two
+    # names to show it capping each site rather than the whole batch
+    hosts = [base, base.replace("127.0.0.1", "localhost")]
+    # Separate paths per run so both runs see the same share of 503s
+    def urls(run):
+        return [f"{hosts[i % len(hosts)]}/{run}/article/{i}" for i in range(args.articles)]
+
+    scraper = NewsEventScraper(PooledFetcher(workers=args.workers, per_host=args.per_host, backoff_factor=0.05),
+                               parse_workers=args.parse_workers)
+    scraper.fetch_articles([f"{base}/warmup/article/0"])  # start the parse workers before timing
+
+    try:
+        t0 = time.perf_counter()
+        old = sequential(urls("sequential"))
+        old_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new = scraper.fetch_articles(urls("pooled"))
+        new_s = time.perf_counter() - t0
+    finally:
+        scraper.close()
+        server.shutdown()
+
+    n = args.articles
+    print(f"sequential  {old_s:7.2f} s  {n / old_s:7.1f} articles/s  {sum(a is not None for a in old)}/{n} ok")
+    print(f"pooled      {new_s:7.2f} s  {n / new_s:7.1f} articles/s  {sum(a is not None for a in new)}/{n} ok"
+          f"  (workers {args.workers}, per host {args.per_host}, parse workers {args.parse_workers})")
+    print(f"speedup {old_s / new_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
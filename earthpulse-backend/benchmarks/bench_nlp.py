@@ -0,0 +1,90 @@
+"""
+Benchmark NLP extraction: process_article one by one vs. batched process_articles
+
+    python -m benchmarks.bench_nlp --articles 256 --batch-size 64 --n-process 1
+
+Runs both paths over the same canned corpus of environmental headlines
+(models are loaded before timing; geocoding is stubbed out so only NER and
+zero-shot classification are measured) and reports articles/sec. Needs
+spacy with en_core_web_sm and transformers installed.
+"""
+import argparse
+import itertools
+import random
+import time
+
+from app.nlp.event_extractor import NLP_BATCH_SIZE, ZERO_SHOT_BATCH_SIZE, EventExtractor
+from app.nlp.model_registry import registry
+
+PLACES = [
+    "California", "Queensland", "Bangalore", "Jakarta", "Manaus", "the Amazon basin",
+    "British Columbia", "Kerala", "Mozambique", "Sicily", "Texas", "Punjab",
+    "Lake Chad", "Borneo", "Attica", "Alberta",
+]
+
+HEADLINES = [
+    ("Massive wildfire spreads near {place}",
+     "Firefighters battle a fast-moving blaze as thousands are evacuated from towns around {place}."),
+    ("Flash floods submerge villages in {place}",
+     "Heavy monsoon rain pushed rivers over their banks, cutting roads and power across {place}."),
+    ("Satellite images reveal rapid forest loss in {place}",
+     "Researchers say illegal logging cleared thousands of hectares of rainforest in {place} this year."),
+    ("Severe drought leaves reservoirs empty in {place}",
+     "Farmers in {place} report failed harvests after the driest season on record."),
+    ("Earthquake of magnitude 6.1 shakes {place}",
+     "Buildings were damaged and residents spent the night outdoors after the quake struck {place}."),
+    ("Hurricane makes landfall near {place}",
+     "Winds of 180 km/h tore roofs off homes and storm surge flooded the coast of {place}."),
+]
+
+
+def canned_corpus(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    combos = list(itertools.product(HEADLINES, PLACES))
+    rng.shuffle(combos)
+    corpus = []
+    for i in range(size):
+        (title, description), place = combos[i % len(combos)]
+        corpus.append({"title": title.format(place=place), "description": description.format(place=place)})
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--articles", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=NLP_BATCH_SIZE)
+    parser.add_argument("--zero-shot-batch-size", type=int, default=ZERO_SHOT_BATCH_SIZE)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = canned_corpus(args.articles)
+    extractor = EventExtractor(registry)
+    extractor.geocode_location = lambda name: None
+
+    registry.preload(["spacy", "zero_shot"], freeze=False)
+    for name, stats in registry.stats().items():
+        if stats["loaded"]:
+            print(f"loaded {name:10s} {stats['load_seconds']:7.2f} s  +{stats['rss_delta_mb']:.0f} MB")
+
+    t0 = time.perf_counter()
+    sequential = [extractor.process_article(article) for article in corpus]
+    sequential_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = extractor.process_articles(corpus, batch_size=args.batch_size,
+                                         zero_shot_batch_size=args.zero_shot_batch_size,
+                                         n_process=args.n_process, geocode=False)
+    batched_s = time.perf_counter() - t0
+
+    agree = sum(
+        a["event_type"] == b["event_type"] and a["locations"] == b["locations"]
+        for a, b in zip(sequential, batched)
+    )
+    print(f"process_article  x{len(corpus)}  {sequential_s:7.2f} s  {len(corpus) / sequential_s:8.1f} articles/s")
+    print(f"process_articles x{len(corpus)}  {batched_s:7.2f} s  {len(corpus) / batched_s:8.1f} articles/s"
+          f"  (batch {args.batch_size}, zero-shot batch {args.zero_shot_batch_size}, n_process {args.n_process})")
+    print(f"speedup {sequential_s / batched_s:.1f}x, identical results for {agree}/{len(corpus)} articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark bbox / radius lookups: geohash index vs. a full scan
+
+    python -m benchmarks.bench_spatial --rows 1000000
+
+Builds a throwaway SQLite database with random events, then times the
+indexed /api/events and /api/stats queries against the pre-index approach
+(load every row's coordinates and filter in Python).
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import crud
+from app.database.migrations import run_migrations
+from app.models.event import Event
+from app.utils import geohash
+
+EVENT_TYPES = ["wildfire", "flood", "deforestation", "drought"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+
+def populate(engine, rows: int, batch: int = 50000):
+    start = datetime.utcnow() - timedelta(days=365)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            chunk = []
+            for i in range(offset, min(offset + batch, rows)):
+                lat = rng.uniform(-60, 70)
+                lon = rng.uniform(-180, 180)
+                chunk.append({
+                    "title": f"Event {i}",
+                    "event_type": rng.choice(EVENT_TYPES),
+                    "severity": rng.choice(SEVERITIES),
+                    "latitude": lat,
+                    "longitude": lon,
+                    "geohash": geohash.encode(lat, lon),
+                    "is_verified": rng.random() < 0.3,
+                    "created_at": start + timedelta(seconds=i * 30),
+                })
+            conn.execute(insert(Event), chunk)
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_spatial.db")
+    engine = create_engine(f"sqlite:///{path}")
+    run_migrations(engine)
+
+    t0 = time.perf_counter()
+    populate(engine, args.rows)
+    print(f"Inserted {args.rows:,} events in {time.perf_counter() - t0:.1f}s ({path})")
+
+    db = sessionmaker(bind=engine)()
+    bbox = (-120.0, 33.0, -118.0, 35.0)        # ~200km x 220km viewport
+    lat, lon, radius_km = 34.0, -118.25, 50.0  # "events near me"
+
+    def scan_bbox():
+        rows = db.execute(select(Event.id, Event.latitude, Event.longitude)).all()
+        return [r.id for r in rows
+                if bbox[0] <= r.longitude <= bbox[2] and bbox[1] <= r.latitude <= bbox[3]]
+
+    def scan_radius():
+        rows = db.execute(select(Event.id, Event.latitude, Event.longitude)).all()
+        return [r.id for r in rows
+                if geohash.haversine_km(lat, lon, r.latitude, r.longitude) <= radius_km]
+
+    def index_bbox():
+        return crud.list_events(db, fields=("id",), limit=crud.MAX_PAGE_SIZE, bbox=bbox)[0]
+
+    def index_radius():
+        return crud.list_events(db, fields=("id",), limit=crud.MAX_PAGE_SIZE,
+                                near=(lat, lon, radius_km))[0]
+
+    def index_stats():
+        return crud.get_event_stats(db, bbox=bbox)["total_events"]
+
+    cases = [
+        ("bbox   full scan", scan_bbox),
+        ("bbox   geohash  ", index_bbox),
+        ("bbox   stats    ", index_stats),
+        ("radius full scan", scan_radius),
+        ("radius geohash  ", index_radius),
+    ]
+    for name, fn in cases:
+        ms, result = timed(fn, args.repeat)
+        size = result if isinstance(result, int) else len(result)
+        print(f"{name}  {ms:9.2f} ms  ({size} matches)")
+
+
+if __name__ == "__main__":
+    main()
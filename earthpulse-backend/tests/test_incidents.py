@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.migrations import run_migrations
+from app.models.event import Event
+from app.models.incident import Incident
+from app.services.incidents import IncidentClusterer, incident_to_dict
+from app.utils import geohash
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_event(db, latitude, longitude, minutes=0):
+    event = Event(title="fire", event_type="wildfire", severity="high",
+                  latitude=latitude, longitude=longitude,
+                  geohash=geohash.encode(latitude, longitude),
+                  created_at=datetime(2026, 1, 1) + timedelta(minutes=minutes))
+    db.add(event)
+    db.commit()
+    return event
+
+
+def test_incident_across_antimeridian(db):
+    clusterer = IncidentClusterer()
+    east = add_event(db, 10.0, 179.99)
+    west = add_event(db, 10.0, -179.99, minutes=1)
+    clusterer.cluster(db, [east])
+    clusterer.cluster(db, [west])
+
+    incident = db.query(Incident).one()
+    data = incident_to_dict(incident)
+    assert data["event_count"] == 2
+    assert abs(abs(data["centroid"]["longitude"]) - 180.0) < 1e-6
+    assert data["bbox"][0] == pytest.approx(179.99)
+    assert data["bbox"][2] == pytest.approx(-179.99)
+
+
+def test_merge_across_antimeridian(db):
+    # The middle event arrives last and bridges one incident on each side
+    events = [add_event(db, 10.0, 179.95), add_event(db, 10.0, -179.95, minutes=1)]
+    clusterer = IncidentClusterer()
+    for event in events:
+        clusterer.cluster(db, [event])
+    assert db.query(Incident).count() == 2
+
+    clusterer.cluster(db, [add_event(db, 10.0, 180.0, minutes=2)])
+    incident = db.query(Incident).one()
+    assert incident.event_count == 3
+    assert abs(abs(incident.longitude) - 180.0) < 1e-6
+    assert (incident.min_longitude, incident.max_longitude) == pytest.approx((179.95, -179.95))
+
+
+def test_centroid_is_plain_mean_away_from_antimeridian(db):
+    events = [add_event(db, 10.0, 20.0), add_event(db, 10.0, 20.06, minutes=1)]
+    IncidentClusterer().cluster(db, events)
+    incident = db.query(Incident).one()
+    assert incident.longitude == pytest.approx(20.03)
+    assert (incident.min_longitude, incident.max_longitude) == pytest.approx((20.0, 20.06))
@@ -1,5 +1,10 @@
 import { useState, useEffect } from 'react';
-import { getEvents, type Event } from '../services/api';
+import {
+  getEvents,
+  getEventsGeoJSON,
+  type Event,
+  type EventFeatureCollection,
+} from '../services/api';
 
 export function useEvents() {
   const [events, setEvents] = useState<Event[]>([]);
@@ -21,4 +26,26 @@ export function useEvents() {
   };
 
   return { events, loading, refresh: loadEvents };
-}
\ No newline at end of file
+}
+
+export function useEventsGeoJSON() {
+  const [geojson, setGeojson] = useState<EventFeatureCollection | null>(null);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    loadGeojson();
+  }, []);
+
+  const loadGeojson = async () => {
+    try {
+      const data = await getEventsGeoJSON();
+      setGeojson(data);
+    } catch (error) {
+      console.error('Error loading events GeoJSON:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return { geojson, loading, refresh: loadGeojson };
+}
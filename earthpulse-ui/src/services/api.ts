@@ -45,6 +45,18 @@ export interface Stats {
   };
 }
 
+export interface EventFeature {
+  type: 'Feature';
+  id: number;
+  geometry: { type: 'Point'; coordinates: [number, number] } | null;
+  properties: Omit<Event, 'location'> & { location_name: string | null };
+}
+
+export interface EventFeatureCollection {
+  type: 'FeatureCollection';
+  features: EventFeature[];
+}
+
 export interface NDVIResult {
   ndvi_mean: number | null;
   location: Location;
@@ -58,8 +70,33 @@ export const getStats = async (): Promise<Stats> => {
   return response.data;
 };
 
-export const getEvents = async (): Promise<Event[]> => {
-  const response = await api.get('/api/events');
+// Largest page /api/events serves (crud.MAX_PAGE_SIZE on the backend)
+const EVENTS_PAGE_SIZE = 1000;
+
+// /api/events is keyset-paginated: follow X-Next-Cursor until the last page
+export const getEvents = async (
+  params: { event_type?: string; severity?: string; verified?: boolean; bbox?: string } = {}
+): Promise<Event[]> => {
+  const events: Event[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get<Event[]>('/api/events', {
+      params: { ...params, limit: EVENTS_PAGE_SIZE, cursor },
+    });
+    events.push(...response.data);
+    cursor = response.headers['x-next-cursor'] || undefined;
+  } while (cursor);
+  return events;
+};
+
+// Streamed by the backend; can be handed straight to a map GeoJSON source
+export const getEventsGeoJSON = async (
+  params: { event_type?: string; verified?: boolean; bbox?: string } = {}
+): Promise<EventFeatureCollection> => {
+  const response = await api.get('/api/events/export', {
+    params: { format: 'geojson', ...params },
+    timeout: 0,
+  });
   return response.data;
 };
 